@@ -0,0 +1,146 @@
+"""
+DJ sampling — Deutsch–Jozsa n=2 circuits, noise channels and seeded streams
+
+Shared by the Deutsch–Jozsa noise experiments (exp_06, exp_07a, exp_07c,
+exp_08, exp_09; exp_10 uses the readout channel, sampling and streams with its
+own n-bit circuits), so the noise model, the readout channel and the seeding
+are defined once:
+- gate noise: depolarizing on NOISY_1Q / NOISY_2Q (the ccx is not decomposed);
+  gate_noise_distribution(p_gate, table) is the exact c1c0 distribution,
+  simulated once per (p_gate, truth table) and reused for every readout
+  level, shot count and trial
+- readout noise: a classical bit-flip confusion channel applied to that
+  distribution, one 2x2 factor per measured bit (apply_readout_error)
+- sampling: count histograms indexed like the distribution (c1c0 as an
+  integer), by multinomial draws (sample_counts) or by inverse CDF from given
+  uniforms (counts_from_uniforms, for common random numbers)
+- seeding: trial_streams(seed, *key) gives one trial its oracle stream and
+  numpy streams from SeedSequence(seed, spawn_key=key), so any trial can be
+  recomputed in isolation or in parallel
+"""
+
+import random
+from functools import lru_cache
+import numpy as np
+from qiskit import QuantumCircuit
+from qiskit_aer import AerSimulator
+from qiskit_aer.noise import NoiseModel, depolarizing_error
+
+X = [(0, 0), (0, 1), (1, 0), (1, 1)]
+
+NOISY_1Q = ["x", "h", "z"]
+NOISY_2Q = ["cx"]
+
+def random_constant_table(stream: random.Random):
+    v = stream.choice([0, 1])
+    return [v, v, v, v]
+
+def random_balanced_table(stream: random.Random):
+    ones_idx = set(stream.sample(range(4), 2))
+    return [1 if i in ones_idx else 0 for i in range(4)]
+
+def random_oracle(stream: random.Random):
+    """(kind, table): kind 50/50, then a uniform truth table of that kind."""
+    kind = stream.choice(["CONSTANT", "BALANCED"])
+    return kind, random_constant_table(stream) if kind == "CONSTANT" else random_balanced_table(stream)
+
+def oracle_from_truth_table(table):
+    qc = QuantumCircuit(3)
+    for (x0, x1), fx in zip(X, table):
+        if fx == 0:
+            continue
+
+        if x0 == 0:
+            qc.x(0)
+        if x1 == 0:
+            qc.x(1)
+
+        qc.ccx(0, 1, 2)
+
+        if x1 == 0:
+            qc.x(1)
+        if x0 == 0:
+            qc.x(0)
+
+    return qc
+
+def deutsch_jozsa_circuit(oracle):
+    qc = QuantumCircuit(3, 2)
+    qc.x(2)
+    qc.h(0)
+    qc.h(1)
+    qc.h(2)
+    qc.compose(oracle, inplace=True)
+    qc.h(0)
+    qc.h(1)
+    qc.measure(0, 0)
+    qc.measure(1, 1)
+    return qc
+
+def build_noise_model(p_gate: float) -> NoiseModel:
+    # gate noise only: readout noise is applied classically (apply_readout_error)
+    noise_model = NoiseModel()
+
+    if p_gate > 0:
+        err_1 = depolarizing_error(p_gate, 1)
+        err_2 = depolarizing_error(p_gate, 2)
+        for g in NOISY_1Q:
+            noise_model.add_all_qubit_quantum_error(err_1, g)
+        for g in NOISY_2Q:
+            noise_model.add_all_qubit_quantum_error(err_2, g)
+
+    return noise_model
+
+@lru_cache(maxsize=None)
+def gate_noise_distribution(p_gate: float, table: tuple) -> np.ndarray:
+    """
+    Exact c1c0 distribution under gate noise only, simulated once per
+    (p_gate, truth table) and reused for every p_readout / shots / trial.
+    """
+    qc = deutsch_jozsa_circuit(oracle_from_truth_table(table)).remove_final_measurements(inplace=False)
+    qc.save_probabilities(qubits=[0, 1])
+
+    sim = AerSimulator(noise_model=build_noise_model(p_gate), method="density_matrix")
+    return np.asarray(sim.run(qc).result().data(0)["probabilities"])
+
+def apply_readout_error(probs: np.ndarray, p_readout: float) -> np.ndarray:
+    """
+    Bit-flip readout noise as a tensored confusion matrix A x A x ... x A,
+    applied one 2x2 factor per measured bit (never building the 2^n x 2^n matrix).
+    """
+    if p_readout <= 0:
+        return probs
+
+    n_bits = int(np.log2(len(probs)))
+    confusion = np.array([[1 - p_readout, p_readout],
+                          [p_readout, 1 - p_readout]])  # [measured, true]
+
+    t = probs.reshape([2] * n_bits)
+    for axis in range(n_bits):
+        t = np.moveaxis(np.tensordot(confusion, t, axes=(1, axis)), 0, axis)
+    return t.reshape(-1)
+
+def sample_counts(probs: np.ndarray, shots: int, stream: np.random.Generator) -> np.ndarray:
+    """Count histogram indexed like probs."""
+    probs = np.clip(probs, 0, None)
+    return stream.multinomial(shots, probs / probs.sum())
+
+def counts_from_uniforms(probs: np.ndarray, uniforms: np.ndarray) -> np.ndarray:
+    """Inverse-CDF sampling: one shot per uniform, so shared uniforms give coupled counts."""
+    cdf = np.cumsum(np.clip(probs, 0, None))
+    outcomes = np.minimum(np.searchsorted(cdf / cdf[-1], uniforms, side="right"), len(probs) - 1)
+    return np.bincount(outcomes, minlength=len(probs))
+
+def classify_majority(hist: np.ndarray):
+    # CONSTANT iff the most frequent outcome is 00; ties go to the lowest outcome
+    return "CONSTANT" if int(np.argmax(hist)) == 0 else "BALANCED"
+
+def trial_streams(seed: int, *key, generators: int = 1):
+    """
+    Streams of one trial from SeedSequence(seed, spawn_key=key): a random.Random
+    oracle stream followed by `generators` numpy streams (shots, and e.g. the
+    sequential classifier's).
+    """
+    oracle_seq, *numpy_seqs = np.random.SeedSequence(seed, spawn_key=key).spawn(1 + generators)
+    return (random.Random(int(oracle_seq.generate_state(1)[0])),
+            *(np.random.default_rng(s) for s in numpy_seqs))
@@ -10,9 +10,14 @@ This is a stepping stone toward agentic experiment loops:
 - run experiment (DJ circuit),
 - analyze output (classification),
 - report metrics (accuracy).
+
+Every trial draws its oracle and its Aer shots from child seeds of `seed`
+(numpy SeedSequence, spawn key = trial index), so any trial can be rerun on
+its own with the same result.
 """
 
 import random
+import numpy as np
 from qiskit import QuantumCircuit
 from qiskit_aer import AerSimulator
 
@@ -20,8 +25,6 @@ shots = 1024
 trials = 20
 seed = 42
 
-random.seed(seed)
-
 # Inputs x in {00, 01, 10, 11}
 X = [(0,0), (0,1), (1,0), (1,1)]
 
@@ -31,15 +34,20 @@ def is_constant(table):
 def is_balanced(table):
     return sum(table) == 2  # for 4 inputs, balanced means two 1s and two 0s
 
-def random_constant_table():
-    v = random.choice([0, 1])
+def random_constant_table(stream=random):
+    v = stream.choice([0, 1])
     return [v, v, v, v]
 
-def random_balanced_table():
+def random_balanced_table(stream=random):
     # choose exactly two inputs to map to 1
-    ones_idx = set(random.sample(range(4), 2))
+    ones_idx = set(stream.sample(range(4), 2))
     return [1 if i in ones_idx else 0 for i in range(4)]
 
+def trial_seeds(trial: int):
+    """(oracle stream, Aer seed_simulator) of one trial, from the root SeedSequence."""
+    oracle_seq, shot_seq = np.random.SeedSequence(seed, spawn_key=(trial,)).spawn(2)
+    return random.Random(int(oracle_seq.generate_state(1)[0])), int(shot_seq.generate_state(1)[0])
+
 def oracle_from_truth_table(table):
     """
     Build Uf for f(x0,x1) using a reversible embedding:
@@ -114,8 +122,9 @@ print(f"trials={trials}, shots={shots}, seed={seed}")
 correct = 0
 
 for i in range(1, trials + 1):
-    kind = random.choice(["CONSTANT", "BALANCED"])
-    table = random_constant_table() if kind == "CONSTANT" else random_balanced_table()
+    oracle_stream, sim_seed = trial_seeds(i)
+    kind = oracle_stream.choice(["CONSTANT", "BALANCED"])
+    table = random_constant_table(oracle_stream) if kind == "CONSTANT" else random_balanced_table(oracle_stream)
 
     # Sanity check
     assert is_constant(table) if kind == "CONSTANT" else is_balanced(table)
@@ -123,7 +132,7 @@ for i in range(1, trials + 1):
     oracle = oracle_from_truth_table(table)
     qc = deutsch_jozsa_circuit(oracle)
 
-    counts = sim.run(qc, shots=shots).result().get_counts()
+    counts = sim.run(qc, shots=shots, seed_simulator=sim_seed).result().get_counts()
     pred = classify_from_counts(counts)
 
     ok = (pred == kind)
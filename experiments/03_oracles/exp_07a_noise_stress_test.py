@@ -7,100 +7,143 @@ We sweep:
 - p_gate (depolarizing)
 - p_readout (bit-flip readout error)
 - shots (small sample sizes)
-"""
-
-import random
-from qiskit import QuantumCircuit
-from qiskit_aer import AerSimulator
-from qiskit_aer.noise import NoiseModel, depolarizing_error, ReadoutError
-
-seed = 123
-random.seed(seed)
-
-X = [(0,0), (0,1), (1,0), (1,1)]
-
-def random_constant_table():
-    v = random.choice([0, 1])
-    return [v, v, v, v]
-
-def random_balanced_table():
-    ones_idx = set(random.sample(range(4), 2))
-    return [1 if i in ones_idx else 0 for i in range(4)]
-
-def oracle_from_truth_table(table):
-    qc = QuantumCircuit(3)
-    for (x0, x1), fx in zip(X, table):
-        if fx == 0:
-            continue
 
-        if x0 == 0:
-            qc.x(0)
-        if x1 == 0:
-            qc.x(1)
-
-        qc.ccx(0, 1, 2)
-
-        if x1 == 0:
-            qc.x(1)
-        if x0 == 0:
-            qc.x(0)
-
-    return qc
-
-def deutsch_jozsa_circuit(oracle):
-    qc = QuantumCircuit(3, 2)
-    qc.x(2)
-    qc.h(0); qc.h(1); qc.h(2)
-    qc.compose(oracle, inplace=True)
-    qc.h(0); qc.h(1)
-    qc.measure(0, 0)
-    qc.measure(1, 1)
-    return qc
-
-def classify_majority(counts):
-    most_common = max(counts.items(), key=lambda kv: kv[1])[0]
-    return "CONSTANT" if most_common == "00" else "BALANCED"
-
-def build_noise_model(p_gate: float, p_readout: float) -> NoiseModel:
-    noise_model = NoiseModel()
+Only p_gate needs a quantum simulation: the gate-noise distribution of each
+truth table is simulated once per p_gate, and readout flips + shot sampling are
+applied classically on top, so the p_readout and shots axes cost no simulations.
+
+With SEQUENTIAL=True each trial is also classified sequentially (shots
+streamed in blocks, early stop at the error bounds, shots as a cap), and the
+mean number of shots used per trial is reported next to its accuracy.
+
+Reproducibility: every (sweep point, trial) draws its oracle, its shots and its
+sequential blocks from child streams of `seed` (numpy SeedSequence), so any
+point can be recomputed in isolation or in parallel with identical results.
+
+Checkpoint / resume (CHECKPOINT): every finished grid point is appended to a
+JSONL file (the checkpoint format of 07_agentic/agent_runtime.py) under the
+content hash of its configuration: sequential settings, noise model (kind and
+noisy gates), sweep values and seed key. A restarted run skips the points
+already in the file, so an interrupted grid resumes where it stopped and, with
+the seeded streams, prints exactly what an uninterrupted run would. Code
+changes (circuits, classifiers) are not part of the hash: delete the file
+after editing them.
+
+Grid points are evaluated in parallel threads and streamed
+(07_agentic/sweep_stream.py): each result is printed, tagged with its point,
+and checkpointed as soon as it finishes, in completion order. A summary in
+grid order, grouped by shots, follows once the grid is complete.
+"""
 
-    if p_gate > 0:
-        err_1 = depolarizing_error(p_gate, 1)
-        err_2 = depolarizing_error(p_gate, 2)
-        for g in ["x", "h", "z"]:
-            noise_model.add_all_qubit_quantum_error(err_1, g)
-        noise_model.add_all_qubit_quantum_error(err_2, "cx")
+import hashlib
+import json
 
-    if p_readout > 0:
-        ro = ReadoutError([[1 - p_readout, p_readout],
-                           [p_readout, 1 - p_readout]])
-        noise_model.add_all_qubit_readout_error(ro)
+import shared_modules  # noqa: F401
+from agent_runtime import append_checkpoint, load_checkpoint
+from dj_sampling import (NOISY_1Q, NOISY_2Q, apply_readout_error, classify_majority, gate_noise_distribution,
+                         random_oracle, sample_counts, trial_streams)
+from sequential_classifier import classify_sequential
+from sweep_stream import stream_sweep
 
-    return noise_model
+seed = 123
+max_workers = 4
+
+CHECKPOINT = True
+checkpoint_path = "experiments/03_oracles/results/exp_07a_checkpoint.jsonl"
+
+# Sequential mode: shots are streamed in blocks and each trial stops as soon
+# as the classification is settled (the fixed budget becomes a cap)
+SEQUENTIAL = True
+seq_method = "sprt"      # "sprt" or "bayes"
+seq_block = 8            # shots per block
+seq_alpha = 0.01         # target P(BALANCED | constant oracle)
+seq_beta = 0.01          # target P(CONSTANT | balanced oracle)
+theta_constant = 0.65    # SPRT hypotheses for theta = P(00 | 00 or runner-up outcome)
+theta_balanced = 0.35
+
+# ---- Checkpoint / resume ----
+
+def point_hash(point: dict) -> str:
+    return hashlib.sha256(json.dumps(point, sort_keys=True).encode()).hexdigest()
+
+def evaluate_point(trials, shots, p_readout, p_gate, seed_key) -> dict:
+    correct = 0
+    seq_correct = 0
+    seq_shots = 0
+    for t in range(trials):
+        oracle_stream, shot_stream, seq_stream = trial_streams(seed, *seed_key, t, generators=2)
+        kind, table = random_oracle(oracle_stream)
+        probs = apply_readout_error(gate_noise_distribution(p_gate, tuple(table)), p_readout)
+        pred = classify_majority(sample_counts(probs, shots, shot_stream))
+        correct += 1 if pred == kind else 0
+
+        if SEQUENTIAL:
+            seq_pred, used = classify_sequential(probs, shots, seq_stream, seq_method, seq_block,
+                                                 seq_alpha, seq_beta, theta_constant, theta_balanced)
+            seq_correct += 1 if seq_pred == kind else 0
+            seq_shots += used
+
+    return {"correct": correct, "seq_correct": seq_correct, "seq_shots": seq_shots}
+
+def grid_points(trials, shots_list, p_gate_list, p_readout_list):
+    for i_shots, shots in enumerate(shots_list):
+        for i_readout, p_readout in enumerate(p_readout_list):
+            for i_gate, p_gate in enumerate(p_gate_list):
+                yield {
+                    "experiment": "exp_07a", "seed": seed, "seed_key": [i_shots, i_readout, i_gate],
+                    "trials": trials, "shots": shots, "p_readout": p_readout, "p_gate": p_gate,
+                    "noise_model": {"kind": "depolarizing", "1q": NOISY_1Q, "2q": NOISY_2Q},
+                    "sequential": [SEQUENTIAL, seq_method, seq_block, seq_alpha, seq_beta,
+                                   theta_constant, theta_balanced],
+                }
+
+def run_point(point) -> dict:
+    return evaluate_point(point["trials"], point["shots"], point["p_readout"], point["p_gate"], point["seed_key"])
+
+def print_point(point, result, note=""):
+    trials = point["trials"]
+    line = (f"shots={point['shots']:4d} p_readout={point['p_readout']:0.2f} p_gate={point['p_gate']:0.2f} "
+            f"-> accuracy={result['correct'] / trials:0.3f}")
+    if SEQUENTIAL:
+        line += (f" | sequential accuracy={result['seq_correct'] / trials:0.3f}, "
+                 f"shots/trial={result['seq_shots'] / trials:0.1f}")
+    print(line + note)
 
 def run_grid(trials, shots_list, p_gate_list, p_readout_list):
     print("\n=== Experiment 07A — Stress Test (DJ n=2) ===")
-    print(f"seed={seed}, trials={trials}")
-
-    for shots in shots_list:
-        print(f"\n--- shots={shots} ---")
-        for p_readout in p_readout_list:
-            print(f"  readout p={p_readout}")
-            for p_gate in p_gate_list:
-                sim = AerSimulator(noise_model=build_noise_model(p_gate, p_readout))
-
-                correct = 0
-                for _ in range(trials):
-                    kind = random.choice(["CONSTANT", "BALANCED"])
-                    table = random_constant_table() if kind == "CONSTANT" else random_balanced_table()
-                    oracle = oracle_from_truth_table(table)
-                    qc = deutsch_jozsa_circuit(oracle)
-                    counts = sim.run(qc, shots=shots).result().get_counts()
-                    pred = classify_majority(counts)
-                    correct += 1 if pred == kind else 0
-
-                acc = correct / trials
-                print(f"    p_gate={p_gate:0.2f} -> accuracy={acc:0.3f}")
+    print(f"seed={seed}, trials={trials}, max_workers={max_workers}")
+    if SEQUENTIAL:
+        print(f"sequential: method={seq_method}, block={seq_block}, alpha={seq_alpha}, beta={seq_beta}")
+    print()
+
+    done = load_checkpoint(checkpoint_path) if CHECKPOINT else {}
+    points = list(grid_points(trials, shots_list, p_gate_list, p_readout_list))
+    results = [None] * len(points)
+    fresh = []
+    for i, point in enumerate(points):
+        key = point_hash(point)
+        if key in done:
+            results[i] = done[key]
+            print_point(point, done[key], " (resumed)")
+        else:
+            fresh.append(i)
+
+    # results arrive in completion order; each is checkpointed the moment it lands
+    for _, i, result in stream_sweep(lambda i: run_point(points[i]), fresh, max_workers=max_workers):
+        if CHECKPOINT:
+            append_checkpoint(checkpoint_path, point_hash(points[i]), result, point=points[i])
+        results[i] = result
+        print_point(points[i], result)
+
+    print("\n--- Summary (grid order) ---")
+    for i, (point, result) in enumerate(zip(points, results)):
+        if i and point["shots"] != points[i - 1]["shots"]:
+            print()
+        print_point(point, result)
+
+    if CHECKPOINT:
+        n_points = len(shots_list) * len(p_readout_list) * len(p_gate_list)
+        print(f"\ncheckpoint: {n_points - len(fresh)} points resumed from {checkpoint_path}")
 
 # Stress knobs (these should force degradation)
 trials = 40
@@ -3,19 +3,50 @@ Experiment 07C — Agentic threshold search (DJ n=2)
 
 Agent behavior:
 - Goal: find the largest p_gate such that accuracy >= target_accuracy.
-- Strategy: iterative search (coarse-to-fine).
+- Strategy: noisy bisection on p_gate. Each midpoint is evaluated with an
+  adaptive number of trials (blocks of trials until the confidence interval
+  of the accuracy excludes the target), and the search stops at a requested
+  p resolution and overall confidence. This replaces the 9-point coarse scan
+  + 11-point refine (20 evaluations of `trials` each, 1200 trials); with at
+  most 160 trials per point it evaluates 6 points with 960 trials.
+- The loop runs in the shared agent runtime (07_agentic/agent_runtime.py):
+  trial / call / wall-clock budgets, memoized evaluations, cost telemetry.
+- Reproducible streams: the runtime hands every block of trials a child seed
+  of `seed` (numpy SeedSequence); each trial spawns its own oracle stream
+  (random_constant_table / random_balanced_table) and shot stream from it, so
+  blocks can be evaluated in parallel with results identical to a serial run.
+- Checkpoint / resume (CHECKPOINT): every evaluated trial block is appended to
+  a JSONL checkpoint under the content hash of the search config and the
+  block; a restarted search reads finished blocks back and reaches the same
+  bracket as an uninterrupted run.
 
 This is a minimal example of agentic experimentation:
 hypothesis -> experiment -> evaluation -> update -> stop.
+
+Differentiable mode: the exact single-shot success S(p_gate) (density-matrix
+distributions of all 8 constant/balanced oracles, readout error and mitigation
+applied to the probabilities) is returned together with dS/dp_gate (central
+finite difference). Newton locates the p_gate where S reaches
+target_single_shot in a few evaluations, and the slope at the bisection
+estimate reports how sensitive the operating point is to p_gate.
+
+With MITIGATE_READOUT, count histograms are corrected with cached per-qubit
+readout calibration matrices (tensored inverse, inverted once when the
+calibration is loaded) before the majority vote.
 """
 
-import random
-from qiskit import QuantumCircuit
-from qiskit_aer import AerSimulator
-from qiskit_aer.noise import NoiseModel, depolarizing_error, ReadoutError
+import itertools
+import json
+import os
+import numpy as np
+
+import shared_modules  # noqa: F401
+from agent_runtime import AgentRuntime, Budget, BisectionPolicy, NewtonPolicy, Request, print_telemetry, request_seed
+from dj_sampling import (apply_readout_error, classify_majority, gate_noise_distribution, random_oracle,
+                         sample_counts, trial_streams)
 
 seed = 99
-random.seed(seed)
+CALIBRATION_KEY = 1  # spawn-key prefix of the calibration stream (trial blocks use request seeds)
 
 shots = 128
 trials = 60
@@ -23,121 +54,157 @@ target_accuracy = 0.95
 
 p_readout = 0.05  # fixed readout noise for the search
 
-X = [(0,0), (0,1), (1,0), (1,1)]
-
-def random_constant_table():
-    v = random.choice([0, 1])
-    return [v, v, v, v]
-
-def random_balanced_table():
-    ones_idx = set(random.sample(range(4), 2))
-    return [1 if i in ones_idx else 0 for i in range(4)]
-
-def oracle_from_truth_table(table):
-    qc = QuantumCircuit(3)
-    for (x0, x1), fx in zip(X, table):
-        if fx == 0:
-            continue
-
-        if x0 == 0:
-            qc.x(0)
-        if x1 == 0:
-            qc.x(1)
-
-        qc.ccx(0, 1, 2)
-
-        if x1 == 0:
-            qc.x(1)
-        if x0 == 0:
-            qc.x(0)
-    return qc
-
-def deutsch_jozsa(oracle):
-    qc = QuantumCircuit(3, 2)
-    qc.x(2)
-    qc.h(0); qc.h(1); qc.h(2)
-    qc.compose(oracle, inplace=True)
-    qc.h(0); qc.h(1)
-    qc.measure(0, 0)
-    qc.measure(1, 1)
-    return qc
-
-def classify_majority(counts):
-    most_common = max(counts.items(), key=lambda kv: kv[1])[0]
-    return "CONSTANT" if most_common == "00" else "BALANCED"
-
-def build_noise_model(p_gate: float, p_readout: float) -> NoiseModel:
-    nm = NoiseModel()
-
-    if p_gate > 0:
-        err_1 = depolarizing_error(p_gate, 1)
-        err_2 = depolarizing_error(p_gate, 2)
-        for g in ["x", "h", "z"]:
-            nm.add_all_qubit_quantum_error(err_1, g)
-        nm.add_all_qubit_quantum_error(err_2, "cx")
-
-    if p_readout > 0:
-        ro = ReadoutError([[1 - p_readout, p_readout],
-                           [p_readout, 1 - p_readout]])
-        nm.add_all_qubit_readout_error(ro)
-
-    return nm
-
-def evaluate_accuracy(p_gate: float) -> float:
-    sim = AerSimulator(noise_model=build_noise_model(p_gate, p_readout))
+# Threshold search
+p_bracket = (0.0, 0.5)
+p_resolution = 0.01
+search_confidence = 0.95
+trial_block = 20         # trials per sampling block at a midpoint
+max_trials_per_point = 160  # caps the undecided points near the threshold below the grid's cost
+parallel_blocks = 4      # trial blocks proposed per bisection step (evaluated concurrently)
+
+# Differentiable mode (exact single-shot success + derivative, Newton)
+target_single_shot = 0.75
+derivative_step = 1e-4
+newton_tol = 1e-6
+
+# budgets enforced by the shared agent runtime (units: trials, count_correct calls, seconds)
+budget = Budget(shots=2000, calls=200, seconds=120.0, unit="trials")  # count_correct samples whole trials
+max_workers = 4
+
+CHECKPOINT = True
+checkpoint_path = "experiments/03_oracles/results/exp_07c_checkpoint.jsonl"
+
+MITIGATE_READOUT = True
+cal_shots = 8192
+cache_path = "experiments/03_oracles/results/readout_calibration_cache.json"
+
+ALL_TABLES = [t for t in itertools.product([0, 1], repeat=4) if sum(t) in (0, 2, 4)]
+
+def measure_calibration(n_bits: int):
+    """Per-bit A[measured, prepared] sampled from the |0...0> and |1...1> readouts."""
+    matrices = [np.zeros((2, 2)) for _ in range(n_bits)]
+    for prepared in (0, 1):
+        ideal = np.zeros(2 ** n_bits)
+        ideal[(2 ** n_bits - 1) if prepared else 0] = 1.0
+        stream = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(CALIBRATION_KEY, n_bits, prepared)))
+        hist = sample_counts(apply_readout_error(ideal, p_readout), cal_shots, stream)
+        for q in range(n_bits):
+            ones = sum(v for k, v in enumerate(hist) if (k >> q) & 1)
+            matrices[q][1, prepared] = ones / cal_shots
+            matrices[q][0, prepared] = 1 - ones / cal_shots
+    return matrices
+
+def load_calibration(n_bits: int):
+    key = f"n={n_bits}|p_readout={p_readout}|cal_shots={cal_shots}|seed={seed}"
+
+    cache = {}
+    if os.path.exists(cache_path):
+        with open(cache_path) as f:
+            cache = json.load(f)
+
+    if key not in cache:
+        cache[key] = [A.tolist() for A in measure_calibration(n_bits)]
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(cache_path, "w") as f:
+            json.dump(cache, f, indent=2)
+
+    return [np.array(A) for A in cache[key]]
+
+def apply_tensored(matrices, hists):
+    """Apply A_0 x A_1 x ... to hists of shape (batch, 2^n), one 2x2 factor per bit."""
+    n = len(matrices)
+    t = hists.reshape([-1] + [2] * n)
+    for q, A in enumerate(matrices):
+        axis = n - q  # axis 0 is the batch; bit 0 is the last (least significant) axis
+        t = np.moveaxis(np.tensordot(A, t, axes=(1, axis)), 0, axis)
+    return t.reshape(hists.shape)
+
+def mitigate(hists: np.ndarray) -> np.ndarray:
+    """Tensored inverse of the calibration on (batch, 2^n) histograms, negative parts clipped."""
+    return np.clip(apply_tensored(calibration_inverse, hists), 0, None)
+
+calibration = load_calibration(2) if MITIGATE_READOUT else None
+calibration_inverse = [np.linalg.inv(A) for A in calibration] if MITIGATE_READOUT else None
+
+def count_correct(p_gate: float, n_trials: int, seed: int) -> int:
+    """Number of correctly classified random oracles out of n_trials (seed: the block's child seed)."""
     correct = 0
-
-    for _ in range(trials):
-        kind = random.choice(["CONSTANT", "BALANCED"])
-        table = random_constant_table() if kind == "CONSTANT" else random_balanced_table()
-        qc = deutsch_jozsa(oracle_from_truth_table(table))
-        counts = sim.run(qc, shots=shots).result().get_counts()
-        pred = classify_majority(counts)
+    for t in range(n_trials):
+        oracle_stream, shot_stream = trial_streams(seed, t)
+        kind, table = random_oracle(oracle_stream)
+        probs = apply_readout_error(gate_noise_distribution(p_gate, tuple(table)), p_readout)
+        hist = sample_counts(probs, shots, shot_stream)
+        if MITIGATE_READOUT:
+            hist = mitigate(hist[None, :])[0]
+        pred = classify_majority(hist)
         correct += 1 if pred == kind else 0
 
-    return correct / trials
+    return correct
 
-print("\n=== Experiment 07C — Agentic Threshold Search (DJ n=2) ===")
-print(f"seed={seed}, shots={shots}, trials={trials}, target_accuracy={target_accuracy}, p_readout={p_readout}")
-
-# Coarse-to-fine search over p_gate
-grid = [0.00, 0.05, 0.10, 0.15, 0.20, 0.25, 0.30, 0.35, 0.40]
-results = []
-
-for p in grid:
-    acc = evaluate_accuracy(p)
-    results.append((p, acc))
-    print(f"coarse p_gate={p:0.2f} -> accuracy={acc:0.3f}")
-
-# Find best p that still meets the target
-candidates = [p for p, acc in results if acc >= target_accuracy]
-if not candidates:
-    print("\nNo p_gate in coarse grid met the target. Try lowering target or noise.")
-    raise SystemExit(0)
-
-best = max(candidates)
-print(f"\nCoarse best p_gate meeting target: {best:0.2f}")
-
-# Refine around best
-low = max(0.0, best - 0.05)
-high = min(0.50, best + 0.05)
-
-print(f"\nRefining in [{low:0.3f}, {high:0.3f}] ...")
-
-# Simple refinement: step search with smaller step
-step = 0.01
-p = low
-best_refined = low
-best_acc = 0.0
-
-while p <= high + 1e-9:
-    acc = evaluate_accuracy(round(p, 3))
-    print(f"refine p_gate={p:0.3f} -> accuracy={acc:0.3f}")
-    if acc >= target_accuracy and p >= best_refined:
-        best_refined = p
-        best_acc = acc
-    p += step
+def evaluate_accuracy(p_gate: float) -> float:
+    return count_correct(p_gate, trials, request_seed(seed, Request(p_gate, trials))) / trials
+
+exact_evaluations = 0  # exact_single_shot_success runs, finite-difference points included
+
+def exact_single_shot_success(p_gate: float) -> float:
+    """Mean probability over all oracles that one shot gives the right answer."""
+    global exact_evaluations
+    exact_evaluations += 1
+    probs = np.array([apply_readout_error(gate_noise_distribution(p_gate, table), p_readout) for table in ALL_TABLES])
+    if MITIGATE_READOUT:
+        probs = mitigate(probs)
+    p00 = probs[:, 0] / probs.sum(axis=1)
+    constant = np.array([sum(table) in (0, 4) for table in ALL_TABLES])
+    return float(np.mean(np.where(constant, p00, 1 - p00)))
+
+def single_shot_with_derivative(p_gate: float):
+    """(S(p_gate), dS/dp_gate); one-sided at p_gate=0."""
+    h = derivative_step
+    f = exact_single_shot_success
+    if p_gate - h < 0:
+        f0, f1, f2 = f(p_gate), f(p_gate + h), f(p_gate + 2 * h)
+        return f0, (-3 * f0 + 4 * f1 - f2) / (2 * h)
+    return f(p_gate), (f(p_gate + h) - f(p_gate - h)) / (2 * h)
 
+print("\n=== Experiment 07C — Agentic Threshold Search (DJ n=2) ===")
+print(f"seed={seed}, shots={shots}, target_accuracy={target_accuracy}, p_readout={p_readout}")
+print(f"MITIGATE_READOUT={MITIGATE_READOUT}")
+print(f"bisection: bracket={p_bracket}, resolution={p_resolution}, confidence={search_confidence}, "
+      f"trial_block={trial_block}, max_trials_per_point={max_trials_per_point}, parallel_blocks={parallel_blocks}")
+
+# every trial block has its own seeded streams, so blocks may run concurrently
+checkpoint_context = {
+    "experiment": "exp_07c", "evaluator": "count_correct", "shots": shots, "p_readout": p_readout,
+    "mitigate_readout": MITIGATE_READOUT, "cal_shots": cal_shots,
+    "calibration": [A.tolist() for A in calibration] if MITIGATE_READOUT else None,
+}
+runtime = AgentRuntime(count_correct, budget, max_workers=max_workers, seed=seed,
+                       checkpoint=checkpoint_path if CHECKPOINT else None,
+                       checkpoint_context=checkpoint_context)
+policy = BisectionPolicy(*p_bracket, target_accuracy, p_resolution, search_confidence,
+                         trial_block, max_trials_per_point, parallel_blocks=parallel_blocks)
+(low, high), telemetry = runtime.run(policy)
+
+for p, acc, n, ok in policy.history:
+    print(f"p_gate={p:0.4f} -> accuracy={acc:0.3f} ({n:3d} trials) | {'OK' if ok else 'FAIL'}")
+
+used = sum(n for _, _, n, _ in policy.history)
 print("\n=== Threshold estimate ===")
-print("Estimated max p_gate with accuracy >= target:", round(best_refined, 3))
-print("Accuracy at estimate:", round(best_acc, 3))
+print(f"Estimated max p_gate with accuracy >= target: {low:0.3f} (threshold in [{low:0.3f}, {high:0.3f}])")
+print(f"Evaluations: {len(policy.history)} points, {used} trials "
+      f"(coarse + refine grid: 20 points, {20 * trials} trials)")
+print_telemetry("noisy bisection", telemetry)
+
+print(f"\n=== Differentiable mode: exact single-shot success, target={target_single_shot} ===")
+newton = NewtonPolicy(*p_bracket, target_single_shot, newton_tol)
+p_star, telemetry = AgentRuntime(single_shot_with_derivative, budget, max_workers=1).run(newton)
+newton_evaluations = exact_evaluations
+
+for p, value, _, ok in newton.history:
+    print(f"p_gate={p:0.6f} -> S={value:0.4f} | {'OK' if ok else 'FAIL'}")
+print(f"Newton: S(p_gate) = {target_single_shot} at p_gate={p_star:0.6f} "
+      f"({len(newton.history)} steps, {newton_evaluations} exact evaluations of S "
+      f"including the finite-difference points)")
+
+value, slope = single_shot_with_derivative(low)
+print(f"Sensitivity at the bisection estimate p_gate={low:0.3f}: S={value:0.4f}, dS/dp_gate={slope:0.3f}")
@@ -8,100 +8,62 @@ and saves a PNG plot in experiments/03_oracles/results/.
 Notes:
 - Uses majority-vote classification on the most frequent outcome.
 - Includes depolarizing gate noise and optional readout noise.
+- Readout noise is applied classically (tensored confusion matrix) to the
+  exact gate-noise distribution, which is simulated once per (p_gate, table).
+- With CRN (common random numbers), every p_gate sees the same trial oracles
+  and the same per-trial shot uniforms (inverse-CDF sampling), so adjacent
+  curve points differ only through the noise, not through fresh randomness.
+- Trial oracles and shot uniforms come from child streams of `seed` (numpy
+  SeedSequence, spawn key = [sweep point,] trial), so every curve point can
+  be recomputed in isolation or in parallel with identical results.
+- The sweep is streamed (07_agentic/sweep_stream.py): curve points are
+  evaluated in parallel threads and each result is printed as soon as it
+  lands; with PLOT_PARTIAL the PNG is redrawn from the points finished so far
+  every `plot_every` results, so a long sweep can be watched while it runs.
 """
 
-import random
+import numpy as np
 import matplotlib.pyplot as plt
 
-from qiskit import QuantumCircuit
-from qiskit_aer import AerSimulator
-from qiskit_aer.noise import NoiseModel, depolarizing_error, ReadoutError
+import shared_modules  # noqa: F401
+from dj_sampling import (apply_readout_error, classify_majority, counts_from_uniforms, gate_noise_distribution,
+                         random_oracle, trial_streams)
+from sweep_stream import stream_sweep
 
 # ---- Config ----
 seed = 2026
-random.seed(seed)
 
 shots = 128
 trials = 80
 p_readout = 0.05
+CRN = True
 
 p_gate_list = [0.00, 0.05, 0.10, 0.12, 0.14, 0.16, 0.18, 0.20, 0.22, 0.24, 0.26, 0.28, 0.30]
 
+max_workers = 4
+PLOT_PARTIAL = True
+plot_every = 4
+
 out_path = "experiments/03_oracles/results/exp_08_accuracy_vs_pgate.png"
 
 # ---- Helpers ----
-X = [(0, 0), (0, 1), (1, 0), (1, 1)]
-
-def random_constant_table():
-    v = random.choice([0, 1])
-    return [v, v, v, v]
-
-def random_balanced_table():
-    ones_idx = set(random.sample(range(4), 2))
-    return [1 if i in ones_idx else 0 for i in range(4)]
-
-def oracle_from_truth_table(table):
-    qc = QuantumCircuit(3)
-    for (x0, x1), fx in zip(X, table):
-        if fx == 0:
-            continue
-
-        if x0 == 0:
-            qc.x(0)
-        if x1 == 0:
-            qc.x(1)
-
-        qc.ccx(0, 1, 2)
-
-        if x1 == 0:
-            qc.x(1)
-        if x0 == 0:
-            qc.x(0)
-
-    return qc
-
-def deutsch_jozsa(oracle):
-    qc = QuantumCircuit(3, 2)
-    qc.x(2)
-    qc.h(0); qc.h(1); qc.h(2)
-    qc.compose(oracle, inplace=True)
-    qc.h(0); qc.h(1)
-    qc.measure(0, 0)
-    qc.measure(1, 1)
-    return qc
-
-def classify_majority(counts):
-    most_common = max(counts.items(), key=lambda kv: kv[1])[0]
-    return "CONSTANT" if most_common == "00" else "BALANCED"
-
-def build_noise_model(p_gate: float, p_readout: float) -> NoiseModel:
-    nm = NoiseModel()
-
-    if p_gate > 0:
-        err_1 = depolarizing_error(p_gate, 1)
-        err_2 = depolarizing_error(p_gate, 2)
-        for g in ["x", "h", "z"]:
-            nm.add_all_qubit_quantum_error(err_1, g)
-        nm.add_all_qubit_quantum_error(err_2, "cx")
-
-    if p_readout > 0:
-        ro = ReadoutError([[1 - p_readout, p_readout],
-                           [p_readout, 1 - p_readout]])
-        nm.add_all_qubit_readout_error(ro)
-
-    return nm
-
-def evaluate_accuracy(p_gate: float) -> float:
-    sim = AerSimulator(noise_model=build_noise_model(p_gate, p_readout))
+def draw_trial_plan(*point_key):
+    """Trial oracles + shot uniforms for one accuracy evaluation."""
+    plan = []
+    for t in range(trials):
+        oracle_stream, shot_stream = trial_streams(seed, *point_key, t)
+        kind, table = random_oracle(oracle_stream)
+        plan.append((kind, tuple(table), shot_stream.random(shots)))
+    return plan
+
+common_plan = draw_trial_plan() if CRN else None
+
+def evaluate_accuracy(p_gate: float, point: int = 0) -> float:
     correct = 0
 
-    for _ in range(trials):
-        kind = random.choice(["CONSTANT", "BALANCED"])
-        table = random_constant_table() if kind == "CONSTANT" else random_balanced_table()
-
-        qc = deutsch_jozsa(oracle_from_truth_table(table))
-        counts = sim.run(qc, shots=shots).result().get_counts()
-        pred = classify_majority(counts)
+    for kind, table, uniforms in (common_plan if CRN else draw_trial_plan(point)):
+        probs = apply_readout_error(gate_noise_distribution(p_gate, table), p_readout)
+        pred = classify_majority(counts_from_uniforms(probs, uniforms))
 
         if pred == kind:
             correct += 1
@@ -110,25 +72,34 @@ def evaluate_accuracy(p_gate: float) -> float:
 
 # ---- Run sweep ----
 print("\n=== Experiment 08 — Accuracy vs p_gate (DJ n=2) ===")
-print(f"seed={seed}, shots={shots}, trials={trials}, p_readout={p_readout}")
+print(f"seed={seed}, shots={shots}, trials={trials}, p_readout={p_readout}, CRN={CRN}")
 print("p_gate_list =", p_gate_list)
 
-accuracies = []
-for p in p_gate_list:
-    acc = evaluate_accuracy(p)
-    accuracies.append(acc)
-    print(f"p_gate={p:0.2f} -> accuracy={acc:0.3f}")
+def save_plot(accuracies):
+    # unfinished points are NaN and left out of the line
+    done = ~np.isnan(accuracies)
+    plt.figure()
+    plt.plot(np.asarray(p_gate_list)[done], accuracies[done], marker="o")
+    plt.title("Deutsch–Jozsa (n=2): Accuracy vs Gate Noise")
+    plt.xlabel("Depolarizing gate noise (p_gate)")
+    plt.ylabel("Accuracy")
+    plt.ylim(0.0, 1.05)
+    plt.grid(True)
+
+    plt.tight_layout()
+    plt.savefig(out_path, dpi=200)
+    plt.close()
+
+accuracies = np.full(len(p_gate_list), np.nan)
+sweep = stream_sweep(lambda i: evaluate_accuracy(p_gate_list[i], i), range(len(p_gate_list)),
+                     max_workers=max_workers)
+for n_done, (i, _, acc) in enumerate(sweep, start=1):
+    accuracies[i] = acc
+    print(f"p_gate={p_gate_list[i]:0.2f} -> accuracy={acc:0.3f}   [{n_done}/{len(p_gate_list)}]")
+    if PLOT_PARTIAL and n_done % plot_every == 0 and n_done < len(p_gate_list):
+        save_plot(accuracies)
 
 # ---- Plot ----
-plt.figure()
-plt.plot(p_gate_list, accuracies, marker="o")
-plt.title("Deutsch–Jozsa (n=2): Accuracy vs Gate Noise")
-plt.xlabel("Depolarizing gate noise (p_gate)")
-plt.ylabel("Accuracy")
-plt.ylim(0.0, 1.05)
-plt.grid(True)
-
-plt.tight_layout()
-plt.savefig(out_path, dpi=200)
+save_plot(accuracies)
 
 print("\nSaved plot to:", out_path)
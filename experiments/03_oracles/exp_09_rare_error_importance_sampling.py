@@ -0,0 +1,192 @@
+"""
+Experiment 09 — Rare-error estimation at small p_gate (Deutsch–Jozsa n=2)
+
+At p_gate ~ 1e-4 .. 1e-3 a gate error almost never fires in 1024 shots, so
+Experiment 06 reports accuracy = 1.0 with a huge relative uncertainty.
+
+Quantity of interest: the per-shot failure probability of the DJ decision,
+averaged over the random oracle ensemble of Experiment 06:
+  constant oracle -> failure if the input register is NOT 00
+  balanced oracle -> failure if the input register IS 00
+
+Importance sampling by conditioning on at least one fault:
+- every noisy gate location i fires a non-identity Pauli with prob q_i
+  (depolarizing: 3p/4 on 1q gates, 15p/16 on cx, as in Aer)
+- without faults the circuit never fails, so
+    P(fail) = P(>= 1 fault) * E[ P(fail | faults) | >= 1 fault ]
+  where P(>= 1 fault) = 1 - prod(1 - q_i) is exact
+- we sample fault patterns conditioned on >= 1 fault (first faulty location
+  drawn exactly, the rest independently), insert the Paulis, and compute
+  P(fail | faults) exactly from the statevector (no measurement sampling)
+
+Every sample is informative, so the relative error no longer blows up as p -> 0.
+Estimates come with 95% confidence intervals and are checked against the
+exact density-matrix value.
+
+Every importance sample has its own oracle stream and fault stream, derived
+from `seed` with numpy's SeedSequence (spawn key = p_gate index + sample
+index), as in Experiments 06/07a/08; the naive comparison draws from its own
+pair of streams per p_gate. Any sample can be recomputed in isolation.
+"""
+
+from functools import lru_cache
+import numpy as np
+from qiskit.quantum_info import Operator
+
+from dj_sampling import (NOISY_1Q, NOISY_2Q, deutsch_jozsa_circuit, gate_noise_distribution,
+                         oracle_from_truth_table, random_oracle, trial_streams)
+
+seed = 11
+IS_KEY, NAIVE_KEY = 0, 1  # spawn-key prefixes of the two stream families
+
+p_gate_list = [0.0001, 0.0003, 0.001, 0.003]
+is_samples = 2000         # conditioned fault patterns per point
+naive_shots = 100_000     # plain Monte Carlo shots per point, for comparison
+z95 = 1.96
+
+PAULI = {
+    "I": np.eye(2, dtype=complex),
+    "X": np.array([[0, 1], [1, 0]], dtype=complex),
+    "Y": np.array([[0, -1j], [1j, 0]], dtype=complex),
+    "Z": np.array([[1, 0], [0, -1]], dtype=complex),
+}
+
+def is_constant(table):
+    return all(v == table[0] for v in table)
+
+# ---- Exact reference (density matrix) ----
+
+def exact_failure(p_gate: float, table) -> float:
+    p00 = float(gate_noise_distribution(p_gate, tuple(table))[0])
+    return 1 - p00 if is_constant(table) else p00
+
+def all_tables():
+    constant = [[v] * 4 for v in (0, 1)]
+    balanced = [[1 if i in (a, b) else 0 for i in range(4)] for a in range(4) for b in range(a + 1, 4)]
+    return constant, balanced
+
+def exact_ensemble_failure(p_gate: float) -> float:
+    """Same ensemble as Experiment 06: kind 50/50, then a uniform table of that kind."""
+    constant, balanced = all_tables()
+    return (0.5 * np.mean([exact_failure(p_gate, t) for t in constant])
+            + 0.5 * np.mean([exact_failure(p_gate, t) for t in balanced]))
+
+# ---- Fault-conditioned importance sampling ----
+
+@lru_cache(maxsize=None)
+def compile_ops(table: tuple):
+    """
+    DJ circuit as (gate name, matrix, qubits) ops, measurements removed.
+    Cached: compiled once per truth table, not once per sample.
+    """
+    qc = deutsch_jozsa_circuit(oracle_from_truth_table(table)).remove_final_measurements(inplace=False)
+    ops = []
+    for inst in qc.data:
+        name = inst.operation.name
+        qubits = [qc.find_bit(q).index for q in inst.qubits]
+        ops.append((name, Operator(inst.operation).data, qubits))
+    return tuple(ops)
+
+def apply_matrix(psi, mat, qubits, n):
+    k = len(qubits)
+    axes = [n - 1 - q for q in reversed(qubits)]
+    t = np.tensordot(mat.reshape([2] * (2 * k)), psi.reshape([2] * n),
+                     axes=(list(range(k, 2 * k)), axes))
+    return np.moveaxis(t, list(range(k)), axes).reshape(-1)
+
+def fault_probability(name: str, p_gate: float) -> float:
+    if name in NOISY_1Q:
+        return 3 * p_gate / 4
+    if name in NOISY_2Q:
+        return 15 * p_gate / 16
+    return 0.0
+
+def sample_conditioned_faults(q, stream: np.random.Generator):
+    """Fault indicator vector for independent Bernoulli(q_i), conditioned on >= 1 fault."""
+    survive = np.concatenate([[1.0], np.cumprod(1 - q)[:-1]])
+    first = q * survive
+    i = stream.choice(len(q), p=first / first.sum())
+
+    faults = np.zeros(len(q), dtype=bool)
+    faults[i] = True
+    faults[i + 1:] = stream.random(len(q) - i - 1) < q[i + 1:]
+    return faults
+
+def random_pauli(n_qubits: int, stream: np.random.Generator):
+    while True:
+        label = "".join(stream.choice(list("IXYZ"), size=n_qubits))
+        if label != "I" * n_qubits:
+            return label
+
+def failure_given_faults(ops, faults, constant: bool, stream: np.random.Generator, n: int = 3) -> float:
+    psi = np.zeros(2 ** n, dtype=complex)
+    psi[0] = 1.0
+
+    for (name, mat, qubits), faulty in zip(ops, faults):
+        psi = apply_matrix(psi, mat, qubits, n)
+        if faulty:
+            for letter, q in zip(random_pauli(len(qubits), stream), qubits):
+                psi = apply_matrix(psi, PAULI[letter], [q], n)
+
+    # P(q0 = 0 and q1 = 0): indices with bits 0 and 1 clear
+    p00 = float(np.sum(np.abs(psi[[0, 4]]) ** 2))
+    return 1 - p00 if constant else p00
+
+def importance_sampling_failure(p_gate: float, samples: int, i_gate: int):
+    """
+    Unbiased estimate of the ensemble failure probability with a 95% CI.
+    The oracle is drawn per sample from the Experiment 06 ensemble.
+    """
+    weighted = np.empty(samples)
+    for s in range(samples):
+        oracle_stream, fault_stream = trial_streams(seed, IS_KEY, i_gate, s)
+        kind, table = random_oracle(oracle_stream)
+
+        ops = compile_ops(tuple(table))
+        q = np.array([fault_probability(name, p_gate) for name, _, _ in ops])
+        p_any = 1 - np.prod(1 - q)
+
+        faults = sample_conditioned_faults(q, fault_stream)
+        weighted[s] = p_any * failure_given_faults(ops, faults, kind == "CONSTANT", fault_stream)
+
+    est = weighted.mean()
+    half = z95 * weighted.std(ddof=1) / np.sqrt(samples)
+    return est, est - half, est + half
+
+def naive_failure(p_gate: float, shots: int, exact_by_table: dict, i_gate: int):
+    """Plain Monte Carlo: one random oracle + one noisy shot per sample (Wilson CI)."""
+    oracle_stream, shot_stream = trial_streams(seed, NAIVE_KEY, i_gate)
+    fails = 0
+    for _ in range(shots):
+        _, table = random_oracle(oracle_stream)
+        fails += shot_stream.random() < exact_by_table[tuple(table)]
+
+    phat = fails / shots
+    denom = 1 + z95 ** 2 / shots
+    center = (phat + z95 ** 2 / (2 * shots)) / denom
+    half = z95 * np.sqrt(phat * (1 - phat) / shots + z95 ** 2 / (4 * shots ** 2)) / denom
+    return phat, max(0.0, center - half), center + half
+
+print("\n=== Experiment 09 — Rare-error importance sampling (DJ n=2) ===")
+print(f"seed={seed}, is_samples={is_samples}, naive_shots={naive_shots}")
+print("Metric: per-shot DJ failure probability over the random oracle ensemble")
+
+for i_gate, p_gate in enumerate(p_gate_list):
+    exact = exact_ensemble_failure(p_gate)
+
+    constant, balanced = all_tables()
+    exact_by_table = {tuple(t): exact_failure(p_gate, t) for t in constant + balanced}
+
+    est, lo, hi = importance_sampling_failure(p_gate, is_samples, i_gate)
+    n_est, n_lo, n_hi = naive_failure(p_gate, naive_shots, exact_by_table, i_gate)
+
+    print(f"\n--- p_gate={p_gate} ---")
+    print(f"exact (density matrix):       {exact:0.3e}")
+    print(f"importance sampling ({is_samples}): {est:0.3e}  CI95=[{lo:0.3e}, {hi:0.3e}]  "
+          f"rel. half-width={(hi - lo) / 2 / est:0.1%}")
+    print(f"naive MC ({naive_shots} shots):   {n_est:0.3e}  CI95=[{n_lo:0.3e}, {n_hi:0.3e}]  "
+          f"rel. half-width={((n_hi - n_lo) / 2 / n_est) if n_est > 0 else float('inf'):0.1%}")
+
+print("\nExpected:")
+print("- IS intervals cover the exact value with a few-% relative width from 2000 samples")
+print("- naive MC needs orders of magnitude more shots for the same relative precision")
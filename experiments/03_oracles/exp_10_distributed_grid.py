@@ -0,0 +1,209 @@
+"""
+Experiment 10 — Distributed DJ accuracy grid over a shared work queue
+
+Grid: Deutsch–Jozsa accuracy over n x p_gate x p_readout x shots. Each grid
+point is one task in a SQLite work queue (07_agentic/work_queue.py): workers
+lease a point, heartbeat while evaluating it, and store the result; points
+of crashed or failing workers are retried after their lease expires.
+
+Roles (first command-line argument):
+- local  (default): submit the grid, start `local_workers` worker processes on
+  this machine, wait for them and print the report
+- submit: only enqueue the grid (with requeue_failed, points that failed in an
+  earlier run are queued again)
+- worker: run one worker (start this on every box that shares queue_path)
+- report: print the results collected so far
+
+Every point draws its oracles and shots from child streams of `seed` keyed by
+its grid position (numpy SeedSequence), so the result of a point does not
+depend on which worker evaluated it or how often it was retried; VERIFY
+recomputes a few points in-process and compares.
+
+INJECT_FAULTS (local role) exercises the recovery paths: one worker raises on
+its second task (retried via fail) and one dies without a trace on its third
+(retried after its lease expires).
+
+The multi-controlled oracle is transpiled to x/h/z/cx/u before the density-
+matrix run (Aer's density_matrix method has no mcx); depolarizing noise acts
+on x, h, z and cx, readout flips are applied classically.
+"""
+
+import hashlib
+import itertools
+import json
+import multiprocessing as mp
+import os
+import random
+import sys
+import time
+from functools import lru_cache
+import numpy as np
+from qiskit import QuantumCircuit, transpile
+from qiskit_aer import AerSimulator
+
+import shared_modules  # noqa: F401
+from dj_sampling import apply_readout_error, build_noise_model, classify_majority, sample_counts, trial_streams
+from work_queue import WorkQueue, run_worker
+
+seed = 10
+
+n_list = [2, 3]
+p_gate_list = [0.00, 0.05, 0.10, 0.20]
+p_readout_list = [0.00, 0.05]
+shots_list = [64, 256]
+trials = 40
+
+queue_path = "experiments/03_oracles/results/exp_10_queue.sqlite"
+lease_seconds = 4.0
+max_attempts = 3
+local_workers = 4
+requeue_failed = True  # on submit, give points that failed in an earlier run new attempts
+
+INJECT_FAULTS = True
+VERIFY = 3  # grid points recomputed in-process for comparison
+
+BASIS = ["x", "h", "z", "cx", "u"]
+
+# ---- DJ for n input bits ----
+
+def random_constant_table(n: int, stream=random):
+    v = stream.choice([0, 1])
+    return [v] * 2 ** n
+
+def random_balanced_table(n: int, stream=random):
+    ones_idx = set(stream.sample(range(2 ** n), 2 ** (n - 1)))
+    return [1 if i in ones_idx else 0 for i in range(2 ** n)]
+
+def oracle_from_truth_table(n: int, table):
+    qc = QuantumCircuit(n + 1)
+    for x, fx in enumerate(table):
+        if fx == 0:
+            continue
+        zeros = [q for q in range(n) if not (x >> (n - 1 - q)) & 1]  # q0 = most significant input bit
+        for q in zeros:
+            qc.x(q)
+        qc.mcx(list(range(n)), n)
+        for q in zeros:
+            qc.x(q)
+    return qc
+
+def deutsch_jozsa(n: int, oracle):
+    qc = QuantumCircuit(n + 1)
+    qc.x(n)
+    qc.h(range(n + 1))
+    qc.compose(oracle, inplace=True)
+    qc.h(range(n))
+    return qc
+
+@lru_cache(maxsize=None)
+def gate_noise_distribution(n: int, p_gate: float, table: tuple) -> np.ndarray:
+    """Exact distribution of the n input bits under gate noise, once per (n, p_gate, table)."""
+    qc = transpile(deutsch_jozsa(n, oracle_from_truth_table(n, table)), basis_gates=BASIS, optimization_level=0)
+    qc.save_probabilities(qubits=list(range(n)))
+
+    sim = AerSimulator(noise_model=build_noise_model(p_gate), method="density_matrix")
+    return np.asarray(sim.run(qc).result().data(0)["probabilities"])
+
+def evaluate_point(point: dict) -> dict:
+    """Task handler: majority-vote accuracy of one grid point."""
+    n = point["n"]
+    correct = 0
+    for t in range(point["trials"]):
+        oracle_stream, shot_stream = trial_streams(point["seed"], *point["seed_key"], t)
+        kind = oracle_stream.choice(["CONSTANT", "BALANCED"])
+        table = (random_constant_table(n, oracle_stream) if kind == "CONSTANT"
+                 else random_balanced_table(n, oracle_stream))
+
+        probs = apply_readout_error(gate_noise_distribution(n, point["p_gate"], tuple(table)), point["p_readout"])
+        pred = classify_majority(sample_counts(probs, point["shots"], shot_stream))
+        correct += 1 if pred == kind else 0
+
+    return {"correct": correct, "trials": point["trials"]}
+
+# ---- Grid and queue roles ----
+
+def grid_points():
+    axes = [n_list, p_gate_list, p_readout_list, shots_list]
+    for idx in itertools.product(*(range(len(a)) for a in axes)):
+        n, p_gate, p_readout, shots = (a[i] for a, i in zip(axes, idx))
+        point = {"n": n, "p_gate": p_gate, "p_readout": p_readout, "shots": shots,
+                 "trials": trials, "seed": seed, "seed_key": list(idx)}
+        yield hashlib.sha256(json.dumps(point, sort_keys=True).encode()).hexdigest(), point
+
+def open_queue() -> WorkQueue:
+    return WorkQueue(queue_path, lease_seconds=lease_seconds, max_attempts=max_attempts)
+
+def worker_main(index: int | None = None):
+    queue = open_queue()
+    raise_next = [False]
+
+    def inject(claimed, key, attempt):
+        if not INJECT_FAULTS or index is None or attempt > 1:
+            return
+        if index == 0 and claimed == 2:
+            raise_next[0] = True
+        if index == 1 and claimed == 3:
+            os._exit(1)  # dies holding the lease
+
+    def handler(point):
+        if raise_next[0]:
+            raise_next[0] = False
+            raise RuntimeError("injected transient failure")
+        return evaluate_point(point)
+
+    done = run_worker(queue, handler, on_claim=inject)
+    print(f"worker {index if index is not None else os.getpid()}: completed {done} tasks")
+
+def report(queue: WorkQueue):
+    results = queue.results()
+    points = dict(grid_points())
+
+    print(f"\nqueue status: {queue.counts()}")
+    for key, attempts, error in queue.retried():
+        p = points.get(key, {})
+        print(f"  retried: n={p.get('n')}, p_gate={p.get('p_gate')}, p_readout={p.get('p_readout')}, "
+              f"shots={p.get('shots')} -> {attempts} attempts (last error: {error})")
+
+    for n in n_list:
+        print(f"\n--- n={n} ---")
+        print("                      " + "  ".join(f"p_gate={p:0.2f}" for p in p_gate_list))
+        for shots in shots_list:
+            for p_readout in p_readout_list:
+                cells = []
+                for p_gate in p_gate_list:
+                    key = next(k for k, pt in points.items() if (pt["n"], pt["shots"], pt["p_readout"], pt["p_gate"])
+                               == (n, shots, p_readout, p_gate))
+                    r = results.get(key)
+                    cells.append(f"{r['correct'] / r['trials']:11.3f}" if r else f"{'-':>11s}")
+                print(f"shots={shots:4d} p_ro={p_readout:0.2f} " + "  ".join(cells))
+
+    if VERIFY:
+        done_keys = [k for k in points if k in results][:VERIFY]
+        same = all(evaluate_point(points[k]) == results[k] for k in done_keys)
+        print(f"\nverify: {len(done_keys)} points recomputed in-process -> identical to queue results: {same}")
+
+if __name__ == "__main__":
+    role = sys.argv[1] if len(sys.argv) > 1 else "local"
+    queue = open_queue()
+
+    if role in ("local", "submit"):
+        added = queue.enqueue(grid_points(), requeue_failed=requeue_failed)
+        print("\n=== Experiment 10 — Distributed DJ accuracy grid ===")
+        print(f"queue={queue_path}, new or requeued tasks={added}, lease={lease_seconds}s, "
+              f"max_attempts={max_attempts}")
+
+    if role == "worker":
+        worker_main()
+
+    if role == "local":
+        t0 = time.perf_counter()
+        workers = [mp.Process(target=worker_main, args=(i,)) for i in range(local_workers)]
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+        print(f"{local_workers} local workers finished in {time.perf_counter() - t0:.1f} s "
+              f"(exit codes: {[w.exitcode for w in workers]})")
+
+    if role in ("local", "report"):
+        report(queue)
@@ -0,0 +1,71 @@
+"""
+Sequential classifier — DJ n=2 majority vote with early stopping
+
+Shared by the Deutsch–Jozsa noise sweeps (exp_06, exp_07a). Instead of
+spending the full shot budget on every trial, shots are drawn in blocks and
+the trial stops as soon as the classification is settled; the budget becomes
+a cap, after which the plain majority vote decides.
+
+The test is whether "00" beats the most frequent other outcome (the
+runner-up), i.e. whether theta = P(00 | 00 or runner-up) > 1/2:
+- "sprt":  Wald's test of theta=theta_constant vs theta=theta_balanced
+- "bayes": posterior P(theta > 1/2) under a uniform prior
+
+alpha / beta are the target error rates P(BALANCED | constant oracle) and
+P(CONSTANT | balanced oracle).
+"""
+
+import math
+import numpy as np
+
+def posterior_constant(hits: int, rivals: int) -> float:
+    """
+    P(theta > 1/2 | data) under a uniform Beta(1, 1) prior.
+    Uses I_(1/2)(a, b) = P(Binomial(a + b - 1, 1/2) >= a) for integer a, b (no scipy).
+    """
+    a, n = 1 + hits, hits + rivals + 1
+    return 1 - sum(math.comb(n, j) for j in range(a, n + 1)) / 2 ** n
+
+def classify_sequential(probs: np.ndarray, max_shots: int, stream: np.random.Generator,
+                        method: str = "sprt", block: int = 8, alpha: float = 0.01, beta: float = 0.01,
+                        theta_constant: float = 0.65, theta_balanced: float = 0.35):
+    """
+    Classify one oracle from its c1c0 outcome distribution `probs`, drawing
+    shots in blocks of `block` from `stream`. Returns (prediction, shots_used).
+    """
+    upper = math.log((1 - beta) / alpha)
+    lower = math.log(beta / (1 - alpha))
+    llr_hit = math.log(theta_constant / theta_balanced)
+    llr_miss = math.log((1 - theta_constant) / (1 - theta_balanced))
+
+    probs = np.clip(probs, 0, None)
+    probs = probs / probs.sum()
+    hist = np.zeros(len(probs), dtype=int)
+    used = 0
+    while used < max_shots:
+        n = min(block, max_shots - used)
+        hist += stream.multinomial(n, probs)
+        used += n
+
+        hits = int(hist[0])
+        rivals = int(hist[1:].max())
+
+        if method == "sprt":
+            llr = hits * llr_hit + rivals * llr_miss
+            if llr >= upper:
+                return "CONSTANT", used
+            if llr <= lower:
+                return "BALANCED", used
+
+        elif method == "bayes":
+            post = posterior_constant(hits, rivals)
+            if post >= 1 - alpha:
+                return "CONSTANT", used
+            if post <= beta:
+                return "BALANCED", used
+
+        else:
+            raise ValueError("Unknown sequential method")
+
+    # budget exhausted: majority vote (ties go to the lowest outcome, as in the dict-based vote)
+    return ("CONSTANT" if int(np.argmax(hist)) == 0 else "BALANCED"), used
@@ -6,6 +6,11 @@ We prepare |+> and study how:
 - depolarizing noise
 
 affect measurement statistics and coherence.
+
+All runs share one simulator seed (common random numbers). With
+CONTROL_VARIATE, each P(0) estimate is corrected by the shot-noise error of the
+ideal (p=0) run, whose exact value is known:
+  P_cv(p) = P_hat(p) - (P_hat(0) - P_exact(0))
 """
 
 import numpy as np
@@ -17,6 +22,9 @@ from qiskit_aer.noise import NoiseModel, phase_damping_error, depolarizing_error
 shots = 4096
 noise_levels = [0.0, 0.1, 0.3, 0.5]
 
+CRN_SEED = 2026         # None = independent random streams per run
+CONTROL_VARIATE = True
+
 def build_circuit():
     qc = QuantumCircuit(1, 1)
     qc.h(0)          # |+>
@@ -26,9 +34,21 @@ def build_circuit():
 def simulate(noise_model=None):
     sim = AerSimulator(noise_model=noise_model)
     qc = build_circuit()
-    return sim.run(qc, shots=shots).result().get_counts()
+    return sim.run(qc, shots=shots, seed_simulator=CRN_SEED).result().get_counts()
+
+def p0_exact_ideal():
+    return float(Statevector.from_instruction(build_circuit().remove_final_measurements(inplace=False)).probabilities()[0])
+
+def p0_corrected(counts, counts_ideal):
+    p0 = counts.get("0", 0) / shots
+    if not CONTROL_VARIATE:
+        return p0
+    return p0 - (counts_ideal.get("0", 0) / shots - p0_exact_ideal())
+
+counts_ideal = simulate()
 
 print("\n=== Phase damping vs Depolarizing (|+>) ===")
+print(f"shots={shots}, CRN_SEED={CRN_SEED}, CONTROL_VARIATE={CONTROL_VARIATE}")
 
 for p in noise_levels:
     print(f"\n--- Noise strength p={p} ---")
@@ -45,6 +65,7 @@ for p in noise_levels:
 
     print("Phase damping counts:", counts_phase)
     print("Phase damping freq:  ", freq_phase)
+    print("Phase damping P(0) (control variate):", round(p0_corrected(counts_phase, counts_ideal), 4))
 
     # Depolarizing
     nm_dep = NoiseModel()
@@ -58,6 +79,7 @@ for p in noise_levels:
 
     print("Depolarizing counts:", counts_dep)
     print("Depolarizing freq:  ", freq_dep)
+    print("Depolarizing P(0) (control variate):", round(p0_corrected(counts_dep, counts_ideal), 4))
 
 print("\nExpected behavior:")
 print("- Phase damping preserves ~50/50 in Z, but destroys phase.")
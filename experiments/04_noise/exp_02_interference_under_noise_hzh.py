@@ -22,6 +22,12 @@ from qiskit_aer.noise import NoiseModel, phase_damping_error, depolarizing_error
 shots = 4096
 noise_levels = [0.0, 0.05, 0.10, 0.20, 0.30, 0.50]
 
+# Common random numbers: every run (all noise levels and all compared variants)
+# uses the same simulator seed, so neighbouring curve points and the compared
+# curves share their shot noise and their differences are resolved with far
+# fewer shots. Set to None for independent random streams per run.
+CRN_SEED = 2026
+
 def circuit_A():
     qc = QuantumCircuit(1, 1)
     qc.h(0)
@@ -60,7 +66,7 @@ def build_noise_model(kind: str, p: float) -> NoiseModel:
 
 def run(qc, nm):
     sim = AerSimulator(noise_model=nm)
-    return sim.run(qc, shots=shots).result().get_counts()
+    return sim.run(qc, shots=shots, seed_simulator=CRN_SEED).result().get_counts()
 
 def prob(counts, bit):
     return counts.get(bit, 0) / shots
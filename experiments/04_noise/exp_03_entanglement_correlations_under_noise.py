@@ -21,6 +21,9 @@ from qiskit_aer.noise import NoiseModel, phase_damping_error, depolarizing_error
 shots = 4096
 noise_levels = [0.0, 0.05, 0.10, 0.20, 0.30, 0.50]
 
+# Common random numbers across noise levels and variants (see Experiment 02); None = independent
+CRN_SEED = 2026
+
 def bell_phi_plus_circuit():
     qc = QuantumCircuit(2, 2)
     qc.h(0)
@@ -51,7 +54,7 @@ def build_noise_model(kind: str, p: float) -> NoiseModel:
 
 def run(qc, nm):
     sim = AerSimulator(noise_model=nm)
-    return sim.run(qc, shots=shots).result().get_counts()
+    return sim.run(qc, shots=shots, seed_simulator=CRN_SEED).result().get_counts()
 
 def corr_rate(counts):
     p00 = counts.get("00", 0) / shots
@@ -19,12 +19,25 @@ from qiskit import QuantumCircuit
 from qiskit_aer import AerSimulator
 from qiskit_aer.noise import NoiseModel, phase_damping_error, depolarizing_error, ReadoutError
 
+from idle_noise import fuse_idle_noise
+
 shots = 4096
 noise_levels = [0.0, 0.05, 0.10, 0.20, 0.30, 0.50]
 
-# Optional: simulate "time passing" by inserting identity gates and applying phase damping to them.
+# Common random numbers across noise levels and variants (see Experiment 02); None = independent
+CRN_SEED = 2026
+
+# Optional: simulate "time passing" after the CX with an explicit idle window.
+# The window lasts TIMESTEPS_AFTER_CX * TIMESTEP_NS and is simulated as ONE
+# composed channel per qubit (see idle_noise.py), equivalent to the former
+# chain of noisy "id" gates but with a cost independent of its length.
 USE_TIMESTEP = True
 TIMESTEPS_AFTER_CX = 3
+TIMESTEP_NS = 50
+
+# Optional T1/T2 relaxation during idle windows (None = off), in ns
+T1_NS = None
+T2_NS = None
 
 def bell_phi_plus(measure_basis: str):
     qc = QuantumCircuit(2, 2)
@@ -32,9 +45,7 @@ def bell_phi_plus(measure_basis: str):
     qc.cx(0, 1)
 
     if USE_TIMESTEP:
-        for _ in range(TIMESTEPS_AFTER_CX):
-            qc.id(0)
-            qc.id(1)
+        qc.delay(TIMESTEPS_AFTER_CX * TIMESTEP_NS, [0, 1], unit="ns")
 
     if measure_basis.upper() == "X":
         qc.h(0)
@@ -51,18 +62,16 @@ def build_noise_model(kind: str, p: float) -> NoiseModel:
 
     if kind == "phase":
         e1 = phase_damping_error(p)
-        # Phase damping on 1-qubit gates + optional timestep ids
-        for g in ["h", "id"]:
-            nm.add_all_qubit_quantum_error(e1, g)
+        # Phase damping on 1-qubit gates; idle windows are handled by fuse_idle_noise
+        nm.add_all_qubit_quantum_error(e1, "h")
 
         # We do NOT attach 1q errors to "cx" (Aer forbids).
-        # The timestep ids after CX model decoherence affecting the entangled state.
+        # The idle window after CX models decoherence affecting the entangled state.
 
     elif kind == "depolarizing":
         e1 = depolarizing_error(p, 1)
         e2 = depolarizing_error(p, 2)
         nm.add_all_qubit_quantum_error(e1, "h")
-        nm.add_all_qubit_quantum_error(e1, "id")
         nm.add_all_qubit_quantum_error(e2, "cx")
 
     else:
@@ -72,7 +81,7 @@ def build_noise_model(kind: str, p: float) -> NoiseModel:
 
 def run(qc, nm):
     sim = AerSimulator(noise_model=nm)
-    return sim.run(qc, shots=shots).result().get_counts()
+    return sim.run(qc, shots=shots, seed_simulator=CRN_SEED).result().get_counts()
 
 def corr_rate(counts):
     p00 = counts.get("00", 0) / shots
@@ -80,7 +89,8 @@ def corr_rate(counts):
     return p00 + p11
 
 print("\n=== Experiment 04 — Bell correlations in Z vs X under noise ===")
-print(f"shots={shots}, USE_TIMESTEP={USE_TIMESTEP}, TIMESTEPS_AFTER_CX={TIMESTEPS_AFTER_CX}")
+print(f"shots={shots}, USE_TIMESTEP={USE_TIMESTEP}, TIMESTEPS_AFTER_CX={TIMESTEPS_AFTER_CX}, "
+      f"TIMESTEP_NS={TIMESTEP_NS}, T1_NS={T1_NS}, T2_NS={T2_NS}")
 print("Correlation metric: P(bit0 == bit1) = P(00) + P(11)")
 
 for p in noise_levels:
@@ -89,8 +99,8 @@ for p in noise_levels:
     for kind in ["phase", "depolarizing"]:
         nm = build_noise_model(kind, p)
 
-        cz = corr_rate(run(bell_phi_plus("Z"), nm))
-        cx = corr_rate(run(bell_phi_plus("X"), nm))
+        cz = corr_rate(run(fuse_idle_noise(bell_phi_plus("Z"), kind, p, TIMESTEP_NS, T1_NS, T2_NS), nm))
+        cx = corr_rate(run(fuse_idle_noise(bell_phi_plus("X"), kind, p, TIMESTEP_NS, T1_NS, T2_NS), nm))
 
         print(f"{kind:12s} | Corr(Z)={cz:0.4f} | Corr(X)={cx:0.4f}")
 
@@ -3,22 +3,42 @@ Experiment 05 — Plot Bell correlations in Z vs X under noise
 
 We reproduce Experiment 04 but save curves as a PNG plot.
 
+Sensitivity report (SENSITIVITY): for every curve, the exact Corr(p) from the
+density matrix and dCorr/dp (central finite differences on the exact
+distributions) at each noise level, plus the p on a fine grid where the curve
+is steepest.
+
 Outputs:
 - experiments/04_noise/results/exp_05_bell_corr_Z_vs_X.png
 """
 
 import random
+import numpy as np
 import matplotlib.pyplot as plt
 
 from qiskit import QuantumCircuit
 from qiskit_aer import AerSimulator
 from qiskit_aer.noise import NoiseModel, phase_damping_error, depolarizing_error
 
+from idle_noise import fuse_idle_noise
+
 shots = 4096
 noise_levels = [0.0, 0.05, 0.10, 0.20, 0.30, 0.50]
 
+# Common random numbers across noise levels and variants (see Experiment 02); None = independent
+CRN_SEED = 2026
+
+# Idle window after CX, simulated as one composed channel (see Experiment 04)
 USE_TIMESTEP = True
 TIMESTEPS_AFTER_CX = 3
+TIMESTEP_NS = 50
+
+T1_NS = None
+T2_NS = None
+
+SENSITIVITY = True
+derivative_step = 1e-4
+sensitivity_grid = np.linspace(0.0, 0.5, 51)
 
 out_path = "experiments/04_noise/results/exp_05_bell_corr_Z_vs_X.png"
 
@@ -28,9 +48,7 @@ def bell_phi_plus(measure_basis: str):
     qc.cx(0, 1)
 
     if USE_TIMESTEP:
-        for _ in range(TIMESTEPS_AFTER_CX):
-            qc.id(0)
-            qc.id(1)
+        qc.delay(TIMESTEPS_AFTER_CX * TIMESTEP_NS, [0, 1], unit="ns")
 
     if measure_basis.upper() == "X":
         qc.h(0)
@@ -47,14 +65,12 @@ def build_noise_model(kind: str, p: float) -> NoiseModel:
 
     if kind == "phase":
         e1 = phase_damping_error(p)
-        for g in ["h", "id"]:
-            nm.add_all_qubit_quantum_error(e1, g)
+        nm.add_all_qubit_quantum_error(e1, "h")
 
     elif kind == "depolarizing":
         e1 = depolarizing_error(p, 1)
         e2 = depolarizing_error(p, 2)
         nm.add_all_qubit_quantum_error(e1, "h")
-        nm.add_all_qubit_quantum_error(e1, "id")
         nm.add_all_qubit_quantum_error(e2, "cx")
 
     else:
@@ -64,30 +80,65 @@ def build_noise_model(kind: str, p: float) -> NoiseModel:
 
 def run_counts(qc, nm):
     sim = AerSimulator(noise_model=nm)
-    return sim.run(qc, shots=shots).result().get_counts()
+    return sim.run(qc, shots=shots, seed_simulator=CRN_SEED).result().get_counts()
 
 def corr_rate(counts):
     return (counts.get("00", 0) + counts.get("11", 0)) / shots
 
+def exact_corr(kind: str, basis: str, p: float) -> float:
+    """Corr(p) from the density matrix (no shot noise)."""
+    qc = fuse_idle_noise(bell_phi_plus(basis), kind, p, TIMESTEP_NS, T1_NS, T2_NS).remove_final_measurements(inplace=False)
+    qc.save_probabilities()
+    sim = AerSimulator(noise_model=build_noise_model(kind, p), method="density_matrix")
+    probs = sim.run(qc).result().data(0)["probabilities"]
+    return float(probs[0] + probs[3])
+
+def corr_derivative(kind: str, basis: str, p: float) -> float:
+    """dCorr/dp; one-sided at p=0 where negative p is not a channel."""
+    h = derivative_step
+    if p - h < 0:
+        f0, f1, f2 = (exact_corr(kind, basis, p + i * h) for i in range(3))
+        return (-3 * f0 + 4 * f1 - f2) / (2 * h)
+    return (exact_corr(kind, basis, p + h) - exact_corr(kind, basis, p - h)) / (2 * h)
+
+def sensitivity_report(kind: str):
+    for basis in ["Z", "X"]:
+        slopes = ", ".join(f"{p:0.2f}: {corr_derivative(kind, basis, p):+0.3f}" for p in noise_levels)
+        print(f"{kind:12s} Corr({basis}) dCorr/dp at {slopes}")
+
+        grid_slopes = np.array([corr_derivative(kind, basis, p) for p in sensitivity_grid])
+        k = int(np.argmax(np.abs(grid_slopes)))
+        if abs(grid_slopes[k]) < 1e-6:
+            print(f"{'':12s} flat: Corr({basis}) does not depend on p")
+            continue
+        print(f"{'':12s} steepest at p={sensitivity_grid[k]:0.2f} (dCorr/dp={grid_slopes[k]:+0.3f}, "
+              f"Corr={exact_corr(kind, basis, sensitivity_grid[k]):0.4f})")
+
 def corr_for(kind: str):
     corrZ = []
     corrX = []
     for p in noise_levels:
         nm = build_noise_model(kind, p)
-        cz = corr_rate(run_counts(bell_phi_plus("Z"), nm))
-        cx = corr_rate(run_counts(bell_phi_plus("X"), nm))
+        cz = corr_rate(run_counts(fuse_idle_noise(bell_phi_plus("Z"), kind, p, TIMESTEP_NS, T1_NS, T2_NS), nm))
+        cx = corr_rate(run_counts(fuse_idle_noise(bell_phi_plus("X"), kind, p, TIMESTEP_NS, T1_NS, T2_NS), nm))
         corrZ.append(cz)
         corrX.append(cx)
         print(f"{kind:12s} p={p:0.2f} -> Corr(Z)={cz:0.4f}, Corr(X)={cx:0.4f}")
     return corrZ, corrX
 
 print("\n=== Experiment 05 — Plot Bell correlations (Z vs X) ===")
-print(f"shots={shots}, USE_TIMESTEP={USE_TIMESTEP}, TIMESTEPS_AFTER_CX={TIMESTEPS_AFTER_CX}")
+print(f"shots={shots}, USE_TIMESTEP={USE_TIMESTEP}, TIMESTEPS_AFTER_CX={TIMESTEPS_AFTER_CX}, "
+      f"TIMESTEP_NS={TIMESTEP_NS}, T1_NS={T1_NS}, T2_NS={T2_NS}")
 print("noise_levels =", noise_levels)
 
 phaseZ, phaseX = corr_for("phase")
 depZ, depX = corr_for("depolarizing")
 
+if SENSITIVITY:
+    print("\n--- Sensitivity (exact Corr, finite differences) ---")
+    sensitivity_report("phase")
+    sensitivity_report("depolarizing")
+
 plt.figure()
 plt.plot(noise_levels, phaseZ, marker="o", label="phase damping: Corr(Z)")
 plt.plot(noise_levels, phaseX, marker="o", label="phase damping: Corr(X)")
@@ -0,0 +1,314 @@
+"""
+Experiment 06 — Pauli-frame sampling for Clifford circuits under Pauli noise
+
+The Bell, GHZ, HZH and linear-oracle Deutsch–Jozsa circuits only use
+Clifford gates (h, s, x, z, cx, cz, id), and the noise we attach to them is a
+Pauli channel:
+- depolarizing(p): X, Y, Z each with prob p/4 (1q), each of the 15 non-identity
+  2q Paulis with prob p/16 (same convention as Aer's depolarizing_error)
+- phase damping(p): a pure Z flip with prob (1 - sqrt(1 - p)) / 2
+- readout bit-flip: a classical X flip before the measurement is recorded
+
+So instead of simulating every shot, we take ONE noiseless reference sample
+and propagate only a random Pauli error frame per shot through the circuit:
+  H:  x <-> z          S:  z ^= x
+  CX: x_t ^= x_c, z_c ^= z_t
+  CZ: z_a ^= x_b, z_b ^= x_a
+The measured bit of a shot is reference_bit XOR frame_x[q].
+Randomizing the Z part of the initial frame (Z stabilizes |0>) reproduces the
+intrinsic randomness of non-deterministic outcomes (e.g. 00/11 for a Bell pair).
+
+Each frame row is a bit-packed NumPy array (1 bit per shot), so every gate is a
+handful of vectorized XORs over shots/8 bytes.
+
+Limitations:
+- Clifford gates only (ccx, ry, rz, initialize are rejected)
+- measurements must be terminal (no gates after a qubit is measured)
+"""
+
+import time
+import numpy as np
+from qiskit import QuantumCircuit
+from qiskit.quantum_info import StabilizerState
+from qiskit_aer import AerSimulator
+from qiskit_aer.noise import NoiseModel, phase_damping_error, depolarizing_error, ReadoutError
+
+seed = 2026
+check_shots = 4096
+bench_shots = 1_000_000
+p_readout = 0.02
+noise_levels = [0.0, 0.05, 0.10, 0.20, 0.30, 0.50]
+
+TIMESTEPS_AFTER_CX = 3
+
+CLIFFORD_1Q = {"h", "s", "sdg", "x", "y", "z", "id"}
+CLIFFORD_2Q = {"cx", "cz"}
+
+PAULI_XZ = {"I": (0, 0), "X": (1, 0), "Y": (1, 1), "Z": (0, 1)}
+
+# ---- Circuits (same as 04_noise/exp_02, exp_04, 06_multipartite, 03_oracles/exp_04) ----
+
+def circuit_hzh():
+    qc = QuantumCircuit(1, 1)
+    qc.h(0)
+    qc.z(0)
+    qc.h(0)
+    qc.measure(0, 0)
+    return qc
+
+def bell_phi_plus(measure_basis: str):
+    qc = QuantumCircuit(2, 2)
+    qc.h(0)
+    qc.cx(0, 1)
+
+    for _ in range(TIMESTEPS_AFTER_CX):
+        qc.id(0)
+        qc.id(1)
+
+    if measure_basis.upper() == "X":
+        qc.h(0)
+        qc.h(1)
+
+    qc.measure(0, 0)
+    qc.measure(1, 1)
+    return qc
+
+def ghz_3():
+    qc = QuantumCircuit(3, 3)
+    qc.h(0)
+    qc.cx(0, 1)
+    qc.cx(1, 2)
+    qc.measure([0, 1, 2], [0, 1, 2])
+    return qc
+
+def deutsch_jozsa_x0_xor_x1():
+    # Linear (Clifford) balanced oracle f(x) = x0 XOR x1
+    qc = QuantumCircuit(3, 2)
+    qc.x(2)
+    qc.h(0); qc.h(1); qc.h(2)
+    qc.cx(0, 2)
+    qc.cx(1, 2)
+    qc.h(0); qc.h(1)
+    qc.measure(0, 0)
+    qc.measure(1, 1)
+    return qc
+
+# ---- Noise ----
+
+def build_noise_model(kind: str, p: float, p_readout: float = 0.0) -> NoiseModel:
+    """Aer noise model used as the reference for the frame sampler."""
+    nm = NoiseModel()
+
+    if p > 0:
+        if kind == "phase":
+            nm.add_all_qubit_quantum_error(phase_damping_error(p), ["h", "s", "x", "z", "id"])
+        elif kind == "depolarizing":
+            nm.add_all_qubit_quantum_error(depolarizing_error(p, 1), ["h", "s", "x", "z", "id"])
+            nm.add_all_qubit_quantum_error(depolarizing_error(p, 2), ["cx", "cz"])
+        else:
+            raise ValueError("Unknown noise kind")
+
+    if p_readout > 0:
+        ro = ReadoutError([[1 - p_readout, p_readout],
+                           [p_readout, 1 - p_readout]])
+        nm.add_all_qubit_readout_error(ro)
+
+    return nm
+
+def build_pauli_noise(kind: str, p: float) -> dict:
+    """
+    Same physics as build_noise_model(), expressed as Pauli channels:
+      gate name -> list of (pauli_label, probability)
+    Labels are one letter per gate qubit, in gate argument order.
+    """
+    noise = {}
+    if p <= 0:
+        return noise
+
+    if kind == "phase":
+        q = (1 - np.sqrt(1 - p)) / 2
+        for g in ["h", "s", "x", "z", "id"]:
+            noise[g] = [("Z", q)]
+
+    elif kind == "depolarizing":
+        one = [(a, p / 4) for a in "XYZ"]
+        two = [(a + b, p / 16) for a in "IXYZ" for b in "IXYZ" if a + b != "II"]
+        for g in ["h", "s", "x", "z", "id"]:
+            noise[g] = one
+        for g in ["cx", "cz"]:
+            noise[g] = two
+
+    else:
+        raise ValueError("Unknown noise kind")
+
+    return noise
+
+# ---- Frame sampler ----
+
+def compile_frame_program(qc: QuantumCircuit):
+    """
+    Translate the circuit once into (gate, qubits) steps plus the terminal
+    measurement map [(qubit, clbit), ...] and one noiseless reference sample.
+    """
+    program = []
+    measured = []
+    done = set()
+
+    for inst in qc.data:
+        name = inst.operation.name
+        qubits = [qc.find_bit(q).index for q in inst.qubits]
+
+        if name == "barrier":
+            continue
+        if name == "measure":
+            measured.append((qubits[0], qc.find_bit(inst.clbits[0]).index))
+            done.add(qubits[0])
+            continue
+        if name not in CLIFFORD_1Q and name not in CLIFFORD_2Q:
+            raise ValueError(f"Gate '{name}' is not supported by the Pauli-frame sampler")
+        if done.intersection(qubits):
+            raise ValueError("Pauli-frame sampler requires terminal measurements")
+
+        program.append((name, qubits))
+
+    unitary_part = qc.remove_final_measurements(inplace=False)
+    ref_bits = StabilizerState(unitary_part).sample_memory(1)[0][::-1]  # index by qubit
+    reference = [int(ref_bits[q]) for q, _ in measured]
+
+    return program, measured, reference
+
+def sample_pauli_masks(rng, channel, shots: int):
+    """Draw one Pauli per shot from a channel; returns packed (x, z) masks per label qubit."""
+    n = len(channel[0][0])
+    xs = [np.zeros(shots, dtype=bool) for _ in range(n)]
+    zs = [np.zeros(shots, dtype=bool) for _ in range(n)]
+
+    u = rng.random(shots)
+    lo = 0.0
+    for label, prob in channel:
+        hit = (u >= lo) & (u < lo + prob)
+        lo += prob
+        for k, letter in enumerate(label):
+            bx, bz = PAULI_XZ[letter]
+            if bx:
+                xs[k] |= hit
+            if bz:
+                zs[k] |= hit
+
+    return ([np.packbits(m) for m in xs], [np.packbits(m) for m in zs])
+
+def apply_gate(frame_x, frame_z, name: str, qubits):
+    if name == "h":
+        q = qubits[0]
+        frame_x[q], frame_z[q] = frame_z[q], frame_x[q]
+    elif name in ("s", "sdg"):
+        q = qubits[0]
+        frame_z[q] ^= frame_x[q]
+    elif name == "cx":
+        c, t = qubits
+        frame_x[t] ^= frame_x[c]
+        frame_z[c] ^= frame_z[t]
+    elif name == "cz":
+        a, b = qubits
+        frame_z[a] ^= frame_x[b]
+        frame_z[b] ^= frame_x[a]
+    # x, y, z, id commute with the frame up to a global phase
+
+def pauli_frame_counts(qc: QuantumCircuit, pauli_noise: dict, shots: int,
+                       p_readout: float = 0.0, rng=None) -> dict:
+    """Sample `shots` noisy outcomes of a Clifford circuit; returns Qiskit-style counts."""
+    rng = np.random.default_rng() if rng is None else rng
+    program, measured, reference = compile_frame_program(qc)
+
+    nbytes = (shots + 7) // 8
+    frame_x = [np.zeros(nbytes, dtype=np.uint8) for _ in range(qc.num_qubits)]
+    frame_z = [np.packbits(rng.random(shots) < 0.5) for _ in range(qc.num_qubits)]
+
+    for name, qubits in program:
+        apply_gate(frame_x, frame_z, name, qubits)
+
+        channel = pauli_noise.get(name)
+        if channel:
+            mx, mz = sample_pauli_masks(rng, channel, shots)
+            for k, q in enumerate(qubits):
+                frame_x[q] ^= mx[k]
+                frame_z[q] ^= mz[k]
+
+    index = np.zeros(shots, dtype=np.int64)
+    for (q, c), ref in zip(measured, reference):
+        bits = frame_x[q].copy()
+        if ref:
+            bits ^= 0xFF
+        if p_readout > 0:
+            bits ^= np.packbits(rng.random(shots) < p_readout)
+        index |= np.unpackbits(bits, count=shots).astype(np.int64) << c
+
+    hist = np.bincount(index, minlength=2 ** qc.num_clbits)
+    return {format(k, f"0{qc.num_clbits}b"): int(v) for k, v in enumerate(hist) if v}
+
+# ---- Metrics ----
+
+def corr_rate(counts, shots):
+    return (counts.get("00", 0) + counts.get("11", 0)) / shots
+
+def ghz_metric(counts, shots):
+    return (counts.get("000", 0) + counts.get("111", 0)) / shots
+
+def run_aer(qc, nm, shots):
+    sim = AerSimulator(noise_model=nm, seed_simulator=seed)
+    return sim.run(qc, shots=shots).result().get_counts()
+
+# ---- Run ----
+
+rng = np.random.default_rng(seed)
+
+print("\n=== Experiment 06 — Pauli-frame sampler vs Aer (Clifford + Pauli noise) ===")
+print(f"seed={seed}, check_shots={check_shots}, p_readout={p_readout}")
+
+for p in noise_levels:
+    print(f"\n--- p={p} ---")
+    for kind in ["phase", "depolarizing"]:
+        nm = build_noise_model(kind, p, p_readout)
+        frame_noise = build_pauli_noise(kind, p)
+
+        cz_aer = corr_rate(run_aer(bell_phi_plus("Z"), nm, check_shots), check_shots)
+        cx_aer = corr_rate(run_aer(bell_phi_plus("X"), nm, check_shots), check_shots)
+        cz_pf = corr_rate(pauli_frame_counts(bell_phi_plus("Z"), frame_noise, check_shots, p_readout, rng), check_shots)
+        cx_pf = corr_rate(pauli_frame_counts(bell_phi_plus("X"), frame_noise, check_shots, p_readout, rng), check_shots)
+
+        print(f"{kind:12s} | Aer Corr(Z)={cz_aer:0.4f} Corr(X)={cx_aer:0.4f} "
+              f"| frame Corr(Z)={cz_pf:0.4f} Corr(X)={cx_pf:0.4f}")
+
+print("\n--- Other Clifford workloads (depolarizing p=0.10) ---")
+nm = build_noise_model("depolarizing", 0.10, p_readout)
+frame_noise = build_pauli_noise("depolarizing", 0.10)
+
+err_aer = run_aer(circuit_hzh(), nm, check_shots).get("0", 0) / check_shots
+err_pf = pauli_frame_counts(circuit_hzh(), frame_noise, check_shots, p_readout, rng).get("0", 0) / check_shots
+print(f"HZH error P(0):        Aer={err_aer:0.4f} | frame={err_pf:0.4f}")
+
+g_aer = ghz_metric(run_aer(ghz_3(), nm, check_shots), check_shots)
+g_pf = ghz_metric(pauli_frame_counts(ghz_3(), frame_noise, check_shots, p_readout, rng), check_shots)
+print(f"GHZ_3 P(000)+P(111):   Aer={g_aer:0.4f} | frame={g_pf:0.4f}")
+
+dj_aer = run_aer(deutsch_jozsa_x0_xor_x1(), nm, check_shots).get("00", 0) / check_shots
+dj_pf = pauli_frame_counts(deutsch_jozsa_x0_xor_x1(), frame_noise, check_shots, p_readout, rng).get("00", 0) / check_shots
+print(f"DJ x0^x1 P(00) (wrong): Aer={dj_aer:0.4f} | frame={dj_pf:0.4f}")
+
+print(f"\n--- Throughput (Bell X basis, depolarizing p=0.10, shots={bench_shots}) ---")
+qc = bell_phi_plus("X")
+
+t0 = time.perf_counter()
+counts = pauli_frame_counts(qc, frame_noise, bench_shots, p_readout, rng)
+t_pf = time.perf_counter() - t0
+
+t0 = time.perf_counter()
+run_aer(qc, nm, bench_shots)
+t_aer = time.perf_counter() - t0
+
+print(f"frame sampler: {t_pf:0.3f} s ({bench_shots / t_pf:,.0f} shots/s) | Corr(X)={corr_rate(counts, bench_shots):0.4f}")
+print(f"Aer:           {t_aer:0.3f} s ({bench_shots / t_aer:,.0f} shots/s)")
+
+print("\nExpected:")
+print("- Frame and Aer metrics agree within shot noise (~0.01 at 4096 shots).")
+print("- The frame sampler reaches millions of shots per second.")
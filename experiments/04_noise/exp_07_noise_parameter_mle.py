@@ -0,0 +1,207 @@
+"""
+Experiment 07 — Maximum-likelihood noise estimation from counts
+
+The sweeps of Experiments 03/04 go p -> counts. Here we go back: given
+observed counts, which depolarizing strength p (and readout flip r) produced
+them? Grid-searching with full simulations costs one sweep per dataset.
+
+Exact model, computed once per circuit:
+- every depolarizing gate channel is affine in p, so the ideal-readout outcome
+  distribution is a polynomial in p of degree <= number of noisy gates
+- its coefficients are fitted exactly from a few density-matrix evaluations
+  (save_probabilities at degree + 3 nodes) and cached
+- readout bit-flips are applied classically, one 2x2 factor per qubit
+
+Estimation (milliseconds per dataset, no simulation):
+- log-likelihood sum_k n_k log P_k(p, r), vectorized over a (p, r) grid for
+  the starting point
+- Fisher scoring from there; the inverse Fisher information gives error bars
+- several circuits can share the parameters: Z-basis Bell counts alone cannot
+  separate gate noise from readout noise, Z + X basis counts can
+"""
+
+import time
+import numpy as np
+from qiskit import QuantumCircuit
+from qiskit_aer import AerSimulator
+from qiskit_aer.noise import NoiseModel, depolarizing_error, ReadoutError
+
+seed = 17
+rng = np.random.default_rng(seed)
+
+shots = 4096
+p_true_list = [0.02, 0.05, 0.10, 0.20]
+r_true = 0.03
+coverage_repeats = 200
+
+p_grid = np.linspace(0.0, 1.0, 401)
+r_grid = np.linspace(0.0, 0.5, 201)
+scoring_steps = 20
+
+NOISY_1Q = ["h"]
+NOISY_2Q = ["cx"]
+
+def bell_z():
+    qc = QuantumCircuit(2)
+    qc.h(0)
+    qc.cx(0, 1)
+    return qc
+
+def bell_x():
+    qc = bell_z()
+    qc.h(0)
+    qc.h(1)
+    return qc
+
+def ghz_3():
+    qc = QuantumCircuit(3)
+    qc.h(0)
+    qc.cx(0, 1)
+    qc.cx(1, 2)
+    return qc
+
+def build_noise_model(p: float, r: float = 0.0) -> NoiseModel:
+    nm = NoiseModel()
+    if p > 0:
+        nm.add_all_qubit_quantum_error(depolarizing_error(p, 1), NOISY_1Q)
+        nm.add_all_qubit_quantum_error(depolarizing_error(p, 2), NOISY_2Q)
+    if r > 0:
+        nm.add_all_qubit_readout_error(ReadoutError([[1 - r, r], [r, 1 - r]]))
+    return nm
+
+# ---- Exact model: cached polynomial in p ----
+
+def exact_probs(qc: QuantumCircuit, p: float) -> np.ndarray:
+    qc = qc.copy()
+    qc.save_probabilities()
+    sim = AerSimulator(noise_model=build_noise_model(p), method="density_matrix")
+    return np.asarray(sim.run(qc).result().data(0)["probabilities"])
+
+def polynomial_model(qc: QuantumCircuit) -> np.ndarray:
+    """Coefficients (degree + 1, 2^n), highest power first, of P(outcome | p)."""
+    degree = sum(1 for inst in qc.data if inst.operation.name in NOISY_1Q + NOISY_2Q)
+    nodes = np.linspace(0.0, 1.0, degree + 3)
+    probs = np.array([exact_probs(qc, p) for p in nodes])
+
+    coeffs = np.polyfit(nodes, probs, degree)
+    residual = np.max(np.abs(np.vander(nodes, degree + 1) @ coeffs - probs))
+    assert residual < 1e-9, f"distribution is not a degree-{degree} polynomial (residual {residual:.1e})"
+    return coeffs
+
+def gate_probs(coeffs: np.ndarray, p: np.ndarray) -> np.ndarray:
+    """(batch,) p -> (batch, 2^n) ideal-readout distributions."""
+    return np.vander(np.atleast_1d(p), len(coeffs)) @ coeffs
+
+def apply_readout(probs: np.ndarray, r: np.ndarray) -> np.ndarray:
+    """Tensored bit flips with probability r[b] on every qubit, batched over rows."""
+    batch, dim = probs.shape
+    n = int(np.log2(dim))
+    t = probs.reshape([batch] + [2] * n)
+    r = np.asarray(r, dtype=float).reshape([batch] + [1] * n)
+    for axis in range(1, n + 1):
+        t = (1 - r) * t + r * np.flip(t, axis=axis)
+    return t.reshape(batch, dim)
+
+def model_probs(coeffs, p, r):
+    p, r = np.broadcast_arrays(np.atleast_1d(p), np.atleast_1d(r))
+    return apply_readout(gate_probs(coeffs, p), r)
+
+# ---- Likelihood and Fisher scoring ----
+
+def log_likelihood(datasets, p, r):
+    """datasets: [(coeffs, count_array)]; p, r broadcast over a batch."""
+    total = 0.0
+    for coeffs, counts in datasets:
+        probs = np.clip(model_probs(coeffs, p, r), 1e-300, None)
+        total = total + np.log(probs) @ counts
+    return total
+
+def probs_and_jacobian(coeffs, theta, fit_readout: bool, h: float = 1e-6):
+    """P(theta) and dP/dtheta (central differences on the exact polynomial model)."""
+    p, r = theta
+    base = model_probs(coeffs, p, r)[0]
+    cols = [(model_probs(coeffs, p + h, r)[0] - model_probs(coeffs, p - h, r)[0]) / (2 * h)]
+    if fit_readout:
+        cols.append((model_probs(coeffs, p, r + h)[0] - model_probs(coeffs, p, r - h)[0]) / (2 * h))
+    return base, np.stack(cols, axis=1)
+
+def fit_mle(datasets, fit_readout: bool, r_known: float = 0.0):
+    """Returns (theta_hat, standard errors, max log-likelihood, seconds)."""
+    t0 = time.perf_counter()
+
+    if fit_readout:
+        P, R = np.meshgrid(p_grid, r_grid, indexing="ij")
+        ll = log_likelihood(datasets, P.ravel(), R.ravel())
+        k = int(np.argmax(ll))
+        theta = np.array([P.ravel()[k], R.ravel()[k]])
+    else:
+        ll = log_likelihood(datasets, p_grid, r_known)
+        theta = np.array([p_grid[int(np.argmax(ll))], r_known])
+
+    free = 2 if fit_readout else 1
+    for _ in range(scoring_steps):
+        score = np.zeros(free)
+        fisher = np.zeros((free, free))
+        for coeffs, counts in datasets:
+            probs, jac = probs_and_jacobian(coeffs, theta, fit_readout)
+            probs = np.clip(probs, 1e-12, None)
+            score += jac.T @ (counts / probs)
+            fisher += counts.sum() * (jac.T / probs) @ jac
+
+        step = np.linalg.solve(fisher, score)
+        theta[:free] = np.clip(theta[:free] + step, [0.0, 0.0][:free], [1.0, 0.5][:free])
+        if np.max(np.abs(step)) < 1e-10:
+            break
+
+    se = np.sqrt(np.diag(np.linalg.inv(fisher)))
+    ll_max = float(log_likelihood(datasets, theta[0], theta[1])[0])
+    return theta, se, ll_max, time.perf_counter() - t0
+
+def counts_to_array(counts, n_bits):
+    arr = np.zeros(2 ** n_bits)
+    for k, v in counts.items():
+        arr[int(k, 2)] = v
+    return arr
+
+def observe(qc: QuantumCircuit, p: float, r: float) -> np.ndarray:
+    """'Experimental' data: sampled counts from Aer with readout noise in the model."""
+    qc = qc.copy()
+    qc.measure_all()
+    sim = AerSimulator(noise_model=build_noise_model(p, r))
+    counts = sim.run(qc, shots=shots, seed_simulator=int(rng.integers(2**31))).result().get_counts()
+    return counts_to_array(counts, qc.num_qubits)
+
+print("\n=== Experiment 07 — Maximum-likelihood noise estimation ===")
+print(f"shots={shots}, r_true={r_true}, seed={seed}")
+
+t0 = time.perf_counter()
+models = {"bell_z": polynomial_model(bell_z()), "bell_x": polynomial_model(bell_x()), "ghz_3": polynomial_model(ghz_3())}
+print(f"cached polynomial models in {(time.perf_counter() - t0) * 1e3:.0f} ms "
+      f"(degrees: {', '.join(f'{k}={len(c) - 1}' for k, c in models.items())})")
+
+print("\n--- p only (readout known = 0), GHZ_3 counts ---")
+for p_true in p_true_list:
+    data = [(models["ghz_3"], observe(ghz_3(), p_true, 0.0))]
+    theta, se, _, secs = fit_mle(data, fit_readout=False)
+    print(f"p_true={p_true:.3f} -> p_hat={theta[0]:.4f} ± {se[0]:.4f}  ({secs * 1e3:.1f} ms)")
+
+print(f"\n--- joint (p, r), Bell Z + X counts, r_true={r_true} ---")
+for p_true in p_true_list:
+    data = [(models["bell_z"], observe(bell_z(), p_true, r_true)),
+            (models["bell_x"], observe(bell_x(), p_true, r_true))]
+    theta, se, _, secs = fit_mle(data, fit_readout=True)
+    print(f"p_true={p_true:.3f} -> p_hat={theta[0]:.4f} ± {se[0]:.4f} | "
+          f"r_hat={theta[1]:.4f} ± {se[1]:.4f}  ({secs * 1e3:.1f} ms)")
+
+print(f"\n--- Error-bar check: {coverage_repeats} datasets at p_true=0.05 (Bell Z + X) ---")
+hits = np.zeros(2)
+for _ in range(coverage_repeats):
+    data = [(models["bell_z"], observe(bell_z(), 0.05, r_true)),
+            (models["bell_x"], observe(bell_x(), 0.05, r_true))]
+    theta, se, _, _ = fit_mle(data, fit_readout=True)
+    hits += np.abs(theta - np.array([0.05, r_true])) <= 1.96 * se
+print(f"95% Fisher intervals cover the truth: p {hits[0] / coverage_repeats:.1%}, r {hits[1] / coverage_repeats:.1%}")
+
+print("\nExpected:")
+print("- estimates agree with the true parameters within the Fisher error bars")
+print("- ~95% coverage of the 95% intervals; each fit takes milliseconds")
@@ -0,0 +1,284 @@
+"""
+Experiment 08 — Per-gate error budget via linear response
+
+When a curve degrades, which gates cost the most: the cx of the Bell pair,
+the h gates, the x/h gates around the Deutsch–Jozsa oracle, or the idle
+window? Re-running with noise on one gate at a time costs one full
+simulation per gate.
+
+Noise model (the one of 04_noise/exp_04 and 03_oracles/exp_06, exp_07a):
+- depolarizing p_1q on x, h, z and p_2q on cx; other gates (the oracle's ccx)
+  are noiseless
+- the idle window after the Bell cx is a delay, fused into one depolarizing
+  channel per qubit of strength 1 - (1 - p_idle)^timesteps (as fuse_idle_noise
+  in exp_04)
+- NOISY_CCX instead decomposes each ccx into h/t/tdg/cx and makes all of
+  those noisy (a hardware-basis model: the constant-oracle DJ loss grows from
+  0.067 to 0.327, and at that size first order overshoots it, 0.429)
+
+Linear response (one pass over the circuit):
+- every noisy gate location g carries its own depolarizing channel of
+  strength p_g
+- to first order, metric(p) = metric(0) + sum_g p_g * dM/dp_g, with
+    dM/dp_g = tr(O_g D_g(rho_g)),  D_g(rho) = mean_P P rho P - rho
+  (P over the Paulis on g's qubits: the derivative of the depolarizing channel)
+- rho_g (state after gate g) comes from one forward statevector pass and O_g
+  (metric observable pulled back to just after gate g) from one backward
+  Heisenberg pass, so all sensitivities cost O(gates) gate applications
+
+Exact ablation (optional, ABLATION): with every gate noisy, how much of the
+metric comes back when gate g's noise is removed; one density-matrix run per
+gate, evaluated in parallel threads. Unlike the linear response it includes
+the interactions with all other channels, and the summed first-order loss is
+compared with the exact all-noisy loss.
+
+Gates are listed in execution order; a delay is one location per qubit, and
+with NOISY_CCX a ccx is one location per elementary gate, the budget then also
+being summed per original instruction.
+"""
+
+import itertools
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from qiskit import QuantumCircuit
+from qiskit.quantum_info import Operator, Pauli, Statevector
+
+p_1q = 0.01
+p_2q = 0.01
+p_idle = 0.01          # per idle timestep
+TIMESTEPS_AFTER_CX = 3
+TIMESTEP_NS = 50
+
+NOISY_1Q = {"x", "h", "z"}
+NOISY_2Q = {"cx"}
+NOISY_CCX = False      # decompose ccx into noisy h/t/tdg/cx instead of a noiseless ccx
+
+ABLATION = True
+max_workers = 4
+
+top_gates = 8          # rows printed per circuit (all rows if None)
+
+# ---- Circuits and metrics ----
+
+def bell_phi_plus(measure_basis: str):
+    qc = QuantumCircuit(2)
+    qc.h(0)
+    qc.cx(0, 1)
+    qc.delay(TIMESTEPS_AFTER_CX * TIMESTEP_NS, [0, 1], unit="ns")
+    if measure_basis.upper() == "X":
+        qc.h(0)
+        qc.h(1)
+    return qc
+
+X = [(0,0), (0,1), (1,0), (1,1)]
+
+def oracle_from_truth_table(table):
+    qc = QuantumCircuit(3)
+    for (x0, x1), fx in zip(X, table):
+        if fx == 0:
+            continue
+
+        if x0 == 0:
+            qc.x(0)
+        if x1 == 0:
+            qc.x(1)
+
+        qc.ccx(0, 1, 2)
+
+        if x1 == 0:
+            qc.x(1)
+        if x0 == 0:
+            qc.x(0)
+    return qc
+
+def deutsch_jozsa(oracle):
+    qc = QuantumCircuit(3)
+    qc.x(2)
+    qc.h(0); qc.h(1); qc.h(2)
+    qc.compose(oracle, inplace=True)
+    qc.h(0); qc.h(1)
+    return qc
+
+def outcome_projector(n: int, measured, good) -> np.ndarray:
+    """Diagonal projector onto the basis states whose measured bits are in `good`."""
+    diag = np.zeros(2 ** n)
+    for i in range(2 ** n):
+        key = "".join(str((i >> q) & 1) for q in reversed(measured))
+        diag[i] = 1.0 if key in good else 0.0
+    return np.diag(diag)
+
+# ---- Gate locations ----
+
+DELAY_UNIT_NS = {"ns": 1.0, "us": 1e3, "ms": 1e6, "s": 1e9}
+
+def fused_idle_p(duration_ns: float) -> float:
+    """One depolarizing channel for the whole window: n steps of p_idle compose to 1 - (1 - p_idle)^n."""
+    return 1 - (1 - p_idle) ** (duration_ns / TIMESTEP_NS)
+
+def noise_strength(name: str, n_qubits: int) -> float:
+    if NOISY_CCX:
+        return p_1q if n_qubits == 1 else p_2q
+    if n_qubits == 1 and name in NOISY_1Q:
+        return p_1q
+    if n_qubits == 2 and name in NOISY_2Q:
+        return p_2q
+    return 0.0
+
+def gate_locations(qc: QuantumCircuit):
+    """
+    Elementary gates in execution order as dicts with the full-register unitary,
+    the qubits, the noise strength and labels (own name, parent instruction).
+    """
+    n = qc.num_qubits
+    locations = []
+    for idx, inst in enumerate(qc.data):
+        op = inst.operation
+        parent = f"{op.name}#{idx}"
+        qubits = [qc.find_bit(q).index for q in inst.qubits]
+
+        if op.name == "delay":
+            if op.unit not in DELAY_UNIT_NS:
+                raise ValueError(f"Unsupported delay unit '{op.unit}'")
+            p = fused_idle_p(op.duration * DELAY_UNIT_NS[op.unit])
+            for q in qubits:
+                locations.append({"label": f"delay[{q}]", "parent": parent, "kind": "idle",
+                                  "qubits": [q], "p": p, "unitary": np.eye(2 ** n)})
+            continue
+
+        sub = QuantumCircuit(n)
+        sub.append(op, qubits)
+        if op.name == "ccx" and NOISY_CCX:
+            sub = sub.decompose()
+
+        for elem in sub.data:
+            qubits = [sub.find_bit(q).index for q in elem.qubits]
+            single = QuantumCircuit(n)
+            single.append(elem.operation, qubits)
+
+            name = elem.operation.name
+            p = noise_strength(name, len(qubits))
+            kind = f"{len(qubits)}q" if p > 0 else "off"
+
+            locations.append({
+                "label": f"{name}{qubits}",
+                "parent": parent,
+                "kind": kind,
+                "qubits": qubits,
+                "p": p,
+                "unitary": Operator(single).data,
+            })
+    return locations
+
+def pauli_twirl_matrices(n: int, qubits):
+    """Full-register matrices of all Paulis on `qubits` (identity included)."""
+    mats = []
+    for chars in itertools.product("IXYZ", repeat=len(qubits)):
+        label = ["I"] * n
+        for q, c in zip(qubits, chars):
+            label[n - 1 - q] = c
+        mats.append(Pauli("".join(label)).to_matrix())
+    return mats
+
+def depolarize(rho: np.ndarray, paulis, p: float) -> np.ndarray:
+    twirled = sum(P @ rho @ P.conj().T for P in paulis) / len(paulis)
+    return (1 - p) * rho + p * twirled
+
+# ---- Linear response: forward states, backward observables ----
+
+def linear_response(n: int, locations, observable: np.ndarray):
+    """dM/dp_g for every location g, at p = 0."""
+    psi = Statevector.from_label("0" * n).data
+    states = []
+    for loc in locations:
+        psi = loc["unitary"] @ psi
+        states.append(psi)
+
+    obs = observable
+    observables = [None] * len(locations)
+    for g in range(len(locations) - 1, -1, -1):
+        observables[g] = obs
+        U = locations[g]["unitary"]
+        obs = U.conj().T @ obs @ U
+
+    sensitivities = []
+    for loc, psi, O in zip(locations, states, observables):
+        paulis = pauli_twirl_matrices(n, loc["qubits"])
+        base = np.vdot(psi, O @ psi).real
+        twirled = np.mean([np.vdot(P @ psi, O @ (P @ psi)).real for P in paulis])
+        sensitivities.append(twirled - base)
+    return np.array(sensitivities)
+
+# ---- Exact density-matrix evaluation ----
+
+def exact_metric(n: int, locations, observable: np.ndarray, noisy) -> float:
+    """Metric with depolarizing noise on the locations whose index is in `noisy`."""
+    rho = np.zeros((2 ** n, 2 ** n), dtype=complex)
+    rho[0, 0] = 1.0
+    for g, loc in enumerate(locations):
+        U = loc["unitary"]
+        rho = U @ rho @ U.conj().T
+        if g in noisy and loc["p"] > 0:
+            rho = depolarize(rho, pauli_twirl_matrices(n, loc["qubits"]), loc["p"])
+    return float(np.trace(observable @ rho).real)
+
+def error_budget(label: str, qc: QuantumCircuit, measured, good):
+    n = qc.num_qubits
+    locations = gate_locations(qc)
+    observable = outcome_projector(n, measured, good)
+
+    ideal = exact_metric(n, locations, observable, noisy=set())
+    noisy = exact_metric(n, locations, observable, noisy=set(range(len(locations))))
+
+    sens = linear_response(n, locations, observable)
+    first_order = np.array([loc["p"] for loc in locations]) * sens
+
+    ablation = None
+    if ABLATION:
+        everything = set(range(len(locations)))
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            ablated = list(pool.map(lambda g: exact_metric(n, locations, observable, noisy=everything - {g}),
+                                    range(len(locations))))
+        ablation = noisy - np.array(ablated)
+
+    print(f"\n--- {label}: {len(locations)} gate locations ---")
+    print(f"metric ideal={ideal:.5f}, all gates noisy={noisy:.5f} (loss {ideal - noisy:.5f}), "
+          f"first-order loss={-first_order.sum():.5f}")
+
+    total = first_order.sum()
+    order = np.argsort(first_order, kind="stable")
+    rows = order if top_gates is None else order[:top_gates]
+    for g in rows:
+        loc = locations[g]
+        share = first_order[g] / total if total != 0 else 0.0
+        line = (f"  {loc['label']:14s} ({loc['parent']:7s}, {loc['kind']:4s}) dM/dp={sens[g]:+8.4f} "
+                f"-> first-order {first_order[g]:+.5f} ({share:5.1%})")
+        if ablation is not None:
+            line += f" | ablation {ablation[g]:+.5f}"
+        print(line)
+
+    per_parent = defaultdict(float)
+    per_kind = defaultdict(float)
+    for loc, d in zip(locations, first_order):
+        per_parent[loc["parent"]] += d
+        per_kind[loc["kind"]] += d
+    print("  by kind: " + ", ".join(f"{k}={v:+.5f}" for k, v in per_kind.items()))
+    if len(per_parent) < len(locations):
+        worst = sorted(per_parent.items(), key=lambda kv: kv[1])[:5]
+        print("  by instruction: " + ", ".join(f"{k}={v:+.5f}" for k, v in worst))
+
+print("\n=== Experiment 08 — Per-gate error budget (linear response) ===")
+print(f"p_1q={p_1q} on {sorted(NOISY_1Q)}, p_2q={p_2q} on {sorted(NOISY_2Q)}, p_idle={p_idle} per timestep, "
+      f"TIMESTEPS_AFTER_CX={TIMESTEPS_AFTER_CX}, NOISY_CCX={NOISY_CCX}, ABLATION={ABLATION}")
+
+error_budget("Bell |Phi+>, Corr(Z)", bell_phi_plus("Z"), [0, 1], {"00", "11"})
+error_budget("Bell |Phi+>, Corr(X)", bell_phi_plus("X"), [0, 1], {"00", "11"})
+error_budget("DJ n=2, constant f=1: P(00)", deutsch_jozsa(oracle_from_truth_table([1, 1, 1, 1])), [0, 1], {"00"})
+error_budget("DJ n=2, balanced f=x0: P(not 00)", deutsch_jozsa(oracle_from_truth_table([0, 0, 1, 1])),
+             [0, 1], {"01", "10", "11"})
+
+print("\nExpected:")
+print("- first-order entries overestimate the exact ablations by 5-10% (interactions with the other channels)")
+print("- the summed first-order loss is within 5% of the all-noisy loss (e.g. 0.0347 vs 0.0340 for Bell Z)")
+print("- the fused idle window carries most of the Bell budget; in DJ the x/h gates carry all of it (the ccx is")
+print("  noiseless here); with NOISY_CCX the ccx decompositions dominate and first order overshoots")
@@ -0,0 +1,65 @@
+"""
+Idle noise — one composed channel per idle window
+
+Circuits mark idle time with qc.delay(duration, qubits, unit=...). Instead of
+a chain of noisy "id" gates (one per timestep), every delay is replaced by ONE
+noise channel for its whole duration, so the simulation cost does not grow
+with the window's length:
+- n timesteps of phase damping(p) or depolarizing(p) compose analytically
+  into a single channel of the same family with strength 1 - (1 - p)^n
+- with t1_ns set, thermal relaxation over the duration is composed on top
+  (t2_ns defaults to t1_ns)
+
+The channel is appended as a Kraus operator rather than as the QuantumError
+itself: Aer re-converts a QuantumError found in a circuit on every run, which
+costs more than the chain of id gates it replaces when a small circuit is run
+many times (05_communication/exp_06 runs one per hop).
+
+Shared by 04_noise (exp_04, exp_05) and 05_communication (exp_02, exp_04,
+exp_05, exp_06); the 05 scripts reach it through their shared_modules helper.
+"""
+
+from qiskit import QuantumCircuit
+from qiskit.quantum_info import Kraus
+from qiskit_aer.noise import phase_damping_error, depolarizing_error, thermal_relaxation_error
+
+DELAY_UNIT_NS = {"ns": 1.0, "us": 1e3, "ms": 1e6, "s": 1e9}
+
+def idle_error(kind: str, p: float, duration_ns: float, timestep_ns: float,
+               t1_ns: float | None = None, t2_ns: float | None = None):
+    """Composed channel for one idle window of duration_ns (None if noiseless)."""
+    err = None
+    steps = duration_ns / timestep_ns
+
+    if p > 0:
+        p_idle = 1 - (1 - p) ** steps
+        if kind == "phase":
+            err = phase_damping_error(p_idle)
+        elif kind == "depolarizing":
+            err = depolarizing_error(p_idle, 1)
+        else:
+            raise ValueError("Unknown noise kind")
+
+    if t1_ns is not None:
+        relax = thermal_relaxation_error(t1_ns, t2_ns if t2_ns is not None else t1_ns, duration_ns)
+        err = relax if err is None else err.compose(relax)
+
+    return err
+
+def fuse_idle_noise(qc: QuantumCircuit, kind: str, p: float, timestep_ns: float,
+                    t1_ns: float | None = None, t2_ns: float | None = None) -> QuantumCircuit:
+    """Replace every delay by one composed noise channel (as Kraus operators) for its whole duration."""
+    out = qc.copy_empty_like()
+    for inst in qc.data:
+        op = inst.operation
+        if op.name != "delay":
+            out.append(inst)
+            continue
+
+        if op.unit not in DELAY_UNIT_NS:
+            raise ValueError(f"Unsupported delay unit '{op.unit}'")
+
+        err = idle_error(kind, p, op.duration * DELAY_UNIT_NS[op.unit], timestep_ns, t1_ns, t2_ns)
+        if err is not None:
+            out.append(Kraus(err.to_quantumchannel()), inst.qubits)
+    return out
@@ -12,16 +12,35 @@ import numpy as np
 from qiskit import QuantumCircuit
 from qiskit_aer import AerSimulator
 from qiskit_aer.noise import NoiseModel, phase_damping_error, depolarizing_error
-from qiskit.quantum_info import Statevector, DensityMatrix, partial_trace, state_fidelity
+from qiskit.quantum_info import Statevector, DensityMatrix, state_fidelity
+
+import shared_modules  # noqa: F401
+from idle_noise import fuse_idle_noise
 
 theta = 0.83
 phi = 1.17
 
 noise_levels = [0.0, 0.05, 0.10, 0.20, 0.30, 0.50]
 
-# optional timestep to model "time passing" after entangling
+# optional idle windows to model "time passing" after entangling.
+# Each window lasts TIMESTEPS * TIMESTEP_NS and is simulated as ONE composed
+# noise channel per qubit (idle_noise.py, 04_noise), so its cost does not grow with
+# TIMESTEPS. T1_NS/T2_NS optionally add thermal relaxation during idling.
 USE_TIMESTEP = True
 TIMESTEPS = 3
+TIMESTEP_NS = 50
+
+T1_NS = None
+T2_NS = None
+
+# Reduced-state extraction: the simulator only returns the density matrix of
+# the kept qubits (4^k entries for k kept qubits), never the full 4^n one.
+# - "density_matrix": exact (the simulator itself still evolves 4^n internally)
+# - "statevector":    trajectory estimator, averages the reduced state over
+#                     TRAJECTORIES noisy runs (2^n memory per trajectory)
+METHOD = "density_matrix"
+TRAJECTORIES = 2000
+KEEP_QUBITS = [2]
 
 def prepare_psi(qc: QuantumCircuit, q: int):
     qc.ry(theta, q)
@@ -38,32 +57,28 @@ def teleportation_circuit():
     qc.cx(1, 2)
 
     if USE_TIMESTEP:
-        for _ in range(TIMESTEPS):
-            qc.id(1)
-            qc.id(2)
+        qc.delay(TIMESTEPS * TIMESTEP_NS, [1, 2], unit="ns")
 
     # Bell measurement part (coherent)
     qc.cx(0, 1)
     qc.h(0)
 
     if USE_TIMESTEP:
-        for _ in range(TIMESTEPS):
-            qc.id(0)
-            qc.id(1)
+        qc.delay(TIMESTEPS * TIMESTEP_NS, [0, 1], unit="ns")
 
     # Coherent corrections
     qc.cx(1, 2)
     qc.cz(0, 2)
 
     if USE_TIMESTEP:
-        for _ in range(TIMESTEPS):
-            qc.id(2)
+        qc.delay(TIMESTEPS * TIMESTEP_NS, 2, unit="ns")
 
     return qc
 
 def reference_state():
-    qc = QuantumCircuit(3)
-    prepare_psi(qc, 2)
+    # |psi> built directly on the kept subsystem (1 qubit), no 3-qubit detour
+    qc = QuantumCircuit(1)
+    prepare_psi(qc, 0)
     return DensityMatrix(Statevector.from_instruction(qc))
 
 def build_noise_model(kind: str, p: float) -> NoiseModel:
@@ -73,14 +88,14 @@ def build_noise_model(kind: str, p: float) -> NoiseModel:
 
     if kind == "phase":
         e1 = phase_damping_error(p)
-        for g in ["h", "id", "ry", "rz", "z"]:
+        for g in ["h", "ry", "rz", "z"]:
             nm.add_all_qubit_quantum_error(e1, g)
-        # no 1q error on "cx" allowed; timesteps handle decoherence after CX
+        # no 1q error on "cx" allowed; idle windows handle decoherence after CX
 
     elif kind == "depolarizing":
         e1 = depolarizing_error(p, 1)
         e2 = depolarizing_error(p, 2)
-        for g in ["h", "id", "ry", "rz", "z"]:
+        for g in ["h", "ry", "rz", "z"]:
             nm.add_all_qubit_quantum_error(e1, g)
         nm.add_all_qubit_quantum_error(e2, "cx")
 
@@ -89,25 +104,30 @@ def build_noise_model(kind: str, p: float) -> NoiseModel:
 
     return nm
 
-def fidelity_for(kind: str, p: float) -> float:
-    qc = teleportation_circuit()
-    sim = AerSimulator(noise_model=build_noise_model(kind, p), method="density_matrix")
-
-    qc.save_density_matrix()
+def reduced_density(qc: QuantumCircuit, nm: NoiseModel, qubits) -> DensityMatrix:
+    """
+    Ask the simulator only for the reduced state on `qubits`.
+    With METHOD="statevector" this is the average over noisy trajectories.
+    """
+    qc = qc.copy()
+    qc.save_density_matrix(qubits=qubits)
 
-    res = sim.run(qc).result()
-    rho = res.data(0)["density_matrix"]  # full 3-qubit density matrix
+    sim = AerSimulator(noise_model=nm, method=METHOD)
+    shots = TRAJECTORIES if METHOD == "statevector" else 1
 
-    # keep only target qubit 2
-    red = partial_trace(DensityMatrix(rho), [0, 1])
+    res = sim.run(qc, shots=shots).result()
+    return DensityMatrix(res.data(0)["density_matrix"])
 
-    red_ref = partial_trace(reference_state(), [0, 1])
-
-    return float(np.real(state_fidelity(red, red_ref)))
+def fidelity_for(kind: str, p: float) -> float:
+    qc = fuse_idle_noise(teleportation_circuit(), kind, p, TIMESTEP_NS, T1_NS, T2_NS)
+    red = reduced_density(qc, build_noise_model(kind, p), KEEP_QUBITS)
+    return float(np.real(state_fidelity(red, reference_state())))
 
 print("\n=== Experiment 02 — Teleportation under noise ===")
 print("theta =", theta, "phi =", phi)
-print(f"USE_TIMESTEP={USE_TIMESTEP}, TIMESTEPS={TIMESTEPS}")
+print(f"USE_TIMESTEP={USE_TIMESTEP}, TIMESTEPS={TIMESTEPS}, TIMESTEP_NS={TIMESTEP_NS}, "
+      f"T1_NS={T1_NS}, T2_NS={T2_NS}")
+print(f"METHOD={METHOD}, KEEP_QUBITS={KEEP_QUBITS}")
 print("noise_levels =", noise_levels)
 
 for p in noise_levels:
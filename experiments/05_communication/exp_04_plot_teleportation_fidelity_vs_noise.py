@@ -5,6 +5,9 @@ We reproduce Experiment 02 and save a PNG plot:
 - phase damping fidelity vs p
 - depolarizing fidelity vs p
 
+The (kind, p) points are streamed (07_agentic/sweep_stream.py): evaluated in
+parallel threads and printed as each one finishes.
+
 Output:
 experiments/05_communication/results/exp_04_teleport_fidelity_vs_noise.png
 """
@@ -15,15 +18,32 @@ import matplotlib.pyplot as plt
 from qiskit import QuantumCircuit
 from qiskit_aer import AerSimulator
 from qiskit_aer.noise import NoiseModel, phase_damping_error, depolarizing_error
-from qiskit.quantum_info import Statevector, DensityMatrix, partial_trace, state_fidelity
+from qiskit.quantum_info import Statevector, DensityMatrix, state_fidelity
+
+import shared_modules  # noqa: F401
+from idle_noise import fuse_idle_noise
+from sweep_stream import stream_sweep
 
 theta = 0.83
 phi = 1.17
 
 noise_levels = [0.0, 0.05, 0.10, 0.20, 0.30, 0.50]
 
+# Idle windows, each simulated as one composed channel (see Experiment 02)
 USE_TIMESTEP = True
 TIMESTEPS = 3
+TIMESTEP_NS = 50
+
+T1_NS = None
+T2_NS = None
+
+# Reduced-state extraction (see Experiment 02):
+# "density_matrix" = exact, "statevector" = trajectory-averaged estimator
+METHOD = "density_matrix"
+TRAJECTORIES = 2000
+KEEP_QUBITS = [2]
+
+max_workers = 4
 
 out_path = "experiments/05_communication/results/exp_04_teleport_fidelity_vs_noise.png"
 
@@ -40,30 +60,26 @@ def teleportation_circuit():
     qc.cx(1, 2)
 
     if USE_TIMESTEP:
-        for _ in range(TIMESTEPS):
-            qc.id(1)
-            qc.id(2)
+        qc.delay(TIMESTEPS * TIMESTEP_NS, [1, 2], unit="ns")
 
     qc.cx(0, 1)
     qc.h(0)
 
     if USE_TIMESTEP:
-        for _ in range(TIMESTEPS):
-            qc.id(0)
-            qc.id(1)
+        qc.delay(TIMESTEPS * TIMESTEP_NS, [0, 1], unit="ns")
 
     qc.cx(1, 2)
     qc.cz(0, 2)
 
     if USE_TIMESTEP:
-        for _ in range(TIMESTEPS):
-            qc.id(2)
+        qc.delay(TIMESTEPS * TIMESTEP_NS, 2, unit="ns")
 
     return qc
 
 def reference_state():
-    qc = QuantumCircuit(3)
-    prepare_psi(qc, 2)
+    # |psi> built directly on the kept subsystem (1 qubit), no 3-qubit detour
+    qc = QuantumCircuit(1)
+    prepare_psi(qc, 0)
     return DensityMatrix(Statevector.from_instruction(qc))
 
 def build_noise_model(kind: str, p: float) -> NoiseModel:
@@ -73,13 +89,13 @@ def build_noise_model(kind: str, p: float) -> NoiseModel:
 
     if kind == "phase":
         e1 = phase_damping_error(p)
-        for g in ["h", "id", "ry", "rz", "z"]:
+        for g in ["h", "ry", "rz", "z"]:
             nm.add_all_qubit_quantum_error(e1, g)
 
     elif kind == "depolarizing":
         e1 = depolarizing_error(p, 1)
         e2 = depolarizing_error(p, 2)
-        for g in ["h", "id", "ry", "rz", "z"]:
+        for g in ["h", "ry", "rz", "z"]:
             nm.add_all_qubit_quantum_error(e1, g)
         nm.add_all_qubit_quantum_error(e2, "cx")
 
@@ -88,37 +104,38 @@ def build_noise_model(kind: str, p: float) -> NoiseModel:
 
     return nm
 
-def fidelity_for(kind: str, p: float) -> float:
-    qc = teleportation_circuit()
-    qc.save_density_matrix()
-
-    sim = AerSimulator(
-        noise_model=build_noise_model(kind, p),
-        method="density_matrix"
-    )
+def reduced_density(qc: QuantumCircuit, nm: NoiseModel, qubits) -> DensityMatrix:
+    qc = qc.copy()
+    qc.save_density_matrix(qubits=qubits)
 
-    res = sim.run(qc).result()
-    rho = res.data(0)["density_matrix"]
+    sim = AerSimulator(noise_model=nm, method=METHOD)
+    shots = TRAJECTORIES if METHOD == "statevector" else 1
 
-    red = partial_trace(DensityMatrix(rho), [0, 1])
-    red_ref = partial_trace(reference_state(), [0, 1])
+    res = sim.run(qc, shots=shots).result()
+    return DensityMatrix(res.data(0)["density_matrix"])
 
-    return float(np.real(state_fidelity(red, red_ref)))
+def fidelity_for(kind: str, p: float) -> float:
+    qc = fuse_idle_noise(teleportation_circuit(), kind, p, TIMESTEP_NS, T1_NS, T2_NS)
+    red = reduced_density(qc, build_noise_model(kind, p), KEEP_QUBITS)
+    return float(np.real(state_fidelity(red, reference_state())))
 
 print("\n=== Experiment 04 — Plot teleportation fidelity vs noise ===")
 print("theta =", theta, "phi =", phi)
-print(f"USE_TIMESTEP={USE_TIMESTEP}, TIMESTEPS={TIMESTEPS}")
+print(f"USE_TIMESTEP={USE_TIMESTEP}, TIMESTEPS={TIMESTEPS}, TIMESTEP_NS={TIMESTEP_NS}, "
+      f"T1_NS={T1_NS}, T2_NS={T2_NS}")
+print(f"METHOD={METHOD}, KEEP_QUBITS={KEEP_QUBITS}")
 print("noise_levels =", noise_levels)
 
-phase_f = []
-dep_f = []
+fidelities = {"phase": [None] * len(noise_levels), "depolarizing": [None] * len(noise_levels)}
+points = [(kind, i) for kind in fidelities for i in range(len(noise_levels))]
+
+for _, (kind, i), f in stream_sweep(lambda pt: fidelity_for(pt[0], noise_levels[pt[1]]), points,
+                                    max_workers=max_workers):
+    fidelities[kind][i] = f
+    print(f"p={noise_levels[i]:0.2f} | {kind}={f:0.4f}")
 
-for p in noise_levels:
-    fp = fidelity_for("phase", p)
-    fd = fidelity_for("depolarizing", p)
-    phase_f.append(fp)
-    dep_f.append(fd)
-    print(f"p={p:0.2f} | phase={fp:0.4f} | depolarizing={fd:0.4f}")
+phase_f = fidelities["phase"]
+dep_f = fidelities["depolarizing"]
 
 plt.figure()
 plt.plot(noise_levels, phase_f, marker="o", label="phase damping fidelity")
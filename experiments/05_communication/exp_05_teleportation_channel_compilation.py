@@ -0,0 +1,196 @@
+"""
+Experiment 05 — Teleportation as a compiled single-qubit channel
+
+Experiments 02/04 teleport a single input state (theta=0.83, phi=1.17), so
+checking another input means another full noisy simulation.
+
+Teleportation is a linear map E: rho_in (q0) -> rho_out (q2). We compile it
+ONCE per noise point with the Choi–Jamiolkowski trick:
+- a noiseless reference qubit r (q3) is maximally entangled with q0
+- the noisy teleportation circuit runs on q0, q1, q2
+- the saved reduced state on (r, q2) is Choi(E) / 2
+
+From the Choi matrix we get the Pauli transfer matrix R (4x4, real), and then:
+- process fidelity and average gate fidelity vs the identity channel
+- fidelity for ANY batch of pure inputs with Bloch vectors r:
+    r_out = t + T r       (t = R[1:, 0], T = R[1:, 1:])
+    F     = (1 + r . r_out) / 2
+  which is one matrix product for the whole batch.
+
+One simulation per (kind, p) replaces one simulation per (kind, p, state).
+
+Note: the compiled channel is the teleportation protocol itself; the input
+state is injected noiselessly (set_statevector), unlike Experiment 02 where
+the ry/rz preparation gates also receive noise.
+"""
+
+import time
+import numpy as np
+from qiskit import QuantumCircuit
+from qiskit_aer import AerSimulator
+from qiskit_aer.noise import NoiseModel, phase_damping_error, depolarizing_error
+from qiskit.quantum_info import Statevector, DensityMatrix, Choi, PTM, state_fidelity
+from qiskit.quantum_info import process_fidelity, average_gate_fidelity
+
+import shared_modules  # noqa: F401
+from idle_noise import fuse_idle_noise
+
+theta = 0.83
+phi = 1.17
+
+seed = 5
+batch_size = 100_000      # random input states evaluated from the compiled channel
+check_states = 5          # states re-simulated directly to validate the channel
+
+noise_levels = [0.0, 0.05, 0.10, 0.20, 0.30, 0.50]
+
+# optional idle windows, as in Experiment 02: each lasts TIMESTEPS * TIMESTEP_NS
+# and is fused into ONE noise channel per qubit (idle_noise.py, 04_noise).
+USE_TIMESTEP = True
+TIMESTEPS = 3
+TIMESTEP_NS = 50
+
+T1_NS = None
+T2_NS = None
+
+def teleportation_body(qc: QuantumCircuit):
+    """Teleportation q0 -> q2 (coherent corrections), without preparing |psi>."""
+    qc.h(1)
+    qc.cx(1, 2)
+
+    if USE_TIMESTEP:
+        qc.delay(TIMESTEPS * TIMESTEP_NS, [1, 2], unit="ns")
+
+    qc.cx(0, 1)
+    qc.h(0)
+
+    if USE_TIMESTEP:
+        qc.delay(TIMESTEPS * TIMESTEP_NS, [0, 1], unit="ns")
+
+    qc.cx(1, 2)
+    qc.cz(0, 2)
+
+    if USE_TIMESTEP:
+        qc.delay(TIMESTEPS * TIMESTEP_NS, 2, unit="ns")
+
+def build_noise_model(kind: str, p: float) -> NoiseModel:
+    nm = NoiseModel()
+    if p <= 0:
+        return nm
+
+    if kind == "phase":
+        e1 = phase_damping_error(p)
+        for g in ["h", "ry", "rz", "z"]:
+            nm.add_all_qubit_quantum_error(e1, g)
+
+    elif kind == "depolarizing":
+        e1 = depolarizing_error(p, 1)
+        e2 = depolarizing_error(p, 2)
+        for g in ["h", "ry", "rz", "z"]:
+            nm.add_all_qubit_quantum_error(e1, g)
+        nm.add_all_qubit_quantum_error(e2, "cx")
+
+    else:
+        raise ValueError("Unknown noise kind")
+
+    return nm
+
+def compile_channel(kind: str, p: float) -> Choi:
+    """One density-matrix simulation -> Choi matrix of the teleportation channel."""
+    qc = QuantumCircuit(4)
+
+    # (|0>_q0 |0>_r + |1>_q0 |1>_r) / sqrt(2), with q1 = q2 = |0>
+    init = np.zeros(16, dtype=complex)
+    init[0] = init[0b1001] = 1 / np.sqrt(2)
+    qc.set_statevector(Statevector(init))
+
+    teleportation_body(qc)
+
+    # reference qubit first (input side of the Choi matrix), then the output qubit
+    qc.save_density_matrix(qubits=[3, 2])
+
+    qc = fuse_idle_noise(qc, kind, p, TIMESTEP_NS, T1_NS, T2_NS)
+    sim = AerSimulator(noise_model=build_noise_model(kind, p), method="density_matrix")
+    rho = sim.run(qc).result().data(0)["density_matrix"]
+    return Choi(2 * np.asarray(rho))
+
+def bloch_vectors(thetas, phis):
+    # |psi> = RZ(phi) RY(theta) |0>
+    return np.stack([np.sin(thetas) * np.cos(phis),
+                     np.sin(thetas) * np.sin(phis),
+                     np.cos(thetas)], axis=1)
+
+def batch_fidelities(ptm: PTM, r):
+    """Fidelity <psi| E(|psi><psi|) |psi> for every Bloch vector row of r."""
+    R = np.real(ptm.data)
+    t = R[1:, 0]
+    T = R[1:, 1:]
+    r_out = t + r @ T.T
+    return 0.5 * (1 + np.sum(r * r_out, axis=1))
+
+def direct_fidelity(kind: str, p: float, th: float, ph: float) -> float:
+    """Reference: full teleportation simulation for one input state."""
+    psi = QuantumCircuit(1)
+    psi.ry(th, 0)
+    psi.rz(ph, 0)
+    psi_sv = Statevector.from_instruction(psi)
+
+    qc = QuantumCircuit(3)
+    qc.set_statevector(Statevector.from_label("00").tensor(psi_sv))
+    teleportation_body(qc)
+    qc.save_density_matrix(qubits=[2])
+
+    qc = fuse_idle_noise(qc, kind, p, TIMESTEP_NS, T1_NS, T2_NS)
+    sim = AerSimulator(noise_model=build_noise_model(kind, p), method="density_matrix")
+    red = DensityMatrix(sim.run(qc).result().data(0)["density_matrix"])
+    return float(np.real(state_fidelity(red, psi_sv)))
+
+rng = np.random.default_rng(seed)
+
+# Haar-random pure inputs: uniform on the Bloch sphere
+batch_thetas = np.arccos(1 - 2 * rng.random(batch_size))
+batch_phis = 2 * np.pi * rng.random(batch_size)
+batch_r = bloch_vectors(batch_thetas, batch_phis)
+
+check_thetas = batch_thetas[:check_states]
+check_phis = batch_phis[:check_states]
+
+print("\n=== Experiment 05 — Teleportation channel compilation ===")
+print(f"USE_TIMESTEP={USE_TIMESTEP}, TIMESTEPS={TIMESTEPS}, batch_size={batch_size}, seed={seed}")
+print("noise_levels =", noise_levels)
+
+for kind in ["phase", "depolarizing"]:
+    print(f"\n### Noise kind: {kind} ###")
+
+    for p in noise_levels:
+        t0 = time.perf_counter()
+        choi = compile_channel(kind, p)
+        t_compile = time.perf_counter() - t0
+
+        ptm = PTM(choi)
+        f_pro = process_fidelity(choi)
+        f_avg = average_gate_fidelity(choi)
+
+        t0 = time.perf_counter()
+        f_batch = batch_fidelities(ptm, batch_r)
+        t_batch = time.perf_counter() - t0
+
+        f_psi = batch_fidelities(ptm, bloch_vectors(np.array([theta]), np.array([phi])))[0]
+
+        # validate against direct re-simulation on a few inputs
+        f_pred = batch_fidelities(ptm, bloch_vectors(check_thetas, check_phis))
+        f_sim = [direct_fidelity(kind, p, th, ph) for th, ph in zip(check_thetas, check_phis)]
+        max_err = float(np.max(np.abs(f_pred - np.array(f_sim))))
+
+        print(f"\n--- p={p} ---")
+        print(f"process fidelity={f_pro:0.4f} | average gate fidelity={f_avg:0.4f}")
+        print(f"batch of {batch_size}: mean F={f_batch.mean():0.4f}, min F={f_batch.min():0.4f}, "
+              f"max F={f_batch.max():0.4f}")
+        print(f"F(theta={theta}, phi={phi})={f_psi:0.4f}")
+        print(f"compile={t_compile * 1e3:0.1f} ms | batch eval={t_batch * 1e3:0.1f} ms "
+              f"| max |F_channel - F_direct| on {check_states} states = {max_err:0.2e}")
+
+print("\nExpected:")
+print("- p=0 => process fidelity = average gate fidelity = 1.0")
+print("- mean F over random inputs ~= average gate fidelity")
+print("- channel predictions match direct simulation to numerical precision")
@@ -0,0 +1,178 @@
+"""
+Experiment 06 — Multi-hop teleportation (repeater chain)
+
+We teleport |psi> along a chain of h hops. Simulated naively, the chain needs
+2h+1 qubits (one input + one Bell pair per hop), i.e. a 4^(2h+1) density matrix.
+
+Instead we process hops sequentially. Each hop is the 3-qubit teleportation of
+Experiment 02 (same build_noise_model(kind, p), same timestep idle noise):
+- q0 = in-flight state, injected with set_density_matrix
+- q1, q2 = fresh Bell pair for this hop
+After the hop we keep only:
+- the reduced state of q2 (2x2), which becomes the next hop's input
+- the classical record: P(m0 m1) of the Bell measurement on (q0, q1)
+
+Memory is constant per hop and total time grows linearly with h, so 100-hop
+chains are cheap. For small h we validate against the full 2h+1 qubit circuit.
+"""
+
+import time
+import numpy as np
+from qiskit import QuantumCircuit
+from qiskit_aer import AerSimulator
+from qiskit_aer.noise import NoiseModel, phase_damping_error, depolarizing_error
+from qiskit.quantum_info import Statevector, DensityMatrix, state_fidelity
+
+import shared_modules  # noqa: F401
+from idle_noise import fuse_idle_noise
+
+theta = 0.83
+phi = 1.17
+
+max_hops = 100
+report_hops = [1, 2, 5, 10, 20, 50, 100]
+noise_levels = [0.001, 0.005, 0.01, 0.02]
+validate_hops = 2
+
+# optional idle windows, as in Experiment 02: each lasts TIMESTEPS * TIMESTEP_NS
+# and is fused into ONE noise channel per qubit (idle_noise.py, 04_noise).
+USE_TIMESTEP = True
+TIMESTEPS = 3
+TIMESTEP_NS = 50
+
+T1_NS = None
+T2_NS = None
+
+def prepare_psi(qc: QuantumCircuit, q: int):
+    qc.ry(theta, q)
+    qc.rz(phi, q)
+
+def reference_state():
+    qc = QuantumCircuit(1)
+    prepare_psi(qc, 0)
+    return DensityMatrix(Statevector.from_instruction(qc))
+
+def teleport_hop(qc: QuantumCircuit, src: int, mid: int, dst: int):
+    """Experiment 02's teleportation body on qubits (src, mid, dst)."""
+    qc.h(mid)
+    qc.cx(mid, dst)
+
+    if USE_TIMESTEP:
+        qc.delay(TIMESTEPS * TIMESTEP_NS, [mid, dst], unit="ns")
+
+    qc.cx(src, mid)
+    qc.h(src)
+
+    if USE_TIMESTEP:
+        qc.delay(TIMESTEPS * TIMESTEP_NS, [src, mid], unit="ns")
+
+    qc.cx(mid, dst)
+    qc.cz(src, dst)
+
+    if USE_TIMESTEP:
+        qc.delay(TIMESTEPS * TIMESTEP_NS, dst, unit="ns")
+
+def build_noise_model(kind: str, p: float) -> NoiseModel:
+    nm = NoiseModel()
+    if p <= 0:
+        return nm
+
+    if kind == "phase":
+        e1 = phase_damping_error(p)
+        for g in ["h", "ry", "rz", "z"]:
+            nm.add_all_qubit_quantum_error(e1, g)
+
+    elif kind == "depolarizing":
+        e1 = depolarizing_error(p, 1)
+        e2 = depolarizing_error(p, 2)
+        for g in ["h", "ry", "rz", "z"]:
+            nm.add_all_qubit_quantum_error(e1, g)
+        nm.add_all_qubit_quantum_error(e2, "cx")
+
+    else:
+        raise ValueError("Unknown noise kind")
+
+    return nm
+
+def hop_circuit(kind: str, p: float) -> QuantumCircuit:
+    """One hop's body on (q0, q1, q2) with its idle windows fused; built once per chain."""
+    qc = QuantumCircuit(3)
+    teleport_hop(qc, 0, 1, 2)
+    return fuse_idle_noise(qc, kind, p, TIMESTEP_NS, T1_NS, T2_NS)
+
+def run_hop(sim: AerSimulator, hop: QuantumCircuit, rho_in: DensityMatrix):
+    """
+    One hop on 3 qubits. Returns (rho_out on the destination qubit,
+    Bell-measurement outcome probabilities [P(00), P(01), P(10), P(11)]).
+    The coherent corrections leave q0, q1 in their measured Z values, so their
+    probabilities are exactly the classical record of a measured hop.
+    """
+    qc = QuantumCircuit(3)
+    qc.set_density_matrix(DensityMatrix.from_label("00").tensor(rho_in))
+    qc.compose(hop, inplace=True)
+    qc.save_density_matrix(qubits=[2], label="rho")
+    qc.save_probabilities(qubits=[0, 1], label="record")
+
+    data = sim.run(qc).result().data(0)
+    return DensityMatrix(data["rho"]), np.asarray(data["record"])
+
+def run_chain(kind: str, p: float, hops: int):
+    """Sequential chain: returns per-hop fidelities and the classical record."""
+    sim = AerSimulator(noise_model=build_noise_model(kind, p), method="density_matrix")
+    hop = hop_circuit(kind, p)
+    ref = reference_state()
+
+    rho = ref
+    fidelities = []
+    record = []
+
+    for _ in range(hops):
+        rho, probs = run_hop(sim, hop, rho)
+        fidelities.append(float(np.real(state_fidelity(rho, ref))))
+        record.append(probs)
+
+    return fidelities, np.array(record)
+
+def full_chain_fidelity(kind: str, p: float, hops: int) -> float:
+    """Naive reference: one circuit with 2*hops + 1 qubits."""
+    n = 2 * hops + 1
+    qc = QuantumCircuit(n)
+    qc.set_density_matrix(DensityMatrix.from_label("0" * (n - 1)).tensor(reference_state()))
+
+    for k in range(hops):
+        teleport_hop(qc, 2 * k, 2 * k + 1, 2 * k + 2)
+
+    qc.save_density_matrix(qubits=[n - 1])
+
+    qc = fuse_idle_noise(qc, kind, p, TIMESTEP_NS, T1_NS, T2_NS)
+    sim = AerSimulator(noise_model=build_noise_model(kind, p), method="density_matrix")
+    rho = DensityMatrix(sim.run(qc).result().data(0)["density_matrix"])
+    return float(np.real(state_fidelity(rho, reference_state())))
+
+print("\n=== Experiment 06 — Repeater chain (sequential hops) ===")
+print("theta =", theta, "phi =", phi)
+print(f"USE_TIMESTEP={USE_TIMESTEP}, TIMESTEPS={TIMESTEPS}, max_hops={max_hops}")
+print("noise_levels =", noise_levels)
+
+print(f"\n--- Validation vs full {2 * validate_hops + 1}-qubit circuit (h={validate_hops}) ---")
+for kind in ["phase", "depolarizing"]:
+    f_seq = run_chain(kind, 0.05, validate_hops)[0][-1]
+    f_full = full_chain_fidelity(kind, 0.05, validate_hops)
+    print(f"{kind:12s} p=0.05 | sequential F={f_seq:0.6f} | full F={f_full:0.6f}")
+
+for kind in ["phase", "depolarizing"]:
+    print(f"\n### Noise kind: {kind} ###")
+    for p in noise_levels:
+        t0 = time.perf_counter()
+        fidelities, record = run_chain(kind, p, max_hops)
+        elapsed = time.perf_counter() - t0
+
+        curve = " | ".join(f"h={h}: {fidelities[h - 1]:0.4f}" for h in report_hops if h <= max_hops)
+        print(f"\n--- p={p} --- ({elapsed:0.2f} s, {elapsed / max_hops * 1e3:0.1f} ms/hop)")
+        print("F:", curve)
+        print("mean Bell-outcome record P(00,01,10,11):", np.round(record.mean(axis=0), 4))
+
+print("\nExpected:")
+print("- sequential and full-circuit fidelities agree exactly")
+print("- fidelity decays with hop count: towards 0.5 (depolarizing) or the dephased limit (phase)")
+print("- time per hop is constant, so cost grows linearly with h")
@@ -0,0 +1,28 @@
+"""
+Shared modules — make the modules other chapters share importable here
+
+The experiments are run as files (python experiments/<chapter>/exp_xx.py), so
+only the script's own directory is on sys.path. Import this module before the
+shared ones:
+
+    import shared_modules  # noqa: F401
+    from agent_runtime import AgentRuntime
+
+SHARED_CHAPTERS lists every chapter directory whose modules are shared
+(07_agentic: agent runtime, work queue, shared results, sweep stream;
+04_noise: idle noise). The list is the same for every chapter, so this file
+is chapter-agnostic: it sits unchanged next to the scripts that need it
+(it cannot live in experiments/, which is not on sys.path either). Edit one
+copy and copy it over the others.
+"""
+
+import os
+import sys
+
+EXPERIMENTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SHARED_CHAPTERS = ["07_agentic", "04_noise"]
+
+for chapter in SHARED_CHAPTERS:
+    path = os.path.join(EXPERIMENTS_DIR, chapter)
+    if path not in sys.path:
+        sys.path.append(path)
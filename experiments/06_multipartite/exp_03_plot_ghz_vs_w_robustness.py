@@ -5,6 +5,9 @@ Metrics:
 - GHZ metric = P(000) + P(111)
 - W metric   = P(001) + P(010) + P(100)
 
+The noise levels are streamed (07_agentic/sweep_stream.py): evaluated in
+parallel threads and printed as each one finishes.
+
 We generate a PNG plot:
 experiments/06_multipartite/results/exp_03_ghz_vs_w_robustness.png
 """
@@ -16,9 +19,17 @@ from qiskit import QuantumCircuit
 from qiskit_aer import AerSimulator
 from qiskit_aer.noise import NoiseModel, depolarizing_error
 
+import shared_modules  # noqa: F401
+from sweep_stream import stream_sweep
+
 shots = 4096
 noise_levels = [0.0, 0.05, 0.10, 0.20, 0.30, 0.50]
 
+# Common random numbers across noise levels and variants (see Experiment 02); None = independent
+CRN_SEED = 2026
+
+max_workers = 4
+
 out_path = "experiments/06_multipartite/results/exp_03_ghz_vs_w_robustness.png"
 
 def ghz_3():
@@ -74,20 +85,20 @@ print("\n=== Experiment 03 — Plot GHZ vs W robustness (n=3) ===")
 print("shots =", shots)
 print("noise_levels =", noise_levels)
 
-ghz_vals = []
-w_vals = []
-
-for p in noise_levels:
+def metrics_at(p):
     sim = AerSimulator(noise_model=build_noise_model(p))
 
-    c_ghz = sim.run(ghz_3(), shots=shots).result().get_counts()
-    c_w   = sim.run(w_3_initialize(), shots=shots).result().get_counts()
+    c_ghz = sim.run(ghz_3(), shots=shots, seed_simulator=CRN_SEED).result().get_counts()
+    c_w   = sim.run(w_3_initialize(), shots=shots, seed_simulator=CRN_SEED).result().get_counts()
+
+    return metric_ghz(c_ghz), metric_w(c_w)
 
-    m_ghz = metric_ghz(c_ghz)
-    m_w   = metric_w(c_w)
+ghz_vals = [None] * len(noise_levels)
+w_vals = [None] * len(noise_levels)
 
-    ghz_vals.append(m_ghz)
-    w_vals.append(m_w)
+for i, p, (m_ghz, m_w) in stream_sweep(metrics_at, noise_levels, max_workers=max_workers):
+    ghz_vals[i] = m_ghz
+    w_vals[i] = m_w
 
     print(f"p={p:0.2f} | GHZ_metric={m_ghz:0.4f} | W_metric={m_w:0.4f}")
 
@@ -0,0 +1,102 @@
+"""
+Experiment 04 — Parallel noisy GHZ_n density matrices (shared-memory results)
+
+Sweep: full density matrix of GHZ_n under depolarizing noise, for several n
+and noise levels, evaluated in a process pool. At n=10 one density matrix is
+16 MB (2^n x 2^n complex128), so returning it from a worker by pickling
+costs about as much as a small simulation.
+
+The results are written in place into one shared block instead
+(07_agentic/shared_results.py): each worker attaches to it and stores its
+matrix in its own slot, and the parent reads NumPy views of the slots. Only
+indices travel through the pool. With RESULTS_PATH set, the block is a
+memory-mapped .npy file instead of shared memory.
+
+Per matrix:
+- GHZ fidelity  <GHZ| rho |GHZ> = (rho[0,0] + rho[-1,-1]) / 2 + Re rho[0,-1]
+- purity        tr(rho^2)
+
+COMPARE_PICKLE reruns the sweep with results returned through the pool (the
+usual pickling transport) and checks both give identical matrices.
+"""
+
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from qiskit import QuantumCircuit
+from qiskit_aer import AerSimulator
+from qiskit_aer.noise import NoiseModel, depolarizing_error
+
+import shared_modules  # noqa: F401
+from shared_results import map_into
+
+n_list = [8, 9, 10]
+noise_levels = [0.0, 0.01, 0.02, 0.05, 0.10, 0.20]
+
+max_workers = 4
+RESULTS_PATH = None  # e.g. "experiments/06_multipartite/results/exp_04_density_matrices.npy"
+COMPARE_PICKLE = True
+
+def ghz_n(n: int):
+    qc = QuantumCircuit(n)
+    qc.h(0)
+    for q in range(n - 1):
+        qc.cx(q, q + 1)
+    return qc
+
+def build_noise_model(p: float) -> NoiseModel:
+    nm = NoiseModel()
+    if p > 0:
+        nm.add_all_qubit_quantum_error(depolarizing_error(p, 1), "h")
+        nm.add_all_qubit_quantum_error(depolarizing_error(p, 2), "cx")
+    return nm
+
+def noisy_ghz_density(point) -> np.ndarray:
+    n, p = point
+    qc = ghz_n(n)
+    qc.save_density_matrix()
+    sim = AerSimulator(noise_model=build_noise_model(p), method="density_matrix")
+    return np.asarray(sim.run(qc).result().data(0)["density_matrix"])
+
+def ghz_fidelity(rho: np.ndarray) -> float:
+    return float((rho[0, 0].real + rho[-1, -1].real) / 2 + rho[0, -1].real)
+
+def purity(rho: np.ndarray) -> float:
+    return float(np.vdot(rho, rho).real)
+
+def sweep_shared(n: int):
+    points = [(n, p) for p in noise_levels]
+    path = None if RESULTS_PATH is None else RESULTS_PATH.replace(".npy", f"_n{n}.npy")
+    t0 = time.perf_counter()
+    results = map_into(noisy_ghz_density, points, (2 ** n, 2 ** n), max_workers=max_workers, path=path)
+    return results, time.perf_counter() - t0
+
+def sweep_pickled(n: int):
+    points = [(n, p) for p in noise_levels]
+    t0 = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        mats = list(pool.map(noisy_ghz_density, points))
+    return mats, time.perf_counter() - t0
+
+if __name__ == "__main__":
+    print("\n=== Experiment 04 — Parallel noisy GHZ_n density matrices ===")
+    print(f"n_list={n_list}, noise_levels={noise_levels}, max_workers={max_workers}, "
+          f"transport={'memmap ' + RESULTS_PATH if RESULTS_PATH else 'shared memory'}")
+
+    for n in n_list:
+        results, t_shared = sweep_shared(n)
+        with results:
+            print(f"\n--- GHZ_{n}: {len(noise_levels)} x {results.array[0].nbytes / 2**20:.0f} MB ---")
+            for p, rho in zip(noise_levels, results.array):
+                print(f"p={p:0.2f} -> fidelity={ghz_fidelity(rho):0.4f}, purity={purity(rho):0.4f}")
+            print(f"shared results: {t_shared:.2f} s")
+
+            if COMPARE_PICKLE:
+                mats, t_pickled = sweep_pickled(n)
+                same = all(np.array_equal(a, b) for a, b in zip(mats, results.array))
+                print(f"pickled results: {t_pickled:.2f} s (identical: {same})")
+                del mats
+
+    print("\nExpected:")
+    print("- GHZ fidelity and purity fall faster with p for larger n (more noisy gates)")
+    print("- the pickled transport costs more as the matrices grow; the shared block does not")
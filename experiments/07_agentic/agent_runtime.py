@@ -0,0 +1,463 @@
+"""
+Agent runtime — shared propose -> simulate -> evaluate -> decide loop
+
+The agentic experiments plug into this runtime instead of hand-rolling their
+loops, so the compute cost of different policies can be capped and compared.
+
+- evaluator(point, shots) -> number of successes (the same interface as the
+  threshold searches: count_correlated, count_correct, ...)
+- a policy proposes a batch of Requests, observes their results and finally
+  returns a decision:
+    propose() -> list[Request]   ([] when the policy is done)
+    observe(results)             results = [(Request, successes), ...]
+    decision()                   the policy's answer
+- budgets on shots, simulator calls and wall-clock seconds; a batch that would
+  overrun the shot/call budget is not started, and the policy's current
+  decision is returned. Request.shots is the evaluator's sample count, whatever
+  it counts: Budget.unit names it ("shots", or e.g. "trials" for an evaluator
+  that runs whole trials per sample) in the telemetry
+- every evaluation is memoized by its Request (point, shots, replicate), so
+  re-proposed points cost nothing
+- reproducible streams: with a root `seed`, each Request gets its own child
+  seed from numpy's SeedSequence (spawn key = point, shots, replicate) and the
+  evaluator is called as evaluator(point, shots, seed=child); results do not
+  depend on evaluation order or max_workers, and any point can be recomputed
+  in isolation
+- the requests of one batch are evaluated concurrently (thread pool; Aer
+  releases the GIL while simulating)
+- telemetry: one record per decision step with its requests, cache hits,
+  shots, calls and seconds, plus running totals
+- checkpoint / resume: with `checkpoint` set, every evaluation is appended to
+  a JSONL file as soon as it finishes (not when its batch does), under the
+  content hash of (checkpoint_context, Request, seed);
+  a restarted run reads it back instead of re-evaluating. Restored results
+  are charged to the budget like fresh ones, so with a seed a resumed run
+  makes exactly the decisions of an uninterrupted one
+
+Policies for "largest p with metric(p) >= target" (metric decreasing in p):
+- GridPolicy: coarse scan + step refine around the best coarse point
+- BisectionPolicy: noisy bisection with adaptive blocks per midpoint
+- NewtonPolicy: safeguarded Newton on an exact, differentiable metric; it
+  requests shots=0, and such a request calls the evaluator as evaluator(point)
+  (no shots, no seed): a derivative evaluator returns (metric, d metric / dp)
+- SurrogatePolicy: Gaussian-process surrogate of metric(p) under a fixed
+  number of evaluations, sampling where the side of the target is least known
+"""
+
+import hashlib
+import json
+import math
+import os
+import time
+import numpy as np
+from statistics import NormalDist
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+
+@dataclass(frozen=True)
+class Request:
+    point: float
+    shots: int
+    replicate: int = 0  # distinguishes repeated blocks at the same point
+
+@dataclass
+class Budget:
+    shots: int | None = None
+    calls: int | None = None
+    seconds: float | None = None
+    unit: str = "shots"  # what Request.shots counts for this evaluator
+
+@dataclass
+class Telemetry:
+    steps: list = field(default_factory=list)
+    shots: int = 0
+    calls: int = 0
+    cache_hits: int = 0
+    restored: int = 0  # evaluations read back from the checkpoint
+    seconds: float = 0.0
+    stopped_by: str | None = None  # budget that ended the run, None if the policy finished
+    unit: str = "shots"
+
+def request_seed(root: int, request: Request) -> int:
+    """Child seed of `root` for one Request; depends only on the Request itself."""
+    point_bits = int(np.float64(request.point).view(np.uint64))
+    key = (point_bits, request.shots, request.replicate)
+    return int(np.random.SeedSequence(root, spawn_key=key).generate_state(1)[0])
+
+def load_checkpoint(path: str) -> dict:
+    """hash -> value of every checkpointed record; a torn last line is cut off."""
+    done = {}
+    if not os.path.exists(path):
+        return done
+    with open(path, "rb+") as f:
+        data = f.read()
+        complete = data[:data.rfind(b"\n") + 1]
+        if len(complete) < len(data):
+            f.truncate(len(complete))
+
+    for line in complete.decode().splitlines():
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        value = record["value"]
+        done[record["hash"]] = tuple(value) if isinstance(value, list) else value
+    return done
+
+def append_checkpoint(path: str, key: str, value, **fields):
+    """Append one record (flushed and fsynced); fields are stored alongside for inspection."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a") as f:
+        f.write(json.dumps({"hash": key, **fields, "value": value}) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+class AgentRuntime:
+    def __init__(self, evaluator, budget: Budget | None = None, max_workers: int = 4,
+                 seed: int | None = None, checkpoint: str | None = None,
+                 checkpoint_context: dict | None = None):
+        self.evaluator = evaluator
+        self.budget = budget or Budget()
+        self.max_workers = max_workers
+        self.seed = seed
+        self.cache = {}
+
+        self.checkpoint = checkpoint
+        self.checkpoint_context = checkpoint_context or {}
+        self.restorable = load_checkpoint(checkpoint) if checkpoint else {}
+        self.restored = 0
+
+    def _request_hash(self, request: Request) -> str:
+        payload = {"context": self.checkpoint_context, "point": request.point, "shots": request.shots,
+                   "replicate": request.replicate, "seed": self.seed}
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    def _call(self, request: Request):
+        if request.shots == 0:  # exact evaluation: nothing is sampled
+            return self.evaluator(request.point)
+        if self.seed is None:
+            return self.evaluator(request.point, request.shots)
+        return self.evaluator(request.point, request.shots, seed=request_seed(self.seed, request))
+
+    def _over_budget(self, telemetry: Telemetry, new_shots: int, new_calls: int):
+        if self.budget.shots is not None and telemetry.shots + new_shots > self.budget.shots:
+            return self.budget.unit
+        if self.budget.calls is not None and telemetry.calls + new_calls > self.budget.calls:
+            return "calls"
+        if self.budget.seconds is not None and telemetry.seconds >= self.budget.seconds:
+            return "seconds"
+        return None
+
+    def _store(self, request: Request, value, key: str | None = None):
+        self.cache[request] = value
+        if self.checkpoint:
+            append_checkpoint(self.checkpoint, key, value,
+                              point=request.point, shots=request.shots, replicate=request.replicate)
+
+    def evaluate(self, requests):
+        """
+        Memoized, concurrent evaluation of a batch. Returns (results, cache hits).
+        Each fresh evaluation is cached and checkpointed as soon as it finishes,
+        so an interrupted batch keeps the evaluations it completed.
+        """
+        missing = list(dict.fromkeys(r for r in requests if r not in self.cache))
+
+        hashes = {}
+        fresh = missing
+        if self.checkpoint:
+            hashes = {r: self._request_hash(r) for r in missing}
+            for r in missing:
+                if hashes[r] in self.restorable:
+                    self.cache[r] = self.restorable[hashes[r]]
+                    self.restored += 1
+            fresh = [r for r in missing if r not in self.cache]
+
+        if len(fresh) > 1 and self.max_workers > 1:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                futures = {pool.submit(self._call, r): r for r in fresh}
+                for future in as_completed(futures):
+                    r = futures[future]
+                    self._store(r, future.result(), hashes.get(r))
+        else:
+            for r in fresh:
+                self._store(r, self._call(r), hashes.get(r))
+
+        return [(r, self.cache[r]) for r in requests], len(requests) - len(missing)
+
+    def run(self, policy):
+        """Drive the policy until it is done or a budget is exhausted."""
+        telemetry = Telemetry(unit=self.budget.unit)
+        t_start = time.perf_counter()
+
+        while True:
+            requests = policy.propose()
+            if not requests:
+                break
+
+            missing = [r for r in dict.fromkeys(requests) if r not in self.cache]
+            reason = self._over_budget(telemetry, sum(r.shots for r in missing), len(missing))
+            if reason:
+                telemetry.stopped_by = reason
+                break
+
+            t0 = time.perf_counter()
+            results, hits = self.evaluate(requests)
+            elapsed = time.perf_counter() - t0
+
+            policy.observe(results)
+
+            shots = sum(r.shots for r in missing)
+            telemetry.shots += shots
+            telemetry.calls += len(missing)
+            telemetry.cache_hits += hits
+            telemetry.seconds = time.perf_counter() - t_start
+            telemetry.steps.append({
+                "step": len(telemetry.steps) + 1,
+                "requests": len(requests),
+                "cache_hits": hits,
+                "shots": shots,
+                "calls": len(missing),
+                "seconds": elapsed,
+                "total_shots": telemetry.shots,
+                "total_calls": telemetry.calls,
+            })
+
+        telemetry.seconds = time.perf_counter() - t_start
+        telemetry.restored = self.restored
+        return policy.decision(), telemetry
+
+def print_telemetry(label: str, telemetry: Telemetry, max_step_lines: int = 20):
+    """Summary line, preceded by the per-step records for short runs."""
+    unit = telemetry.unit
+    if len(telemetry.steps) <= max_step_lines:
+        for s in telemetry.steps:
+            print(f"  step {s['step']:2d}: requests={s['requests']:2d} (cache hits {s['cache_hits']}) "
+                  f"{unit}={s['shots']:5d} calls={s['calls']:2d} {s['seconds'] * 1e3:7.1f} ms "
+                  f"| total {unit}={s['total_shots']}, calls={s['total_calls']}")
+    stop = f", stopped by {telemetry.stopped_by} budget" if telemetry.stopped_by else ""
+    restored = f", restored from checkpoint={telemetry.restored}" if telemetry.restored else ""
+    print(f"[{label}] steps={len(telemetry.steps)}, calls={telemetry.calls}, {unit}={telemetry.shots}, "
+          f"cache hits={telemetry.cache_hits}{restored}, wall-clock={telemetry.seconds:.2f} s{stop}")
+
+# ---- Threshold policies ----
+
+def wilson_bounds(successes: int, n: int, z: float):
+    phat = successes / n
+    denom = 1 + z ** 2 / n
+    center = (phat + z ** 2 / (2 * n)) / denom
+    half = z * math.sqrt(phat * (1 - phat) / n + z ** 2 / (4 * n ** 2)) / denom
+    return center - half, center + half
+
+class GridPolicy:
+    """Coarse scan, then a step refine in [best - span, best + span]; one batch each."""
+
+    def __init__(self, coarse_grid, target: float, shots: int, refine_step: float,
+                 refine_span: float = 0.05, p_max: float = 0.5):
+        self.coarse_grid = list(coarse_grid)
+        self.target = target
+        self.shots = shots
+        self.refine_step = refine_step
+        self.refine_span = refine_span
+        self.p_max = p_max
+        self.stage = "coarse"
+        self.history = []  # (p, metric, samples, ok)
+
+    def propose(self):
+        if self.stage == "coarse":
+            return [Request(p, self.shots) for p in self.coarse_grid]
+        if self.stage == "refine":
+            best = self.decision()
+            if best is None:
+                return []
+            low = max(0.0, best - self.refine_span)
+            high = min(self.p_max, best + self.refine_span)
+            n_steps = int(round((high - low) / self.refine_step))
+            return [Request(round(low + i * self.refine_step, 6), self.shots) for i in range(n_steps + 1)]
+        return []
+
+    def observe(self, results):
+        for r, k in results:
+            metric = k / r.shots
+            self.history.append((r.point, metric, r.shots, metric >= self.target))
+        self.stage = "refine" if self.stage == "coarse" else "done"
+
+    def decision(self):
+        ok = [p for p, _, _, passed in self.history if passed]
+        return max(ok) if ok else None
+
+class BisectionPolicy:
+    """
+    Noisy bisection: each midpoint is sampled in blocks until its Wilson interval
+    excludes the target (or max_per_point is reached, then the point estimate
+    decides); the error budget 1 - confidence is split over the bisection steps.
+    decision() returns the bracket (lo, hi) around the threshold.
+    """
+
+    def __init__(self, lo: float, hi: float, target: float, resolution: float,
+                 confidence: float, block: int, max_per_point: int, parallel_blocks: int = 1):
+        self.lo, self.hi = lo, hi
+        self.target = target
+        self.resolution = resolution
+        self.block = block
+        self.max_per_point = max_per_point
+        self.parallel_blocks = parallel_blocks  # blocks proposed per step (evaluated concurrently)
+
+        steps = max(1, math.ceil(math.log2((hi - lo) / resolution)))
+        self.z = NormalDist().inv_cdf(1 - (1 - confidence) / (2 * steps))
+
+        self.mid = None
+        self.successes = 0
+        self.n = 0
+        self.history = []  # (p, metric, samples, ok)
+
+    def propose(self):
+        if self.hi - self.lo <= self.resolution:
+            return []
+        if self.mid is None:
+            self.mid = (self.lo + self.hi) / 2
+            self.successes = self.n = 0
+        first = self.n // self.block
+        remaining = max(1, (self.max_per_point - self.n) // self.block)
+        return [Request(self.mid, self.block, replicate=first + i)
+                for i in range(min(self.parallel_blocks, remaining))]
+
+    def observe(self, results):
+        for r, k in results:
+            self.successes += k
+            self.n += r.shots
+
+        ci_lo, ci_hi = wilson_bounds(self.successes, self.n, self.z)
+        settled = ci_lo >= self.target or ci_hi < self.target
+        if not settled and self.n < self.max_per_point:
+            return
+
+        ok = ci_lo >= self.target if settled else self.successes / self.n >= self.target
+        self.history.append((self.mid, self.successes / self.n, self.n, ok))
+        if ok:
+            self.lo = self.mid
+        else:
+            self.hi = self.mid
+        self.mid = None
+
+    def decision(self):
+        return self.lo, self.hi
+
+class NewtonPolicy:
+    """
+    Newton iteration on metric(p) - target, kept inside a bracket [lo, hi] with
+    metric(lo) >= target > metric(hi); a step that leaves the bracket (or a
+    non-negative slope) falls back to bisection. decision() returns the root.
+    """
+
+    def __init__(self, lo: float, hi: float, target: float, tol: float = 1e-6, max_steps: int = 30):
+        self.lo, self.hi = lo, hi
+        self.target = target
+        self.tol = tol
+        self.max_steps = max_steps
+        self.p = lo
+        self.done = False
+        self.history = []  # (p, metric, samples, ok)
+
+    def propose(self):
+        if self.done or len(self.history) >= self.max_steps:
+            return []
+        return [Request(self.p, 0)]
+
+    def observe(self, results):
+        (r, (metric, slope)), = results
+        ok = metric >= self.target
+        self.history.append((r.point, metric, 0, ok))
+        if ok:
+            self.lo = r.point
+        else:
+            self.hi = r.point
+
+        step = (self.target - metric) / slope if slope < 0 else None
+        candidate = r.point + step if step is not None else None
+        if candidate is None or not self.lo < candidate < self.hi:
+            candidate = (self.lo + self.hi) / 2
+
+        self.done = abs(candidate - r.point) < self.tol or self.hi - self.lo < self.tol
+        self.p = candidate
+
+    def decision(self):
+        return self.p
+
+class SurrogatePolicy:
+    """
+    Gaussian-process surrogate of metric(p) (RBF kernel, linear prior mean,
+    per-point binomial noise variance), for evaluators too expensive for a
+    bisection: after both ends of [lo, hi], each step proposes the grid point
+    that maximizes the entropy of P(metric(p) >= target) under the posterior
+    (the point whose side of the target is least known), until n_calls
+    evaluations are done. decision() returns threshold samples: the first p
+    below the target on each of `paths` GP sample paths.
+    """
+
+    def __init__(self, lo: float, hi: float, target: float, shots: int, n_calls: int,
+                 length_scale: float = 0.15, signal_std: float = 0.3, grid_points: int = 201,
+                 paths: int = 4000, seed: int | None = None):
+        self.target = target
+        self.shots = shots
+        self.n_calls = n_calls
+        self.length_scale = length_scale
+        self.signal_std = signal_std
+        self.paths = paths
+        self.seed = seed
+        self.x_grid = np.linspace(lo, hi, grid_points)
+        self.x_obs, self.y_obs, self.noise_var = [], [], []
+        self.history = []  # (p, metric, samples, ok)
+
+    def _rbf(self, a, b):
+        return self.signal_std ** 2 * np.exp(-0.5 * (a[:, None] - b[None, :]) ** 2 / self.length_scale ** 2)
+
+    def posterior(self):
+        """GP posterior of metric(p) on x_grid: (mean, std, covariance)."""
+        x_obs, y_obs = np.array(self.x_obs), np.array(self.y_obs)
+        slope, intercept = np.polyfit(x_obs, y_obs, 1)
+
+        K = self._rbf(x_obs, x_obs) + np.diag(np.array(self.noise_var) + 1e-9)
+        L = np.linalg.cholesky(K)
+        alpha = np.linalg.solve(L.T, np.linalg.solve(L, y_obs - (intercept + slope * x_obs)))
+
+        Ks = self._rbf(self.x_grid, x_obs)
+        mean = intercept + slope * self.x_grid + Ks @ alpha
+        v = np.linalg.solve(L, Ks.T)
+        cov = self._rbf(self.x_grid, self.x_grid) - v.T @ v
+        std = np.sqrt(np.clip(np.diag(cov), 0, None))
+        return mean, std, cov
+
+    def _level_set_entropy(self, mean, std):
+        """Binary entropy of P(metric(p) >= target) under the posterior."""
+        prob = np.array([NormalDist().cdf(z) for z in (mean - self.target) / np.maximum(std, 1e-12)])
+        prob = np.clip(prob, 1e-12, 1 - 1e-12)
+        return -(prob * np.log2(prob) + (1 - prob) * np.log2(1 - prob))
+
+    def propose(self):
+        if not self.x_obs:
+            return [Request(float(self.x_grid[0]), self.shots), Request(float(self.x_grid[-1]), self.shots)]
+        if len(self.x_obs) >= self.n_calls:
+            return []
+        mean, std, _ = self.posterior()
+        p = float(self.x_grid[np.argmax(self._level_set_entropy(mean, std))])
+        return [Request(p, self.shots, replicate=self.x_obs.count(p))]
+
+    def observe(self, results):
+        for r, k in results:
+            phat = k / r.shots
+            self.x_obs.append(r.point)
+            self.y_obs.append(phat)
+            # binomial variance, floored so that 0/n and n/n still carry noise
+            self.noise_var.append((phat * (1 - phat) + 1 / r.shots) / r.shots)
+            self.history.append((r.point, phat, r.shots, phat >= self.target))
+
+    def decision(self):
+        """First p below the target on each GP sample path (metric decreasing in p)."""
+        mean, _, cov = self.posterior()
+        L = np.linalg.cholesky(cov + 1e-8 * np.eye(len(self.x_grid)))
+        rng = np.random.default_rng(self.seed)
+        paths = mean[None, :] + rng.standard_normal((self.paths, len(self.x_grid))) @ L.T
+
+        below = paths < self.target
+        first = np.where(below.any(axis=1), below.argmax(axis=1), len(self.x_grid) - 1)
+        return self.x_grid[np.maximum(first - 1, 0)]
@@ -1,16 +1,56 @@
 """
 Experiment 01 — Agentic optimization of shots
 Goal: keep success probability >= target_accuracy
+
+Readout mitigation:
+- readout bit-flips bias the correlation metric downwards, which the agent
+  would otherwise try (and fail) to compensate with more shots
+- per-qubit calibration matrices A_q[measured, prepared] are measured once per
+  readout-noise setting (2 circuits: all |0>, all |1>) and cached on disk
+- counts are corrected with the tensored inverse (least-squares, clipped to the
+  simplex) or iterative Bayesian unfolding, vectorized over count arrays
+
+Shot escalation is incremental:
+- counts are accumulated across the candidates, so going from 512 to 1024
+  shots only requests the 512 additional shots (1024 in total, not 1984)
+- the agent accepts a budget once the lower confidence bound of the accuracy
+  (Wilson for raw counts, delta method for the mitigated estimate) reaches the
+  target, and gives up early once the upper bound falls below it
+- the bounds are checked once per candidate, so the error budget
+  1 - confidence is split over len(shots_candidates) steps (as in
+  BisectionPolicy); the overall error rate stays below 1 - confidence
+
+Every Aer call gets a child seed of `seed` (numpy SeedSequence, spawn key =
+calibration or sweep position), so runs are reproducible.
 """
 
+import json
+import math
+import os
+import numpy as np
+from statistics import NormalDist
 from qiskit import QuantumCircuit
 from qiskit_aer import AerSimulator
-from qiskit_aer.noise import depolarizing_error, NoiseModel
+from qiskit_aer.noise import depolarizing_error, NoiseModel, ReadoutError
+
+from agent_runtime import wilson_bounds
+
+seed = 1
 
 target_accuracy = 0.95
 shots_candidates = [64, 128, 256, 512, 1024]
 noise_levels = [0.0, 0.05, 0.1, 0.2]
 
+p_readout = 0.03
+cal_shots = 8192
+mitigation_method = "inverse"  # "inverse" or "ibu"
+ibu_iterations = 50
+
+confidence = 0.95  # over all escalation steps together
+confidence_z = NormalDist().inv_cdf(1 - (1 - confidence) / (2 * len(shots_candidates)))
+
+cache_path = "experiments/07_agentic/results/readout_calibration_cache.json"
+
 def bell_circuit():
     qc = QuantumCircuit(2, 2)
     qc.h(0)
@@ -18,35 +58,179 @@ def bell_circuit():
     qc.measure([0, 1], [0, 1])
     return qc
 
-def metric(counts, shots):
-    return (counts.get("00", 0) + counts.get("11", 0)) / shots
+def child_seed(*key) -> int:
+    """Aer seed_simulator for one position of the run, from the root SeedSequence."""
+    return int(np.random.SeedSequence(seed, spawn_key=key).generate_state(1)[0])
 
 def build_noise(p):
     nm = NoiseModel()
     if p > 0:
         nm.add_all_qubit_quantum_error(depolarizing_error(p, 1), ["h"])
         nm.add_all_qubit_quantum_error(depolarizing_error(p, 2), ["cx"])
+    if p_readout > 0:
+        ro = ReadoutError([[1 - p_readout, p_readout],
+                           [p_readout, 1 - p_readout]])
+        nm.add_all_qubit_readout_error(ro)
     return nm
 
+# ---- Readout calibration (cached on disk) ----
+
+def measure_calibration(n_qubits: int):
+    """Tensored calibration: per-qubit A_q[measured, prepared] from |0...0> and |1...1>."""
+    sim = AerSimulator(noise_model=build_noise(0.0))
+
+    hist = {}
+    for prepared in (0, 1):
+        qc = QuantumCircuit(n_qubits, n_qubits)
+        if prepared:
+            qc.x(range(n_qubits))
+        qc.measure(range(n_qubits), range(n_qubits))
+        hist[prepared] = sim.run(qc, shots=cal_shots,
+                                 seed_simulator=child_seed(0, n_qubits, prepared)).result().get_counts()
+
+    matrices = []
+    for q in range(n_qubits):
+        A = np.zeros((2, 2))
+        for prepared in (0, 1):
+            ones = sum(v for k, v in hist[prepared].items() if k[::-1][q] == "1")
+            A[1, prepared] = ones / cal_shots
+            A[0, prepared] = 1 - A[1, prepared]
+        matrices.append(A)
+    return matrices
+
+def load_calibration(n_qubits: int):
+    key = f"n={n_qubits}|p_readout={p_readout}|cal_shots={cal_shots}|seed={seed}"
+
+    cache = {}
+    if os.path.exists(cache_path):
+        with open(cache_path) as f:
+            cache = json.load(f)
+
+    if key in cache:
+        return [np.array(A) for A in cache[key]], True
+
+    matrices = measure_calibration(n_qubits)
+    cache[key] = [A.tolist() for A in matrices]
+
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    with open(cache_path, "w") as f:
+        json.dump(cache, f, indent=2)
+
+    return matrices, False
+
+# ---- Mitigation (vectorized over a batch of count vectors) ----
+
+def apply_tensored(matrices, probs):
+    """Apply A_0 x A_1 x ... to probs of shape (batch, 2^n), one 2x2 factor per qubit."""
+    n = len(matrices)
+    t = probs.reshape([-1] + [2] * n)
+    for q, A in enumerate(matrices):
+        axis = n - q  # axis 0 is the batch; qubit 0 is the last (least significant) axis
+        t = np.moveaxis(np.tensordot(A, t, axes=(1, axis)), 0, axis)
+    return t.reshape(probs.shape)
+
+def mitigate(matrices, count_array, method: str = mitigation_method):
+    """count_array: (batch, 2^n) raw counts -> (batch, 2^n) mitigated probabilities."""
+    shots = count_array.sum(axis=1, keepdims=True)
+    y = count_array / shots
+
+    if method == "inverse":
+        x = apply_tensored([np.linalg.inv(A) for A in matrices], y)
+        x = np.clip(x, 0, None)
+        return x / x.sum(axis=1, keepdims=True)
+
+    if method == "ibu":
+        x = np.full_like(y, 1 / y.shape[1])
+        transposed = [A.T for A in matrices]
+        for _ in range(ibu_iterations):
+            pred = apply_tensored(matrices, x)
+            ratio = np.divide(y, pred, out=np.zeros_like(y), where=pred > 0)
+            x = x * apply_tensored(transposed, ratio)
+        return x / x.sum(axis=1, keepdims=True)
+
+    raise ValueError("Unknown mitigation method")
+
+def counts_to_array(counts, n_bits):
+    arr = np.zeros(2 ** n_bits)
+    for k, v in counts.items():
+        arr[int(k, 2)] = v
+    return arr
+
+# ---- Confidence bounds on the accuracy ----
+
+def mitigated_bounds(matrices, count_array, z: float = confidence_z):
+    """
+    Bounds on the mitigated accuracy from the linear-inverse estimator
+    sum_k w_k y_k, with w = (A^-1)^T e_{00,11} and y the empirical distribution:
+    its multinomial variance is (E[w^2] - E[w]^2) / N (delta method for "ibu").
+    The interval is centred on this unclipped estimate (which can exceed 1);
+    only the returned bounds are clipped to [0, 1]. The variance is taken
+    under y with z^2 pseudo-counts spread over the outcomes (Agresti-Coull),
+    so that counts all on 00/11 do not give a zero-width interval.
+    """
+    n = len(matrices)
+    e = np.zeros((1, 2 ** n))
+    e[0, 0] = e[0, -1] = 1.0  # 00...0 and 11...1
+    w = apply_tensored([np.linalg.inv(A).T for A in matrices], e)[0]
+
+    shots = count_array.sum()
+    y = count_array / shots
+    linear = float(w @ y)
+
+    smoothed = (count_array + z ** 2 / len(w)) / (shots + z ** 2)
+    mean = float(w @ smoothed)
+    se = math.sqrt(max(float((w ** 2) @ smoothed) - mean ** 2, 0.0) / (shots + z ** 2))
+    return max(linear - z * se, 0.0), min(linear + z * se, 1.0)
+
+calibration, from_cache = load_calibration(2)
+
 print("\n=== Agentic shots optimization ===")
-print("Target accuracy =", target_accuracy)
+print("Target accuracy =", target_accuracy, "| seed =", seed)
+print(f"confidence={confidence} over {len(shots_candidates)} steps (per-step z={confidence_z:.2f})")
+print(f"p_readout={p_readout}, mitigation={mitigation_method}, "
+      f"calibration {'loaded from cache' if from_cache else 'measured and cached'} ({cache_path})")
 
-for p in noise_levels:
+for i_p, p in enumerate(noise_levels):
     print(f"\n--- Noise p={p} ---")
     sim = AerSimulator(noise_model=build_noise(p))
     qc = bell_circuit()
 
-    chosen = None
-    for shots in shots_candidates:
-        counts = sim.run(qc, shots=shots).result().get_counts()
-        acc = metric(counts, shots)
-        print(f"shots={shots:4d} -> accuracy={acc:.3f}")
+    total = np.zeros(4)
+    decided = {"raw": None, "mitigated": None}  # shots (accepted) or False (rejected)
+
+    for i_shots, shots in enumerate(shots_candidates):
+        # only request the additional shots on top of what was already collected
+        extra = shots - int(total.sum())
+        counts = sim.run(qc, shots=extra, seed_simulator=child_seed(1, i_p, i_shots)).result().get_counts()
+        total += counts_to_array(counts, 2)
+
+        acc = (total[0b00] + total[0b11]) / shots
+        raw_lo, raw_hi = wilson_bounds(int(total[0b00] + total[0b11]), shots, confidence_z)
 
-        if acc >= target_accuracy:
-            chosen = shots
+        probs = mitigate(calibration, total[None, :])[0]
+        acc_mit = probs[0b00] + probs[0b11]
+        mit_lo, mit_hi = mitigated_bounds(calibration, total)
+
+        print(f"shots={shots:4d} (+{extra:4d}) -> accuracy raw={acc:.3f} [{raw_lo:.3f}, {raw_hi:.3f}] | "
+              f"mitigated={acc_mit:.3f} [{mit_lo:.3f}, {mit_hi:.3f}]")
+
+        for label, lo, hi in [("raw", raw_lo, raw_hi), ("mitigated", mit_lo, mit_hi)]:
+            if decided[label] is None:
+                if lo >= target_accuracy:
+                    decided[label] = shots
+                elif hi < target_accuracy:
+                    decided[label] = False
+
+        if all(v is not None for v in decided.values()):
             break
 
-    if chosen:
-        print("→ Agent choice:", chosen, "shots")
-    else:
-        print("→ Agent failed to meet target accuracy")
+    print(f"total shots simulated: {int(total.sum())} (re-running every candidate: "
+          f"{sum(c for c in shots_candidates if c <= shots)})")
+
+    for label, chosen in decided.items():
+        if chosen:
+            print(f"→ Agent choice ({label}):", chosen, "shots")
+        elif chosen is False:
+            print(f"→ Agent ({label}): target confidently out of reach, stopped early")
+        else:
+            print(f"→ Agent ({label}): undecided after {shots} shots (target inside the confidence bounds)")
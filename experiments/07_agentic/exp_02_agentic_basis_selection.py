@@ -10,16 +10,44 @@ Noise:
 - depolarizing: degrades both
 
 Agent chooses the basis that yields higher correlation.
+
+Bandit allocation: instead of spending `shots` on every basis, each candidate
+basis is an arm and shots are spent adaptively (successive elimination):
+- every active arm is pulled with `shot_block` shots per round
+- Wilson bounds (union bound over arms and rounds, error `bandit_delta`)
+  eliminate arms whose upper bound falls below the leader's lower bound
+- the agent stops once the leader is epsilon-best with confidence, or when
+  `shots` per arm (the fixed budget) are spent
+Arms are not limited to Z/X: Y and a rotated XZ-plane basis are included.
+For |Phi+> the Y basis gives ANTI-correlated outcomes, so each arm carries the
+outcomes that count as "correlated".
+
+Every Aer call gets a child seed of `seed` (numpy SeedSequence, spawn key =
+noise kind, noise level, arm, round), so runs are reproducible and each
+configuration can be recomputed on its own.
 """
 
+import math
+from statistics import NormalDist
+import numpy as np
 from qiskit import QuantumCircuit
 from qiskit_aer import AerSimulator
 from qiskit_aer.noise import NoiseModel, phase_damping_error, depolarizing_error
 
+from agent_runtime import wilson_bounds
+
+seed = 5
 shots = 2048
 noise_levels = [0.0, 0.05, 0.10, 0.20, 0.30]
 noise_kinds = ["phase", "depolarizing"]
 
+shot_block = 64
+bandit_delta = 0.05      # probability of a wrong (non epsilon-best) choice
+bandit_epsilon = 0.01    # arms within epsilon of the best count as equally good
+rotation_theta = math.pi / 4
+
+NOISY_1Q = ["h", "sdg", "ry"]
+
 def bell_state_phi_plus():
     qc = QuantumCircuit(2)
     qc.h(0)
@@ -40,9 +68,36 @@ def measure_in_x():
     qc.measure([0, 1], [0, 1])
     return qc
 
+def measure_in_y():
+    qc = QuantumCircuit(2, 2)
+    qc.compose(bell_state_phi_plus(), inplace=True)
+    qc.sdg(0)
+    qc.sdg(1)
+    qc.h(0)
+    qc.h(1)
+    qc.measure([0, 1], [0, 1])
+    return qc
+
+def measure_in_rotated(theta: float):
+    """Both qubits measured along cos(theta) Z + sin(theta) X."""
+    qc = QuantumCircuit(2, 2)
+    qc.compose(bell_state_phi_plus(), inplace=True)
+    qc.ry(-theta, 0)
+    qc.ry(-theta, 1)
+    qc.measure([0, 1], [0, 1])
+    return qc
+
 def corr_metric(counts, shots):
     return (counts.get("00", 0) + counts.get("11", 0)) / shots
 
+# arm label -> (circuit, outcomes that count as correlated)
+ARMS = {
+    "Z": (measure_in_z(), ("00", "11")),
+    "X": (measure_in_x(), ("00", "11")),
+    "Y": (measure_in_y(), ("01", "10")),
+    "XZ(pi/4)": (measure_in_rotated(rotation_theta), ("00", "11")),
+}
+
 def build_noise_model(kind: str, p: float) -> NoiseModel:
     nm = NoiseModel()
     if p <= 0:
@@ -50,14 +105,14 @@ def build_noise_model(kind: str, p: float) -> NoiseModel:
 
     if kind == "phase":
         e1 = phase_damping_error(p)
-        nm.add_all_qubit_quantum_error(e1, ["h"])
+        nm.add_all_qubit_quantum_error(e1, NOISY_1Q)
         # no 1q error on cx; phase damping won't flip bits in Z anyway
         # keep cx ideal to isolate "basis sensitivity" effect
 
     elif kind == "depolarizing":
         e1 = depolarizing_error(p, 1)
         e2 = depolarizing_error(p, 2)
-        nm.add_all_qubit_quantum_error(e1, ["h"])
+        nm.add_all_qubit_quantum_error(e1, NOISY_1Q)
         nm.add_all_qubit_quantum_error(e2, ["cx"])
 
     else:
@@ -65,16 +120,52 @@ def build_noise_model(kind: str, p: float) -> NoiseModel:
 
     return nm
 
+def child_seed(*key) -> int:
+    """Aer seed_simulator for one position of the sweep, from the root SeedSequence."""
+    return int(np.random.SeedSequence(seed, spawn_key=key).generate_state(1)[0])
+
+def select_basis_bandit(sim: AerSimulator, arms: dict, point_key=()):
+    """
+    Successive elimination with an epsilon-best stopping rule; point_key
+    identifies the sweep point for seeding.
+    Returns (chosen arm, {arm: (correlated shots, shots)}).
+    """
+    max_rounds = shots // shot_block
+    z = NormalDist().inv_cdf(1 - bandit_delta / (2 * len(arms) * max_rounds))
+
+    stats = {label: [0, 0] for label in arms}
+    active = list(arms)
+
+    for rnd in range(max_rounds):
+        for label in active:
+            qc, good = arms[label]
+            arm_index = list(arms).index(label)
+            counts = sim.run(qc, shots=shot_block,
+                             seed_simulator=child_seed(*point_key, 2 + arm_index, rnd)).result().get_counts()
+            stats[label][0] += sum(counts.get(k, 0) for k in good)
+            stats[label][1] += shot_block
+
+        bounds = {label: wilson_bounds(*stats[label], z) for label in active}
+        leader = max(active, key=lambda a: stats[a][0] / stats[a][1])
+
+        active = [a for a in active if bounds[a][1] >= bounds[leader][0]]
+        if all(bounds[leader][0] >= bounds[a][1] - bandit_epsilon for a in active if a != leader):
+            break
+
+    leader = max(active, key=lambda a: stats[a][0] / stats[a][1])
+    return leader, {label: tuple(v) for label, v in stats.items()}
+
 print("\n=== Experiment 02 — Agentic basis selection (Z vs X) ===")
-print("shots =", shots)
+print("shots =", shots, "| seed =", seed)
+print(f"bandit: arms={list(ARMS)}, shot_block={shot_block}, delta={bandit_delta}, epsilon={bandit_epsilon}")
 
-for kind in noise_kinds:
+for i_kind, kind in enumerate(noise_kinds):
     print(f"\n### Noise kind: {kind} ###")
-    for p in noise_levels:
+    for i_p, p in enumerate(noise_levels):
         sim = AerSimulator(noise_model=build_noise_model(kind, p))
 
-        cz = sim.run(measure_in_z(), shots=shots).result().get_counts()
-        cx = sim.run(measure_in_x(), shots=shots).result().get_counts()
+        cz = sim.run(measure_in_z(), shots=shots, seed_simulator=child_seed(i_kind, i_p, 0)).result().get_counts()
+        cx = sim.run(measure_in_x(), shots=shots, seed_simulator=child_seed(i_kind, i_p, 1)).result().get_counts()
 
         corr_z = corr_metric(cz, shots)
         corr_x = corr_metric(cx, shots)
@@ -83,3 +174,10 @@ for kind in noise_kinds:
 
         print(f"\n--- p={p} ---")
         print(f"Corr(Z)={corr_z:.4f} | Corr(X)={corr_x:.4f} -> Agent chooses: {chosen}")
+
+        best, stats = select_basis_bandit(sim, ARMS, (i_kind, i_p))
+        used = sum(n for _, n in stats.values())
+        arms_line = " | ".join(f"{a}={k / n:.4f} ({n})" for a, (k, n) in stats.items())
+        print(f"bandit: {arms_line}")
+        print(f"bandit chooses: {best} with {used} shots "
+              f"(fixed allocation over {len(ARMS)} arms: {len(ARMS) * shots})")
@@ -6,26 +6,53 @@ Task:
 - Measure correlation Corr = P(00)+P(11)
 - Under depolarizing noise, find the largest p such that Corr >= target_corr
 
-Agent:
-- coarse scan over p
-- refine around best interval
+Agent (policies run by the shared agent runtime, see agent_runtime.py):
+- grid: coarse scan over p, then refine around the best interval
+- noisy bisection over p: each midpoint is measured in blocks of shots until
+  the confidence interval of Corr excludes the target; stops at a requested
+  p resolution and overall confidence. Run at the grid's resolution (0.01),
+  it needs about half the grid's shots
+- Newton on the exact metric: the differentiable mode returns Corr(p) from
+  the density matrix together with dCorr/dp (central finite difference on the
+  exact distributions), so the threshold is located in a handful of
+  evaluations without shot noise
+The runtime enforces shot / call / wall-clock budgets, memoizes evaluations,
+evaluates batches concurrently and reports per-decision cost telemetry. Every
+simulator call gets its own child seed of `seed`, so serial and parallel runs
+(any max_workers) give identical results.
 """
 
+from agent_runtime import AgentRuntime, Budget, GridPolicy, BisectionPolicy, NewtonPolicy, print_telemetry
 from qiskit import QuantumCircuit
 from qiskit_aer import AerSimulator
 from qiskit_aer.noise import NoiseModel, depolarizing_error
 
+seed = 3
 shots = 2048
 target_corr = 0.90
 
 coarse_grid = [0.00, 0.05, 0.10, 0.15, 0.20, 0.25, 0.30, 0.35, 0.40]
 refine_step = 0.01
 
-def bell_measure_z():
-    qc = QuantumCircuit(2, 2)
+p_bracket = (0.0, 0.5)
+p_resolution = 0.01       # the grid's refine step, so the costs are comparable
+search_confidence = 0.95
+shot_block = 256          # shots per sampling block at a midpoint
+max_shots_per_point = 4096
+parallel_blocks = 4       # blocks proposed per bisection step
+
+derivative_step = 1e-4    # finite-difference step on the exact metric
+newton_tol = 1e-6
+
+budget = Budget(shots=60_000, calls=200, seconds=60.0)
+max_workers = 4
+
+def bell_measure_z(measure: bool = True):
+    qc = QuantumCircuit(2, 2) if measure else QuantumCircuit(2)
     qc.h(0)
     qc.cx(0, 1)
-    qc.measure([0, 1], [0, 1])
+    if measure:
+        qc.measure([0, 1], [0, 1])
     return qc
 
 def corr_metric(counts, shots):
@@ -40,53 +67,80 @@ def build_dep_noise(p: float) -> NoiseModel:
         nm.add_all_qubit_quantum_error(e2, ["cx"])
     return nm
 
-def eval_corr(p: float) -> float:
+def count_correlated(p: float, n_shots: int, seed: int | None = None) -> int:
+    """Number of shots with outcome 00 or 11 out of n_shots."""
     sim = AerSimulator(noise_model=build_dep_noise(p))
-    counts = sim.run(bell_measure_z(), shots=shots).result().get_counts()
-    return corr_metric(counts, shots)
-
-print("\n=== Experiment 03 — Agentic noise threshold policy (depolarizing) ===")
-print("shots =", shots, "| target_corr =", target_corr)
-
-# 1) coarse scan
-best_p = None
-best_corr = None
-
-print("\n--- Coarse scan ---")
-for p in coarse_grid:
-    c = eval_corr(p)
-    ok = c >= target_corr
-    print(f"p={p:.2f} -> Corr={c:.4f} | {'OK' if ok else 'FAIL'}")
-    if ok:
-        best_p = p
-        best_corr = c
-
-if best_p is None:
-    print("\nNo p in coarse grid meets target_corr. Try lowering target or increasing shots.")
-    raise SystemExit(0)
-
-# 2) refine around [best_p - step, best_p + step]
-low = max(0.0, best_p - 0.05)
-high = min(0.5, best_p + 0.05)
-
-print(f"\nRefining around best coarse p={best_p:.2f} in [{low:.2f}, {high:.2f}] ...")
-
-refined_best_p = best_p
-refined_best_corr = best_corr
-
-p = low
-while p <= high + 1e-9:
-    c = eval_corr(p)
-    if c >= target_corr and p >= refined_best_p:
-        refined_best_p = p
-        refined_best_corr = c
-    print(f"p={p:.2f} -> Corr={c:.4f}")
-    p = round(p + refine_step, 2)
-
-print("\n=== Threshold estimate ===")
-print("Estimated max p with Corr >= target:", refined_best_p)
-print("Corr at estimate:", round(refined_best_corr, 4))
-
-print("\nInterpretation:")
-print("- This is a simple 'policy' for operating range under noise.")
-print("- If you change target_corr, shots, or metric, the threshold changes.")
+    counts = sim.run(bell_measure_z(), shots=n_shots, seed_simulator=seed).result().get_counts()
+    return counts.get("00", 0) + counts.get("11", 0)
+
+def eval_corr(p: float) -> float:
+    return count_correlated(p, shots) / shots
+
+exact_evaluations = 0  # exact_corr runs, finite-difference points included
+
+def exact_corr(p: float) -> float:
+    """Corr(p) from the density matrix (no shot noise)."""
+    global exact_evaluations
+    exact_evaluations += 1
+    qc = bell_measure_z(measure=False)
+    qc.save_probabilities()
+    sim = AerSimulator(noise_model=build_dep_noise(p), method="density_matrix")
+    probs = sim.run(qc).result().data(0)["probabilities"]
+    return float(probs[0] + probs[3])
+
+def exact_corr_with_derivative(p: float):
+    """(Corr(p), dCorr/dp); one-sided at p=0 where negative p is not a channel."""
+    h = derivative_step
+    if p - h < 0:
+        f0, f1, f2 = exact_corr(p), exact_corr(p + h), exact_corr(p + 2 * h)
+        return f0, (-3 * f0 + 4 * f1 - f2) / (2 * h)
+    return exact_corr(p), (exact_corr(p + h) - exact_corr(p - h)) / (2 * h)
+
+if __name__ == "__main__":
+    print("\n=== Experiment 03 — Agentic noise threshold policy (depolarizing) ===")
+    print("target_corr =", target_corr, "| seed =", seed)
+    print(f"budget: shots={budget.shots}, calls={budget.calls}, seconds={budget.seconds}")
+
+    # label -> (policy, evaluator)
+    policies = {
+        "grid (coarse + refine)": (GridPolicy(coarse_grid, target_corr, shots, refine_step), count_correlated),
+        "noisy bisection": (BisectionPolicy(*p_bracket, target_corr, p_resolution, search_confidence,
+                                            shot_block, max_shots_per_point, parallel_blocks=parallel_blocks),
+                            count_correlated),
+        "Newton (exact metric + derivative)": (NewtonPolicy(*p_bracket, target_corr, newton_tol),
+                                               exact_corr_with_derivative),
+    }
+
+    costs = {}
+    for label, (policy, evaluator) in policies.items():
+        runtime = AgentRuntime(evaluator, budget, max_workers=max_workers, seed=seed)
+        evaluations_before = exact_evaluations
+        decision, telemetry = runtime.run(policy)
+        costs[label] = telemetry
+
+        print(f"\n--- Policy: {label} ---")
+        for p, c, n, ok in policy.history:
+            print(f"p={p:.4f} -> Corr={c:.4f} ({n:4d} shots) | {'OK' if ok else 'FAIL'}")
+        print_telemetry(label, telemetry)
+        if isinstance(policy, NewtonPolicy):
+            print(f"exact density-matrix evaluations: {exact_evaluations - evaluations_before} "
+                  f"({telemetry.calls} calls, each with its finite-difference points)")
+
+        if isinstance(decision, tuple):
+            print(f"Estimated max p with Corr >= target: {decision[0]:.4f} "
+                  f"(threshold in [{decision[0]:.4f}, {decision[1]:.4f}])")
+        elif isinstance(policy, NewtonPolicy):
+            _, slope = exact_corr_with_derivative(decision)
+            print(f"Threshold p with Corr = target: {decision:.6f} (dCorr/dp there: {slope:.4f}, "
+                  f"so a p error of 0.01 moves Corr by {abs(slope) * 0.01:.4f})")
+        else:
+            print("Estimated max p with Corr >= target:", decision)
+
+    print("\n--- Total cost ---")
+    for label, telemetry in costs.items():
+        print(f"{label:36s} shots={telemetry.shots:6d}, calls={telemetry.calls:3d}")
+
+    print("\nInterpretation:")
+    print("- This is a simple 'policy' for operating range under noise.")
+    print("- If you change target_corr, confidence, or metric, the threshold changes.")
+    print("- Policies run under the same budget; the telemetry compares their compute cost.")
@@ -0,0 +1,133 @@
+"""
+Experiment 04 — Surrogate-model threshold search with a simulation budget
+
+Task (as in Experiment 03): find the largest noise strength p such that a
+metric(p) stays >= target. For expensive evaluators even a bisection costs
+too many simulator calls, so the agent works with a fixed budget of calls.
+
+Agent (SurrogatePolicy, run by the shared agent runtime, see agent_runtime.py):
+- evaluators have the runtime's interface: evaluator(p, shots, seed) ->
+  number of successes; the Bell one is Experiment 03's count_correlated, the
+  GHZ_n one uses the same noise model (Experiment 03's build_dep_noise)
+- a Gaussian-process surrogate of metric(p) is fit to all evaluations so far
+  (RBF kernel, linear prior mean, per-point binomial noise variance)
+- the next p maximizes the entropy of P(metric(p) >= target) under the
+  posterior, i.e. the point whose side of the target is least known (the
+  myopic information gain about the threshold)
+- after `sim_budget` calls the threshold posterior is read off GP sample
+  paths: for each path, the first p where it drops below the target
+
+The posterior curve (grid, mean, std) comes from SurrogatePolicy.posterior()
+and is plotted to:
+experiments/07_agentic/results/exp_04_surrogate_posterior.png
+"""
+
+import numpy as np
+import matplotlib.pyplot as plt
+from qiskit import QuantumCircuit
+from qiskit_aer import AerSimulator
+
+from agent_runtime import AgentRuntime, SurrogatePolicy, print_telemetry
+from exp_03_agentic_noise_threshold_policy import build_dep_noise, count_correlated
+
+seed = 4
+
+sim_budget = 8          # simulator calls per search
+shots_per_call = 1024
+p_bracket = (0.0, 0.5)
+grid_points = 201
+posterior_paths = 4000
+
+# GP hyperparameters (metric in [0, 1], smooth in p)
+length_scale = 0.15
+signal_std = 0.3
+
+ghz_qubits = 5
+
+out_path = "experiments/07_agentic/results/exp_04_surrogate_posterior.png"
+
+# ---- Evaluators (Bell: Experiment 03; GHZ_n with the same noise model) ----
+
+def ghz_circuit(n: int, measure: bool = True):
+    qc = QuantumCircuit(n, n) if measure else QuantumCircuit(n)
+    qc.h(0)
+    for q in range(n - 1):
+        qc.cx(q, q + 1)
+    if measure:
+        qc.measure(range(n), range(n))
+    return qc
+
+def count_ghz(p: float, n_shots: int, seed: int | None = None) -> int:
+    """GHZ_n: shots with outcome 0...0 or 1...1."""
+    sim = AerSimulator(noise_model=build_dep_noise(p))
+    counts = sim.run(ghz_circuit(ghz_qubits), shots=n_shots, seed_simulator=seed).result().get_counts()
+    return counts.get("0" * ghz_qubits, 0) + counts.get("1" * ghz_qubits, 0)
+
+def exact_metric(p: float, n: int) -> float:
+    """Reference: P(0...0) + P(1...1) from the density matrix (no shot noise)."""
+    qc = ghz_circuit(n, measure=False)
+    qc.save_probabilities()
+    sim = AerSimulator(noise_model=build_dep_noise(p), method="density_matrix")
+    probs = sim.run(qc).result().data(0)["probabilities"]
+    return float(probs[0] + probs[-1])
+
+def exact_threshold(n: int, target: float, tol: float = 1e-4) -> float:
+    lo, hi = p_bracket
+    while hi - lo > tol:
+        mid = (lo + hi) / 2
+        if exact_metric(mid, n) >= target:
+            lo = mid
+        else:
+            hi = mid
+    return lo
+
+problems = [
+    ("Bell corr (n=2)", count_correlated, 2, 0.90),
+    (f"GHZ_{ghz_qubits} metric", count_ghz, ghz_qubits, 0.80),
+]
+
+print("\n=== Experiment 04 — Surrogate threshold search (GP, fixed budget) ===")
+print(f"sim_budget={sim_budget} calls x {shots_per_call} shots, bracket={p_bracket}, "
+      f"length_scale={length_scale}, seed={seed}")
+
+fig, axes = plt.subplots(1, len(problems), figsize=(6 * len(problems), 4.5))
+
+for ax, (label, evaluator, n, target) in zip(axes, problems):
+    policy = SurrogatePolicy(*p_bracket, target, shots_per_call, sim_budget, length_scale=length_scale,
+                             signal_std=signal_std, grid_points=grid_points, paths=posterior_paths, seed=seed)
+    thresholds, telemetry = AgentRuntime(evaluator, seed=seed).run(policy)
+    x_obs, y_obs = np.array(policy.x_obs), np.array(policy.y_obs)
+    x_grid = policy.x_grid
+    mean, std, _ = policy.posterior()
+
+    lo, med, hi = np.quantile(thresholds, [0.025, 0.5, 0.975])
+    p_exact = exact_threshold(n, target)
+
+    print(f"\n--- {label}, target={target} ---")
+    for p, y in zip(x_obs, y_obs):
+        print(f"  evaluated p={p:.4f} -> metric={y:.4f}")
+    print(f"threshold posterior: median={med:.4f}, 95% CI=[{lo:.4f}, {hi:.4f}]")
+    print(f"exact threshold (density matrix): {p_exact:.4f} | inside CI: {lo <= p_exact <= hi}")
+    print_telemetry(label, telemetry, max_step_lines=0)
+
+    ax.fill_between(x_grid, mean - 2 * std, mean + 2 * std, alpha=0.25, label="posterior ±2σ")
+    ax.plot(x_grid, mean, label="posterior mean")
+    x_ref = x_grid[::10]
+    ax.plot(x_ref, [exact_metric(p, n) for p in x_ref], "k--", lw=1, label="exact metric")
+    ax.scatter(x_obs, y_obs, color="C3", zorder=3, label="evaluations")
+    ax.axhline(target, color="gray", lw=1)
+    ax.axvspan(lo, hi, color="C2", alpha=0.2, label="threshold 95% CI")
+    ax.set_title(f"{label}: target {target}")
+    ax.set_xlabel("Noise strength p")
+    ax.set_ylabel("Metric")
+    ax.set_ylim(0.0, 1.05)
+    ax.grid(True)
+    ax.legend(fontsize=8)
+
+plt.tight_layout()
+plt.savefig(out_path, dpi=200)
+
+print("\nSaved plot to:", out_path)
+print("\nExpected:")
+print("- evaluations cluster around the threshold after the two bracket points")
+print("- the 95% CI covers the exact threshold with a budget of", sim_budget, "calls")
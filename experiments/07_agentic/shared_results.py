@@ -0,0 +1,105 @@
+"""
+Shared results — zero-copy transport of large arrays from worker processes
+
+A process pool returns results by pickling them through a pipe: the worker
+serializes, the parent deserializes into a fresh allocation. For density
+matrices (2^n x 2^n complex, 16 MB at n=10, 256 MB at n=12) that copy
+dominates a parallel sweep.
+
+Instead the parent allocates one result block for the whole sweep:
+- SharedResults(n_items, shape, dtype): a multiprocessing.shared_memory block,
+  or, with path=..., a memory-mapped file (survives the process, can be
+  opened from other boxes on a shared filesystem and may exceed RAM)
+- workers attach by handle (name/path, shape, dtype; a small picklable dict)
+  and write their item in place: results.array[i] = value
+- the parent reads results.array[i] as a NumPy view; nothing is copied back
+
+map_into(func, points, shape, ...) runs func(point) -> array in a process pool
+and stores item i of the output in slot i, returning only the indices through
+the pool. Workers attach once per process.
+
+Slots are written by exactly one worker each, so no locking is needed.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+
+class SharedResults:
+    def __init__(self, n_items: int, shape, dtype=np.complex128, path: str | None = None):
+        self.shape = (n_items, *shape)
+        self.dtype = np.dtype(dtype)
+        self.path = path
+        nbytes = max(int(np.prod(self.shape)) * self.dtype.itemsize, 1)
+
+        if path is None:
+            self._shm = shared_memory.SharedMemory(create=True, size=nbytes)
+            self.array = np.ndarray(self.shape, dtype=self.dtype, buffer=self._shm.buf)
+        else:
+            self._shm = None
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self.array = np.lib.format.open_memmap(path, mode="w+", dtype=self.dtype, shape=self.shape)
+
+    def handle(self) -> dict:
+        """What a worker needs to attach; small and picklable."""
+        return {"name": None if self._shm is None else self._shm.name, "path": self.path,
+                "shape": self.shape, "dtype": self.dtype.str}
+
+    def close(self):
+        """Release the block. Views taken from .array must not be used afterwards."""
+        self.array = None
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+_attached = {}  # per worker process: handle key -> (array, shm or None)
+
+def attach(handle: dict) -> np.ndarray:
+    """Writable view of the result block in a worker process (cached per process)."""
+    key = handle["name"] or handle["path"]
+    if key not in _attached:
+        if handle["name"] is not None:
+            # pool workers share the parent's resource tracker; the parent unlinks the block in close()
+            shm = shared_memory.SharedMemory(name=handle["name"])
+            arr = np.ndarray(handle["shape"], dtype=np.dtype(handle["dtype"]), buffer=shm.buf)
+        else:
+            shm = None
+            arr = np.load(handle["path"], mmap_mode="r+")
+        _attached[key] = (arr, shm)
+    return _attached[key][0]
+
+def _run_into(func, handle: dict, index: int, point):
+    attach(handle)[index] = func(point)
+    return index
+
+def map_into(func, points, shape, dtype=np.complex128, max_workers: int = 4,
+             path: str | None = None) -> SharedResults:
+    """
+    Evaluate func(point) for every point in a process pool, writing result i
+    into slot i of a SharedResults block (returned; the caller closes it).
+    func must be picklable (module-level).
+    """
+    points = list(points)
+    results = SharedResults(len(points), shape, dtype=dtype, path=path)
+    handle = results.handle()
+
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = [pool.submit(_run_into, func, handle, i, point) for i, point in enumerate(points)]
+            for fut in futures:
+                fut.result()  # re-raises a worker's exception
+    except BaseException:
+        results.close()
+        raise
+
+    if path is not None:
+        results.array.flush()
+    return results
@@ -0,0 +1,47 @@
+"""
+Sweep stream — yield sweep results as they complete
+
+The sweeps used to fill result lists in grid order and act only at the end.
+stream_sweep(func, points) instead yields (index, point, result) as soon as
+each evaluation finishes (completion order, tagged with the point's index),
+so consumers can act on every result immediately:
+- print / checkpoint it (03_oracles/exp_07a appends each point as it lands)
+- redraw a partial plot (03_oracles/exp_08)
+- stop early: breaking out of the loop (or closing the generator) cancels
+  the points that have not started
+
+Only max_pending evaluations are in flight at any time and `points` is read
+lazily, so a large grid can be a generator; nothing is kept after a result
+has been yielded, so memory does not grow with the grid.
+
+Threads by default (Aer and NumPy release the GIL); processes=True uses a
+process pool (func and points must then be picklable).
+"""
+
+import itertools
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+def _executor(max_workers: int, processes: bool):
+    return (ProcessPoolExecutor if processes else ThreadPoolExecutor)(max_workers=max_workers)
+
+def stream_sweep(func, points, max_workers: int = 4, processes: bool = False, max_pending: int | None = None):
+    """Yield (index, point, func(point)) in completion order; exceptions are raised when their point lands."""
+    max_pending = max_pending or 2 * max_workers
+    todo = enumerate(points)
+    pool = _executor(max_workers, processes)
+    pending = {}
+
+    try:
+        for index, point in itertools.islice(todo, max_pending):
+            pending[pool.submit(func, point)] = (index, point)
+
+        while pending:
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                index, point = pending.pop(fut)
+                for next_index, next_point in itertools.islice(todo, 1):
+                    pending[pool.submit(func, next_point)] = (next_index, next_point)
+                yield index, point, fut.result()
+    finally:
+        # normal end, error or early stop by the consumer: drop what has not started
+        pool.shutdown(wait=True, cancel_futures=True)
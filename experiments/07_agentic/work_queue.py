@@ -0,0 +1,202 @@
+"""
+Work queue — SQLite-backed task queue for spreading sweeps over processes/boxes
+
+No broker: the queue is a single SQLite file, which any number of worker
+processes (on one machine, or on several boxes sharing the filesystem) open
+directly.
+
+- tasks are enqueued under a content key (e.g. the hash of the sweep point);
+  re-enqueueing an existing key is a no-op, so a grid can be submitted twice.
+  Failed tasks stay failed on a re-submit unless enqueue(requeue_failed=True)
+  puts them back as pending with a fresh set of attempts
+- claim(): a worker atomically leases one pending task for lease_seconds
+  (BEGIN IMMEDIATE serializes claimers); tasks whose lease expired, because
+  the worker died or hung, are claimable again
+- heartbeat(): extends the lease while the task runs; run_worker() does this
+  from a background thread every lease_seconds / 3
+- complete() stores the JSON result (the error of an earlier attempt is kept
+  for the record); fail() puts the task back as pending, or
+  marks it failed after max_attempts (expired leases count as attempts)
+- results() returns {key: result} for all finished tasks
+
+SQLite locking over network filesystems depends on the filesystem's lock
+support (NFSv4 / SMB with locking enabled); a local disk is always safe.
+"""
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id            INTEGER PRIMARY KEY,
+    key           TEXT UNIQUE NOT NULL,
+    payload       TEXT NOT NULL,
+    status        TEXT NOT NULL DEFAULT 'pending',  -- pending | leased | done | failed
+    attempts      INTEGER NOT NULL DEFAULT 0,
+    owner         TEXT,
+    lease_expires REAL,
+    result        TEXT,
+    error         TEXT,
+    updated       REAL
+)
+"""
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+class WorkQueue:
+    def __init__(self, path: str, lease_seconds: float = 30.0, max_attempts: int = 3):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._connect() as db:
+            db.execute(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        # autocommit connection; multi-statement updates use explicit BEGIN IMMEDIATE,
+        # and closing without COMMIT rolls them back
+        db = sqlite3.connect(self.path, timeout=60.0, isolation_level=None)
+        try:
+            yield db
+        finally:
+            db.close()
+
+    def enqueue(self, tasks, requeue_failed: bool = False) -> int:
+        """
+        tasks: iterable of (key, payload dict). Returns the number of new tasks,
+        plus, with requeue_failed, the number of failed tasks put back as pending.
+        """
+        now = time.time()
+        rows = [(key, json.dumps(payload), now) for key, payload in tasks]
+        with self._connect() as db:
+            db.execute("BEGIN IMMEDIATE")
+            before = db.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+            db.executemany("INSERT OR IGNORE INTO tasks (key, payload, updated) VALUES (?, ?, ?)", rows)
+            added = db.execute("SELECT COUNT(*) FROM tasks").fetchone()[0] - before
+            if requeue_failed:
+                # the last error is kept for the record until the task finishes or fails again
+                cur = db.executemany("UPDATE tasks SET status = 'pending', attempts = 0, owner = NULL, "
+                                     "lease_expires = NULL, updated = ? WHERE key = ? AND status = 'failed'",
+                                     [(now, key) for key, _, _ in rows])
+                added += cur.rowcount
+            db.execute("COMMIT")
+        return added
+
+    def claim(self, worker_id: str):
+        """Lease one task. Returns (task id, key, payload, attempt) or None if nothing is claimable."""
+        now = time.time()
+        with self._connect() as db:
+            db.execute("BEGIN IMMEDIATE")
+            # expired leases that used up their attempts are given up
+            db.execute("UPDATE tasks SET status = 'failed', error = 'lease expired', updated = ? "
+                       "WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?",
+                       (now, now, self.max_attempts))
+            row = db.execute("SELECT id, key, payload, attempts FROM tasks "
+                             "WHERE status = 'pending' OR (status = 'leased' AND lease_expires < ?) "
+                             "ORDER BY id LIMIT 1", (now,)).fetchone()
+            if row is None:
+                db.execute("COMMIT")
+                return None
+            # a reclaimed lease keeps a note of why the previous attempt ended
+            db.execute("UPDATE tasks SET error = CASE WHEN status = 'leased' THEN 'lease expired (' || owner || ')' "
+                       "ELSE error END, status = 'leased', owner = ?, lease_expires = ?, "
+                       "attempts = attempts + 1, updated = ? WHERE id = ?",
+                       (worker_id, now + self.lease_seconds, now, row[0]))
+            db.execute("COMMIT")
+        return row[0], row[1], json.loads(row[2]), row[3] + 1
+
+    def heartbeat(self, task_id: int, worker_id: str) -> bool:
+        """Extend the lease; False if the task is no longer leased to this worker."""
+        now = time.time()
+        with self._connect() as db:
+            cur = db.execute("UPDATE tasks SET lease_expires = ?, updated = ? "
+                             "WHERE id = ? AND owner = ? AND status = 'leased'",
+                             (now + self.lease_seconds, now, task_id, worker_id))
+        return cur.rowcount == 1
+
+    def complete(self, task_id: int, worker_id: str, result) -> bool:
+        with self._connect() as db:
+            cur = db.execute("UPDATE tasks SET status = 'done', result = ?, updated = ? "
+                             "WHERE id = ? AND owner = ? AND status = 'leased'",
+                             (json.dumps(result), time.time(), task_id, worker_id))
+        return cur.rowcount == 1
+
+    def fail(self, task_id: int, worker_id: str, error: str) -> bool:
+        with self._connect() as db:
+            cur = db.execute("UPDATE tasks SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                             "error = ?, lease_expires = NULL, updated = ? "
+                             "WHERE id = ? AND owner = ? AND status = 'leased'",
+                             (self.max_attempts, error, time.time(), task_id, worker_id))
+        return cur.rowcount == 1
+
+    def counts(self) -> dict:
+        with self._connect() as db:
+            rows = db.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status").fetchall()
+        return dict(rows)
+
+    def results(self) -> dict:
+        with self._connect() as db:
+            rows = db.execute("SELECT key, result FROM tasks WHERE status = 'done'").fetchall()
+        return {key: json.loads(result) for key, result in rows}
+
+    def retried(self) -> list:
+        """(key, attempts, last error) of tasks that needed more than one attempt."""
+        with self._connect() as db:
+            return db.execute("SELECT key, attempts, error FROM tasks WHERE attempts > 1 ORDER BY id").fetchall()
+
+def run_worker(queue: WorkQueue, handler, worker_id: str | None = None, poll_seconds: float = 0.5,
+               on_claim=None):
+    """
+    Pull tasks until the queue has nothing pending or leased, calling
+    handler(payload) -> JSON-serializable result. A background thread sends
+    heartbeats while the handler runs; exceptions are recorded with fail().
+    on_claim(claimed, key, attempt), if given, is called after each claim
+    (claimed = tasks claimed so far by this worker).
+    Returns the number of tasks this worker completed.
+    """
+    worker_id = worker_id or default_worker_id()
+    done = 0
+    claimed = 0
+
+    while True:
+        task = queue.claim(worker_id)
+        if task is None:
+            counts = queue.counts()
+            if counts.get("pending", 0) + counts.get("leased", 0) == 0:
+                return done
+            time.sleep(poll_seconds)  # other workers hold leases that may still expire
+            continue
+
+        task_id, key, payload, attempt = task
+        claimed += 1
+        if on_claim is not None:
+            on_claim(claimed, key, attempt)
+
+        stop = threading.Event()
+
+        def beat():
+            while not stop.wait(queue.lease_seconds / 3):
+                if not queue.heartbeat(task_id, worker_id):
+                    return
+
+        heart = threading.Thread(target=beat, daemon=True)
+        heart.start()
+        try:
+            result = handler(payload)
+        except Exception as exc:
+            queue.fail(task_id, worker_id, f"{type(exc).__name__}: {exc}")
+            continue
+        finally:
+            stop.set()
+            heart.join()
+
+        if queue.complete(task_id, worker_id, result):
+            done += 1
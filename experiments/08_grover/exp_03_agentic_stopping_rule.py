@@ -1,59 +1,255 @@
 """
 Experiment 03 — Agentic stopping rule for Grover
+
+Baseline agent: increase the number of iterations k one at a time and stop at
+the first decrease of P(marked). Under shot noise a single unlucky estimate
+stops it early, and it costs one full simulation per k; at larger n, where the
+optimal k grows like (pi/4) sqrt(2^n), linear stepping is not viable.
+
+Model-predicted agent:
+- noisy Grover model (damped sinusoid in k, decaying to the uniform 1/N):
+    P(k) = 1/N + (sin^2((2k+1) theta) - 1/N) * exp(-gamma k),  theta = asin(1/sqrt(N))
+- evaluate two design points (k_ideal/2, k_ideal), fit gamma (golden-section
+  on the weighted squared error), and predict k_opt = argmax_k P(k)
+- golden-section search over integer k in a bracket around the prediction,
+  on measured P(k) (evaluations are memoized)
+- refit on all evaluations with a free amplitude and frequency as well,
+    P(k) = 1/N + A (sin^2((2k+1) omega theta) - 1/N) exp(-gamma k)
+  so the position of the peak follows the data instead of the ideal
+  frequency; k_opt = argmax_k P(k) over a full period (not capped at the
+  ideal k), so a single noisy point cannot derail it
+- confidence interval on k_opt by parametric bootstrap of the counts, refitting
+  all three parameters on every sample
+
+The circuits are transpiled to h/x/u/cx/cz before simulation, so the
+multi-controlled gates of the oracle and diffuser (n > 2) carry gate noise
+like every other gate instead of running as one noiseless mcx.
+
+Every simulation of k iterations gets the child seed (n, k) of `seed` (numpy
+SeedSequence), shared by both agents, and the bootstrap draws from its own
+child stream, so runs are reproducible and the agents see the same counts at
+the same k.
 """
 
-from qiskit import QuantumCircuit
+import math
+from functools import lru_cache
+import numpy as np
+from qiskit import QuantumCircuit, transpile
 from qiskit_aer import AerSimulator
 from qiskit_aer.noise import NoiseModel, depolarizing_error
 
-shots = 2048
-noise_p = 0.1
-max_iters = 6
-
-def grover_step(qc):
-    qc.cz(0, 1)
-    qc.h([0, 1])
-    qc.x([0, 1])
-    qc.h(1)
-    qc.cx(0, 1)
-    qc.h(1)
-    qc.x([0, 1])
-    qc.h([0, 1])
-
-def build_circuit(k):
-    qc = QuantumCircuit(2, 2)
-    qc.h([0, 1])
+seed = 8
+SIM_KEY, BOOTSTRAP_KEY = 0, 1  # spawn-key prefixes of the two stream families
+
+# (n_qubits, noise_p, shots)
+problems = [(2, 0.1, 2048), (8, 0.0001, 1024)]  # n=8: ~900 noisy gates per iteration
+
+max_iters = 6          # baseline agent's cap for n=2; k_ideal + 1 otherwise
+gamma_max = 2.0
+omega_range = (0.8, 1.2)  # frequency scale of the refit, relative to the ideal theta
+
+BASIS = ["h", "x", "u", "cx", "cz"]  # every gate of the transpiled circuit is noisy
+bootstrap_samples = 300
+
+def grover_step(qc, n):
+    marked = list(range(n - 1))
+
+    # oracle: phase flip on |1...1>
+    if n == 2:
+        qc.cz(0, 1)
+    else:
+        qc.h(n - 1)
+        qc.mcx(marked, n - 1)
+        qc.h(n - 1)
+
+    # diffuser
+    qc.h(range(n))
+    qc.x(range(n))
+    qc.h(n - 1)
+    if n == 2:
+        qc.cx(0, 1)
+    else:
+        qc.mcx(marked, n - 1)
+    qc.h(n - 1)
+    qc.x(range(n))
+    qc.h(range(n))
+
+@lru_cache(maxsize=None)
+def build_circuit(k, n=2):
+    qc = QuantumCircuit(n, n)
+    qc.h(range(n))
     for _ in range(k):
-        grover_step(qc)
-    qc.measure([0, 1], [0, 1])
-    return qc
+        grover_step(qc, n)
+    qc.measure(range(n), range(n))
+    # mcx (n > 2) would run as one noiseless instruction; decompose it into the noisy basis
+    return transpile(qc, basis_gates=BASIS, optimization_level=0)
+
+def child_seed(*key) -> int:
+    return int(np.random.SeedSequence(seed, spawn_key=key).generate_state(1)[0])
+
+@lru_cache(maxsize=None)
+def run_successes(noise_p, n, k, shots) -> int:
+    """P(marked) counts of one simulation; both agents get the same seeded run, so it is simulated once."""
+    sim = AerSimulator(noise_model=noise_model(noise_p))
+    counts = sim.run(build_circuit(k, n), shots=shots, seed_simulator=child_seed(SIM_KEY, n, k)).result().get_counts()
+    return counts.get("1" * n, 0)
 
 def noise_model(p):
     nm = NoiseModel()
-    nm.add_all_qubit_quantum_error(depolarizing_error(p, 1), ["h", "x"])
+    nm.add_all_qubit_quantum_error(depolarizing_error(p, 1), ["h", "x", "u"])
     nm.add_all_qubit_quantum_error(depolarizing_error(p, 2), ["cx", "cz"])
     return nm
 
-sim = AerSimulator(noise_model=noise_model(noise_p))
+# ---- Noisy Grover model ----
+
+def grover_angle(n):
+    return math.asin(1 / math.sqrt(2 ** n))
+
+def ideal_k(n):
+    return max(1, round(math.pi / (4 * grover_angle(n)) - 0.5))
+
+def model_success(k, gamma, n, amplitude=1.0, omega=1.0):
+    uniform = 1 / 2 ** n
+    ideal = np.sin((2 * np.asarray(k) + 1) * omega * grover_angle(n)) ** 2
+    return uniform + amplitude * (ideal - uniform) * np.exp(-gamma * np.asarray(k))
+
+def golden_section(f, a, b, tol):
+    """Minimum of a unimodal f on [a, b] (continuous)."""
+    inv_phi = (math.sqrt(5) - 1) / 2
+    c, d = b - inv_phi * (b - a), a + inv_phi * (b - a)
+    fc, fd = f(c), f(d)
+    while b - a > tol:
+        if fc < fd:
+            b, d, fd = d, c, fc
+            c = b - inv_phi * (b - a)
+            fc = f(c)
+        else:
+            a, c, fc = c, d, fd
+            d = a + inv_phi * (b - a)
+            fd = f(d)
+    return (a + b) / 2
+
+def fit_gamma(ks, successes, shots, n):
+    ks = np.array(ks)
+    phat = np.array(successes) / shots
+    weights = shots / (phat * (1 - phat) + 1 / shots)
+
+    def sse(gamma):
+        return float(np.sum(weights * (model_success(ks, gamma, n) - phat) ** 2))
+
+    return golden_section(sse, 0.0, gamma_max, 1e-5)
+
+def fit_model(ks, successes, shots, n):
+    """
+    Weighted least-squares fit of (amplitude, omega, gamma): the amplitude is
+    solved in closed form, gamma by golden-section for each omega, and omega
+    by golden-section on the profiled error.
+    """
+    ks = np.array(ks)
+    phat = np.array(successes) / shots
+    weights = shots / (phat * (1 - phat) + 1 / shots)
+    uniform = 1 / 2 ** n
+
+    def profile(omega, gamma):
+        basis = model_success(ks, gamma, n, omega=omega) - uniform
+        norm = float(np.sum(weights * basis ** 2))
+        amplitude = float(np.sum(weights * basis * (phat - uniform))) / norm if norm > 0 else 0.0
+        return amplitude, float(np.sum(weights * (uniform + amplitude * basis - phat) ** 2))
+
+    def best_gamma(omega):
+        return golden_section(lambda g: profile(omega, g)[1], 0.0, gamma_max, 1e-5)
+
+    omega = golden_section(lambda o: profile(o, best_gamma(o))[1], *omega_range, 1e-4)
+    gamma = best_gamma(omega)
+    return profile(omega, gamma)[0], omega, gamma
+
+def model_k_opt(params, n):
+    """argmax_k of the model with params (amplitude, omega, gamma), over one full period of sin^2."""
+    amplitude, omega, gamma = params
+    ks = np.arange(0, math.ceil(math.pi / (2 * omega * grover_angle(n))) + 1)
+    return int(ks[np.argmax(model_success(ks, gamma, n, amplitude, omega))])
+
+def golden_section_k(evaluate, a, b):
+    """Maximum of a (noisily) unimodal function over integers in [a, b]."""
+    inv_phi = (math.sqrt(5) - 1) / 2
+    while b - a > 2:
+        c = int(round(b - inv_phi * (b - a)))
+        d = int(round(a + inv_phi * (b - a)))
+        if c == d:
+            d = c + 1
+        if evaluate(c) >= evaluate(d):
+            b = d
+        else:
+            a = c
+    return max(range(a, b + 1), key=evaluate)
+
+# ---- Agents ----
+
+def linear_stopping(noise_p, n, shots, cap):
+    """Original agent: k = 1, 2, ... until the first decrease."""
+    best_k, best_p, evals = None, 0.0, 0
+    for k in range(1, cap + 1):
+        p_succ = run_successes(noise_p, n, k, shots) / shots
+        evals += 1
+        if p_succ >= best_p:
+            best_p, best_k = p_succ, k
+        else:
+            break
+    return best_k, best_p, evals
+
+def model_stopping(noise_p, n, shots):
+    memo = {}
+
+    def successes(k):
+        if k not in memo:
+            memo[k] = run_successes(noise_p, n, k, shots)
+        return memo[k]
+
+    def evaluate(k):
+        return successes(k) / shots
+
+    k_id = ideal_k(n)
+    for k in sorted({max(1, k_id // 2), k_id}):
+        successes(k)
+
+    gamma = fit_gamma(list(memo), list(memo.values()), shots, n)
+    k_pred = model_k_opt((1.0, 1.0, gamma), n)
+
+    width = max(2, math.ceil(0.25 * k_id))
+    k_meas = golden_section_k(evaluate, max(0, k_pred - width), min(k_id + width, k_pred + width))
+
+    ks = list(memo)
+    counts = np.array([memo[k] for k in ks])
+    params = fit_model(ks, counts, shots, n)
+    k_opt = model_k_opt(params, n)
+
+    # parametric bootstrap of the counts, refitting all parameters -> CI on k_opt
+    phat = counts / shots
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(BOOTSTRAP_KEY, n)))
+    boot = [model_k_opt(fit_model(ks, rng.binomial(shots, phat), shots, n), n)
+            for _ in range(bootstrap_samples)]
+    ci = np.percentile(boot, [2.5, 97.5])
+
+    return k_opt, k_meas, params, ci, memo
 
 print("\n=== Experiment 03 — Agentic stopping rule ===")
-print("noise p =", noise_p)
 
-best_k = None
-best_p = 0.0
+for n, noise_p, shots in problems:
+    cap = max_iters if n == 2 else ideal_k(n) + 1
 
-for k in range(1, max_iters + 1):
-    counts = sim.run(build_circuit(k), shots=shots).result().get_counts()
-    p_succ = counts.get("11", 0) / shots
-    print(f"iterations={k} -> P(|11>)={p_succ:.3f}")
+    print(f"\n--- n={n} (N={2 ** n}), noise p={noise_p}, shots={shots}, ideal k={ideal_k(n)} ---")
 
-    if p_succ >= best_p:
-        best_p = p_succ
-        best_k = k
-    else:
-        print("→ Agent stops: performance decreased")
-        break
+    k_lin, p_lin, evals_lin = linear_stopping(noise_p, n, shots, cap)
+    print(f"linear stepping: k={k_lin}, P(marked)={p_lin:.3f}, simulations={evals_lin}")
+
+    k_opt, k_meas, (amplitude, omega, gamma), ci, memo = model_stopping(noise_p, n, shots)
+    evaluated = ", ".join(f"k={k}: {memo[k] / shots:.3f}" for k in sorted(memo))
+    print(f"model + golden-section: evaluated {evaluated}")
+    print(f"  fitted amplitude={amplitude:.3f}, omega={omega:.4f}, gamma={gamma:.4f} | best measured k={k_meas}")
+    print(f"  model k_opt={k_opt}, 95% CI=[{ci[0]:.0f}, {ci[1]:.0f}] | "
+          f"predicted P={float(model_success(k_opt, gamma, n, amplitude, omega)):.3f}")
+    print(f"  simulations={len(memo)}")
 
 print("\nAgent decision:")
-print("Optimal iterations =", best_k)
-print("Success probability =", round(best_p, 3))
+print("- the model-based k_opt comes with a bootstrap CI instead of a single noisy comparison")
+print("- the bootstrap refits amplitude and frequency too, so a flat measured peak gives a wide CI")